@@ -0,0 +1,134 @@
+import random
+import time
+from argparse import ArgumentParser
+
+from shared_reading_mas.domain.services.book_parser import BookParser
+
+# ==============================
+# Equivalence Corpus
+# ==============================
+
+CORPUS = [
+    "# Title\n---\nFirst page.\n---\nSecond page.\n",
+    "# Title\n\n---\nLine one\nLine two\n\nSecond paragraph\n---\nPregunta: ¿Quién?\n",
+    "   #   Spaced title  \n\n---\n  indented line\n  another\n",
+    "## Double hash\n---\n# Heading inside a page\ntext\n",
+    "# T\n----\nx\n",
+    "# T\n--- trailing text\nx\n",
+    "# T\n---   \nx\n",
+    "# T\n---\nx\n   ---\ny\n",
+    "# T\n---\na\n  \nb\n",
+    "# T\n---\n---\nx\n",
+    "# T\r\n---\r\nx\r\n\r\ny\r\n",
+    "\n\n---\nNo title\n",
+    "---\nOnly pages\n---\nAgain\n",
+    "# T\n---\n![caption](missing.png) tail\nx\n",
+    "# T\n\n![cover](missing.png)\n\n---\n![page](missing.png)\nText\n",
+    "# T\n---\nPregunta: first\n\nPregunta: second\n\n\n\nplain\n",
+    "# T\n\n\n\n  \n\n---\nx\n",
+    "Text before any separator\n---\nx\n",
+    "# T\nno separator at all\n",
+    "#\n---\nx\n",
+    "![c](x.png)\t---\n\n**",
+    "\n\n![c](x.png)\t-------",
+    "# T\n![c](x.png) ---\nx\n",
+    "# T\n\n![c](x.png)\n ---\nx\n",
+    "![c](x.png) \n---\nx\n",
+    "![c](x.png)---\nx\n",
+    "![c](x.png)\n\n ---\nx\n",
+    "",
+]
+
+WORDS = [
+    "el", "zorro", "corrió", "por", "el", "bosque", "y", "encontró", "una", "rana",
+    "que", "cantaba", "bajo", "la", "luna", "Pregunta:", "#", "---", "![c](x.png)",
+]
+
+
+def random_story(rng: random.Random, num_pages: int) -> str:
+    """Builds a story in the book markdown format with some noisy lines."""
+    lines = [f"# {' '.join(rng.choices(WORDS[:15], k=4))}", ""]
+
+    for _ in range(num_pages):
+        lines.append("---")
+        for _ in range(rng.randint(1, 6)):
+            prefix = rng.choice(["", "", "", "  ", "\t"])
+            lines.append(prefix + " ".join(rng.choices(WORDS, k=rng.randint(1, 14))))
+            if rng.random() < 0.3:
+                lines.append("")
+
+    return "\n".join(lines) + "\n"
+
+
+def parse_or_error(parser: BookParser, text: str):
+    """Returns the parsed book without its random uid, or the error type."""
+    try:
+        return parser.parse(text).model_dump(exclude={"uid"})
+    except Exception as e:
+        return type(e).__name__
+
+
+def check_equivalence(corpus: list[str]) -> int:
+    """Compares the fast path against the Lark grammar for every document."""
+    fast, lark = BookParser(), BookParser(fast_path=False)
+    mismatches = 0
+
+    for text in corpus:
+        if parse_or_error(fast, text) != parse_or_error(lark, text):
+            mismatches += 1
+            print(f"Mismatch for input: {text!r}")
+
+    return mismatches
+
+
+# ==============================
+# Microbenchmark
+# ==============================
+
+
+def time_per_kb(parser: BookParser, stories: list[str], repeats: int) -> float:
+    """Returns the average parse time in milliseconds per KB of markdown."""
+    total_kb = sum(len(story.encode("utf-8")) for story in stories) / 1024
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for story in stories:
+            parser.parse(story)
+    elapsed = time.perf_counter() - start
+
+    return elapsed * 1000 / (total_kb * repeats)
+
+
+# ==============================
+# MAIN
+# ==============================
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stories = [random_story(rng, args.pages) for _ in range(args.stories)]
+
+    mismatches = check_equivalence(CORPUS + stories)
+    print(f"Equivalence: {len(CORPUS) + len(stories)} documents, {mismatches} mismatches")
+
+    # Warm up both paths so grammar compilation is not measured
+    BookParser().parse(stories[0])
+    BookParser(fast_path=False).parse(stories[0])
+
+    fast = time_per_kb(BookParser(), stories, args.repeats)
+    lark = time_per_kb(BookParser(fast_path=False), stories, args.repeats)
+
+    print(f"Fast path: {fast:.3f} ms/KB")
+    print(f"Lark grammar: {lark:.3f} ms/KB")
+    print(f"Speedup: {lark / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import itertools
+import time
+from argparse import ArgumentParser
+from collections import Counter
+
+import numpy as np
+
+from shared_reading_mas.domain.services.ranking_aggregator import (
+    ranking_aggregator_factory,
+)
+
+AGGREGATORS = ["win_count", "copeland", "elo", "bradley_terry"]
+
+# ==============================
+# Simulated Judge
+# ==============================
+
+def simulate_comparisons(
+    rng: np.random.Generator, num_candidates: int, passes: int, spread: float, no_verdict: float
+) -> tuple[list[str], list[tuple[str, str, str]], str]:
+    """
+    Simulates a judge comparing candidates with latent Bradley-Terry strengths,
+    over `passes` shuffled round robins.
+    """
+    candidates = [f"book_{i}" for i in range(num_candidates)]
+    strengths = rng.normal(0, spread, num_candidates)
+
+    pairs = list(itertools.combinations(range(num_candidates), 2)) * passes
+    order = rng.permutation(len(pairs))
+
+    results = []
+    for index in order:
+        first, second = pairs[index]
+        if rng.random() < no_verdict:
+            winner = ""
+        else:
+            p_first = 1 / (1 + np.exp(strengths[second] - strengths[first]))
+            winner = candidates[first] if rng.random() < p_first else candidates[second]
+
+        results.append((candidates[first], candidates[second], winner))
+
+    return candidates, results, candidates[int(np.argmax(strengths))]
+
+
+# ==============================
+# Stability
+# ==============================
+
+def evaluate(aggregator, candidates, results, best, threshold) -> dict:
+    """
+    Ranks every prefix of the comparisons, and measures when the winner stops
+    changing and when its confidence reaches the threshold.
+    """
+    rankings = [aggregator.rank(candidates, results[:k]) for k in range(1, len(results) + 1)]
+    winners = [ranking[0].uid for ranking in rankings]
+
+    stable_at = len(winners)
+    while stable_at > 1 and winners[stable_at - 2] == winners[-1]:
+        stable_at -= 1
+
+    confident_at = next(
+        (k + 1 for k, ranking in enumerate(rankings) if ranking[0].confidence >= threshold),
+        len(rankings),
+    )
+
+    return {
+        "stable_at": stable_at,
+        "stable_correct": winners[-1] == best,
+        "confident_at": confident_at,
+        "confident_correct": winners[confident_at - 1] == best,
+    }
+
+
+# ==============================
+# Checks
+# ==============================
+
+def check_baseline(rng: np.random.Generator, trials: int) -> int:
+    """
+    Compares the win_count winner against the most common winner of the
+    comparisons, which breaks ties by the first win.
+    """
+    aggregator = ranking_aggregator_factory("win_count")
+    mismatches = 0
+
+    for _ in range(trials):
+        num_candidates = int(rng.integers(2, 7))
+        candidates, results, _ = simulate_comparisons(rng, num_candidates, 1, 0.0, 0.0)
+        results = results[: int(rng.integers(1, len(results) + 1))]
+
+        expected = Counter(winner for _, _, winner in results).most_common(1)[0][0]
+        if aggregator.rank(candidates, results)[0].uid != expected:
+            mismatches += 1
+            print(f"Mismatch for results: {results}")
+
+    return mismatches
+
+
+def check_degenerate() -> int:
+    """Ranks fewer than two candidates, and candidates without games."""
+    failures = 0
+
+    with np.errstate(all="raise"):
+        for name in AGGREGATORS:
+            for candidates, results in [
+                ([], []),
+                (["a"], []),
+                (["a", "b"], []),
+                (["a", "b", "c"], [("a", "b", "a")]),
+            ]:
+                try:
+                    ranking = ranking_aggregator_factory(name).rank(candidates, results)
+                    if not np.isfinite([value for candidate in ranking for value in candidate[1:]]).all():
+                        raise FloatingPointError("non-finite ranking")
+                except FloatingPointError as e:
+                    failures += 1
+                    print(f"{name} failed for {candidates}: {e}")
+
+    return failures
+
+
+# ==============================
+# MAIN
+# ==============================
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--candidates", type=int, nargs="+", default=[4, 6, 8])
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--spread", type=float, default=1.0)
+    parser.add_argument("--no_verdict", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches = check_baseline(np.random.default_rng(args.seed), args.trials * 10)
+    print(f"Baseline: {args.trials * 10} win_count winners, {mismatches} mismatches")
+    print(f"Degenerate inputs: {check_degenerate()} failures")
+    print()
+
+    print(
+        f"{'aggregator':<14} {'n':>3} {'stable at':>10} {'correct':>8} "
+        f"{'confident at':>13} {'correct':>8} {'ms/rank':>8}"
+    )
+
+    for num_candidates in args.candidates:
+        for name in AGGREGATORS:
+            aggregator = ranking_aggregator_factory(name, num_samples=args.samples)
+            rng = np.random.default_rng(args.seed)
+
+            metrics, elapsed, ranks = [], 0.0, 0
+            for _ in range(args.trials):
+                candidates, results, best = simulate_comparisons(
+                    rng, num_candidates, args.passes, args.spread, args.no_verdict
+                )
+
+                start = time.perf_counter()
+                metrics.append(evaluate(aggregator, candidates, results, best, args.threshold))
+                elapsed += time.perf_counter() - start
+                ranks += len(results)
+
+            print(
+                f"{name:<14} {num_candidates:>3} "
+                f"{np.mean([m['stable_at'] for m in metrics]):>10.1f} "
+                f"{np.mean([m['stable_correct'] for m in metrics]):>8.2f} "
+                f"{np.mean([m['confident_at'] for m in metrics]):>13.1f} "
+                f"{np.mean([m['confident_correct'] for m in metrics]):>8.2f} "
+                f"{1000 * elapsed / ranks:>8.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
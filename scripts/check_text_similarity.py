@@ -0,0 +1,83 @@
+import random
+from argparse import ArgumentParser
+
+import numpy as np
+
+from shared_reading_mas.domain.services.text_similarity import (
+    minhash_similarity,
+    shingles,
+    tfidf_similarity,
+)
+
+# ==============================
+# Known Sets
+# ==============================
+
+VOCABULARY = [f"palabra{i}" for i in range(400)]
+
+
+def text_pair(rng: random.Random, shared: int, distinct: int) -> tuple[str, str]:
+    """Builds two texts of single-word shingles with a known overlap."""
+    words = rng.sample(VOCABULARY, shared + 2 * distinct)
+    common, first, second = words[:shared], words[shared : shared + distinct], words[shared + distinct :]
+    return " ".join(common + first), " ".join(common + second)
+
+
+def jaccard(first: str, second: str) -> float:
+    """Returns the exact Jaccard similarity of the shingle sets of two texts."""
+    first_set, second_set = set(shingles(first, 1)), set(shingles(second, 1))
+    return len(first_set & second_set) / len(first_set | second_set)
+
+
+# ==============================
+# Check
+# ==============================
+
+
+def check_estimates(pairs: list[tuple[str, str]], num_permutations: int, tolerance: float) -> int:
+    """Compares the MinHash estimate against the exact Jaccard of every pair."""
+    failures = 0
+
+    for first, second in pairs:
+        estimate = minhash_similarity([first, second], shingle_size=1, num_permutations=num_permutations)
+        exact = jaccard(first, second)
+        if abs(estimate[0, 1] - exact) > tolerance or estimate[0, 0] != 1 or estimate[1, 1] != 1:
+            failures += 1
+            print(f"Estimate {estimate[0, 1]:.3f} for exact Jaccard {exact:.3f}")
+
+    return failures
+
+
+def check_empty() -> bool:
+    """Checks that texts without shingles are not similar to anything, as with TF-IDF."""
+    texts = ["", "  ", "¡!", "palabra1 palabra2"]
+    return bool(np.allclose(minhash_similarity(texts), tfidf_similarity(texts)))
+
+
+# ==============================
+# MAIN
+# ==============================
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=50)
+    parser.add_argument("--permutations", type=int, default=512)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [text_pair(rng, rng.randint(0, 100), rng.randint(0, 100)) for _ in range(args.pairs)]
+    pairs = [(first, second) for first, second in pairs if first and second]
+
+    # Identical and disjoint texts are exact regardless of the permutations
+    pairs += [text_pair(rng, 60, 0), text_pair(rng, 0, 60)]
+
+    failures = check_estimates(pairs, args.permutations, args.tolerance)
+    print(f"MinHash: {len(pairs)} pairs, {failures} estimates off by more than {args.tolerance}")
+    print(f"Empty texts: {'OK' if check_empty() else 'similar to each other'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from shared_reading_mas.agents.personalization.triage_critic import triage_label
+
+# ==============================
+# Verdicts
+# ==============================
+
+VERDICTS = [
+    ("INVÁLIDO", "inválido"),
+    ("INVÁLIDO.", "inválido"),
+    ("INVÁLIDO,", "inválido"),
+    ("inválido.", "inválido"),
+    ("**INVÁLIDO**", "inválido"),
+    ("`INVALIDO`", "inválido"),
+    ("Veredicto: INVÁLIDO.", "inválido"),
+    ("(INVÁLIDO)", "inválido"),
+    ("No.", "inválido"),
+    ("**NO**, le faltan páginas", "inválido"),
+    ("VÁLIDO", "válido"),
+    ("VÁLIDO.", "válido"),
+    ("**Válido**", "válido"),
+    ("Nota: VÁLIDO", "válido"),
+    ("Es válido, no le falta nada.", "válido"),
+    ("", "válido"),
+]
+
+
+def main():
+    mismatches = 0
+
+    for answer, expected in VERDICTS:
+        label = triage_label(answer)
+        if label != expected:
+            mismatches += 1
+            print(f"Answer {answer!r} labelled {label}, expected {expected}")
+
+    print(f"Triage verdicts: {len(VERDICTS)} answers, {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
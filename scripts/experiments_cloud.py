@@ -1,68 +1,47 @@
-import subprocess
+import asyncio
 
-# ==============================
-# Simplified Runner
-# ==============================
+from dotenv import load_dotenv
+
+from shared_reading_mas.agents.core.response_cache import enable_response_cache
+from shared_reading_mas.analysis_store import enable_analysis_store
+from shared_reading_mas.judgment_store import enable_judgment_store
+from shared_reading_mas.pipelines import enable_checkpoints, expand_manifest, run_batch
+from shared_reading_mas.result_store import ResultStore
+from shared_reading_mas.utils import load_json_file
+
+load_dotenv()
 
-def run_pipeline(command):
-    """
-    Executes the command directly without background threads
-    or resource tracking.
-    """
-    # Use subprocess.run for a cleaner, synchronous execution
-    process = subprocess.run(command, shell=True)
-    return process.returncode
+MAX_CONCURRENCY = 4
 
 # ==============================
-# Personalization Pipeline Loop
+# Experiments Manifest
 # ==============================
 
-def run_personalization(base_route: str):
+def build_manifest(base_route: str) -> dict:
     stories = [
         "caballero.md", "calendario.md", "cuaderno.md",
         "mensaje.md", "rana.md", "yi.md",
     ]
     profiles = ["boy.md", "girl.md"]
 
-    for profile in profiles:
-        for story in stories:
-            run_name = f"{profile[:-3]}_{story[:-3]}"
-
-            command = (
-                f"uv run src/main.py "
-                f"--story_path {base_route}/stories/{story} "
-                f"--preferences_path {base_route}/profiles/{profile} "
-                f"--pipelines PERSONALIZATION "
-                f"--output_path outputs/personalization/{run_name}.md "
-                f"--verbose"
-            )
-
-            print(f"\n--- Starting: {run_name} ---")
-            run_pipeline(command)
-
-def run_questions(base_route: str):
-    stories = [
-        "caballero.md", "calendario.md",
-        "cuaderno.md",
-        "mensaje.md", "rana.md", "yi.md"
-    ]
-
-    for story in stories:
-        story_path = f"{base_route}/stories/{story}"
-        run_name = f"questions_{story[:-3]}"
-
-        command = (
-            f"uv run scripts/main.py "
-            f"--story_path {story_path} "
-            f"--preferences_path {base_route}/profiles/girl.md "
-            f"--pipelines QUESTIONS "
-            f"--output_path outputs/questions/{run_name}.md "
-            f"--verbose"
-        )
-
-        print(f"\nRunning command: {command}\n")
-
-        run_pipeline(command)
+    return {
+        "experiments": [
+            {
+                "stories": [f"{base_route}/stories/{story}" for story in stories],
+                "profiles": [f"{base_route}/profiles/{profile}" for profile in profiles],
+                "pipelines": ["PERSONALIZATION"],
+                "output_dir": "outputs/personalization",
+                "output_name": "{profile}_{story}.md",
+            },
+            {
+                "stories": [f"{base_route}/stories/{story}" for story in stories],
+                "profiles": [f"{base_route}/profiles/girl.md"],
+                "pipelines": ["QUESTIONS"],
+                "output_dir": "outputs/questions",
+                "output_name": "questions_{story}.md",
+            },
+        ]
+    }
 
 
 # ==============================
@@ -72,8 +51,23 @@ def run_questions(base_route: str):
 def main():
 
     base_route = "data"
-    run_personalization(base_route)
-    run_questions(base_route)
+    configuration = load_json_file("config.json")["cloud"]
+    enable_response_cache("outputs/cache/responses.sqlite")
+    enable_checkpoints("outputs/cache/checkpoints")
+    enable_judgment_store("outputs/cache/judgments.sqlite")
+    enable_analysis_store("outputs/cache/analyses.sqlite")
+    result_store = ResultStore("outputs/cache/results.sqlite")
+
+    runs = expand_manifest(build_manifest(base_route))
+    asyncio.run(
+        run_batch(
+            runs,
+            configuration,
+            max_concurrency=MAX_CONCURRENCY,
+            verbose=True,
+            result_store=result_store,
+        )
+    )
 
 if __name__ == "__main__":
     main()
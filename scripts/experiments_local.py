@@ -1,11 +1,25 @@
-import subprocess
+import asyncio
 import threading
 import time
 from datetime import datetime
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import pandas as pd
 import psutil
+from dotenv import load_dotenv
+
+from shared_reading_mas.agents.core.response_cache import enable_response_cache
+from shared_reading_mas.analysis_store import enable_analysis_store
+from shared_reading_mas.judgment_store import enable_judgment_store
+from shared_reading_mas.pipelines import enable_checkpoints, expand_manifest, run_batch
+from shared_reading_mas.result_store import ResultStore
+from shared_reading_mas.utils import load_json_file
+
+load_dotenv()
+
+# A single local Ollama server backs every agent
+MAX_CONCURRENCY = 1
 
 # ==============================
 # Monitoring Utilities
@@ -86,7 +100,7 @@ def monitor_process(
 # ==============================
 
 
-def run_pipeline_with_monitor(command, run_name, output_dir):
+def run_batch_with_monitor(runs, configuration, run_name, output_dir, result_store=None):
     stop_event = threading.Event()
     monitor_data = {}
 
@@ -102,20 +116,28 @@ def run_pipeline_with_monitor(command, run_name, output_dir):
     monitor_thread = threading.Thread(target=monitor_wrapper)
     monitor_thread.start()
 
-    # Run pipeline
-    process = subprocess.Popen(command, shell=True)
-    process.wait()
+    # Run every pipeline in this process, sharing clients and compiled graphs
+    asyncio.run(
+        run_batch(
+            runs,
+            configuration,
+            max_concurrency=MAX_CONCURRENCY,
+            verbose=True,
+            result_store=result_store,
+        )
+    )
 
     # Stop monitor
     stop_event.set()
     monitor_thread.join()
 
-    print(f"\nPipeline finished for {run_name}. Monitor stopped.")
+    print(f"\nBatch finished for {run_name}. Monitor stopped.")
 
     # Save results
     df = monitor_data.get("df", pd.DataFrame())
 
     if not df.empty:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
         csv_path = f"{output_dir}/{run_name}.csv"
         plot_path = f"{output_dir}/{run_name}.png"
 
@@ -140,11 +162,11 @@ def run_pipeline_with_monitor(command, run_name, output_dir):
 
 
 # ==============================
-# Personalization Pipeline Loop
+# Personalization Pipeline
 # ==============================
 
 
-def run_personalization(base_route: str):
+def run_personalization(base_route: str, configuration: dict, result_store: ResultStore):
     stories = [
         "caballero.md",
         "calendario.md",
@@ -159,32 +181,29 @@ def run_personalization(base_route: str):
         "girl.md",
     ]
 
-    for profile in profiles:
-        for story in stories:
-            story_path = f"{base_route}/stories/{story}"
-            preferences_path = f"{base_route}/profiles/{profile}"
-
-            run_name = f"{profile[:-3]}_{story[:-3]}"
-
-            command = (
-                f"uv run scripts/main.py "
-                f"--story_path {story_path} "
-                f"--preferences_path {preferences_path} "
-                f"--pipelines PERSONALIZATION "
-                f"--output_path outputs/personalization/{run_name}.md "
-                f"--verbose"
-            )
-
-            print(f"\nRunning command: {command}\n")
-
-            run_pipeline_with_monitor(
-                command, run_name, output_dir="outputs/personalization/monitoring"
-            )
-
-            print("Sleeping 5 minutes for next run...\n")
-            time.sleep(300)
-
-def run_questions(base_route: str):
+    runs = expand_manifest(
+        {
+            "experiments": [
+                {
+                    "stories": [f"{base_route}/stories/{story}" for story in stories],
+                    "profiles": [f"{base_route}/profiles/{profile}" for profile in profiles],
+                    "pipelines": ["PERSONALIZATION"],
+                    "output_dir": "outputs/personalization",
+                    "output_name": "{profile}_{story}.md",
+                }
+            ]
+        }
+    )
+
+    run_batch_with_monitor(
+        runs,
+        configuration,
+        "personalization",
+        output_dir="outputs/personalization/monitoring",
+        result_store=result_store,
+    )
+
+def run_questions(base_route: str, configuration: dict, result_store: ResultStore):
     stories = [
         "caballero.md",
         "calendario.md",
@@ -194,27 +213,27 @@ def run_questions(base_route: str):
         "yi.md",
     ]
 
-    for story in stories:
-        story_path = f"{base_route}/stories/{story}"
-        run_name = f"questions_{story[:-3]}"
-
-        command = (
-            f"uv run src/main.py "
-            f"--story_path {story_path} "
-            f"--preferences_path {base_route}/profiles/girl.md "
-            f"--pipelines QUESTIONS "
-            f"--output_path outputs/questions/{story[:-3]}.md "
-            f"--verbose"
-        )
-
-        print(f"\nRunning command: {command}\n")
-
-        run_pipeline_with_monitor(
-            command, run_name, output_dir="outputs/questions/monitoring"
-        )
-
-        print("Sleeping 5 minutes for next run...\n")
-        time.sleep(300)
+    runs = expand_manifest(
+        {
+            "experiments": [
+                {
+                    "stories": [f"{base_route}/stories/{story}" for story in stories],
+                    "profiles": [f"{base_route}/profiles/girl.md"],
+                    "pipelines": ["QUESTIONS"],
+                    "output_dir": "outputs/questions",
+                    "output_name": "{story}.md",
+                }
+            ]
+        }
+    )
+
+    run_batch_with_monitor(
+        runs,
+        configuration,
+        "questions",
+        output_dir="outputs/questions/monitoring",
+        result_store=result_store,
+    )
 
 
 # ==============================
@@ -224,9 +243,15 @@ def run_questions(base_route: str):
 
 def main():
     base_route = "data"
-
-    run_personalization(base_route)
-    run_questions(base_route)
+    configuration = load_json_file("config.json")["local"]
+    enable_response_cache("outputs/cache/responses.sqlite")
+    enable_checkpoints("outputs/cache/checkpoints")
+    enable_judgment_store("outputs/cache/judgments.sqlite")
+    enable_analysis_store("outputs/cache/analyses.sqlite")
+    result_store = ResultStore("outputs/cache/results.sqlite")
+
+    run_personalization(base_route, configuration, result_store)
+    run_questions(base_route, configuration, result_store)
 
 if __name__ == "__main__":
     main()
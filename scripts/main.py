@@ -4,10 +4,14 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from shared_reading_mas.agents.core.response_cache import enable_response_cache
+from shared_reading_mas.analysis_store import enable_analysis_store
 from shared_reading_mas.domain.services.book_parser import BookParser
 from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
 from shared_reading_mas.domain.services.preference_parser import PreferenceParser
+from shared_reading_mas.judgment_store import enable_judgment_store
 from shared_reading_mas.pipelines import run_pipelines
+from shared_reading_mas.roles.prompt_cache import get_prompt_cache
 from shared_reading_mas.utils import load_json_file
 
 load_dotenv()
@@ -34,6 +38,32 @@ def main():
     parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose output", default=False
     )
+    parser.add_argument(
+        "--cache_path", help="SQLite file used to cache model responses", default=None
+    )
+    parser.add_argument(
+        "--cache_mode",
+        help="Use 'replay' to only serve cached responses and fail on a miss",
+        choices=["read_write", "replay"],
+        default="read_write",
+    )
+    parser.add_argument(
+        "--cache_ttl", help="Seconds after which a cached response expires", type=float, default=None
+    )
+    parser.add_argument(
+        "--cache_max_entries", help="Maximum number of cached responses", type=int, default=None
+    )
+    parser.add_argument(
+        "--judgments_path", help="SQLite file used to store and reuse pair critic judgments", default=None
+    )
+    parser.add_argument(
+        "--analyses_path", help="SQLite file used to store and reuse the story analyses of the questions extractor", default=None
+    )
+    parser.add_argument(
+        "--prompts_snapshot",
+        help="JSON file with the LangFuse role prompts. Loaded if it exists, so no prompt is fetched, and written after the run",
+        default=None,
+    )
 
     args = parser.parse_args()
 
@@ -42,6 +72,23 @@ def main():
     output_path = Path(args.output_path)
     configuration = load_json_file("config.json")["cloud"]
 
+    if args.cache_path:
+        enable_response_cache(
+            args.cache_path,
+            mode=args.cache_mode,
+            ttl=args.cache_ttl,
+            max_entries=args.cache_max_entries,
+        )
+
+    if args.judgments_path:
+        enable_judgment_store(args.judgments_path)
+
+    if args.analyses_path:
+        enable_analysis_store(args.analyses_path)
+
+    if args.prompts_snapshot and Path(args.prompts_snapshot).exists():
+        get_prompt_cache().load_snapshot(args.prompts_snapshot)
+
     story = BookParser(from_path=story_path).parse()
     preferences = PreferenceParser(from_path=profile_path).parse()
 
@@ -49,4 +96,7 @@ def main():
 
     BookMarkdownRenderer(to_path=output_path, include_images=modified_story.has_images()).render(modified_story)
 
+    if args.prompts_snapshot:
+        get_prompt_cache().save_snapshot(args.prompts_snapshot)
+
 main()
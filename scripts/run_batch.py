@@ -0,0 +1,132 @@
+import asyncio
+import json
+from argparse import ArgumentParser
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from shared_reading_mas.agents.core.response_cache import enable_response_cache
+from shared_reading_mas.analysis_store import enable_analysis_store
+from shared_reading_mas.judgment_store import enable_judgment_store
+from shared_reading_mas.pipelines import enable_checkpoints, expand_manifest, run_batch
+from shared_reading_mas.result_store import ResultStore
+from shared_reading_mas.roles.prompt_cache import get_prompt_cache
+from shared_reading_mas.utils import load_json_file
+
+load_dotenv()
+
+# ==============================
+# Batch Runner
+# ==============================
+#
+# Manifest example:
+#
+# {
+#     "experiments": [
+#         {
+#             "stories": ["data/stories/rana.md", "data/stories/yi.md"],
+#             "profiles": ["data/profiles/boy.md", "data/profiles/girl.md"],
+#             "pipelines": ["PERSONALIZATION"],
+#             "output_dir": "outputs/personalization"
+#         }
+#     ]
+# }
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--manifest_path", help="JSON manifest of stories, profiles and pipelines", required=True
+    )
+    parser.add_argument(
+        "--configuration", help="Configuration of config.json to use", choices=["cloud", "local"], default="cloud"
+    )
+    parser.add_argument(
+        "--max_concurrency", help="Maximum number of runs in flight at once", type=int, default=4
+    )
+    parser.add_argument(
+        "--report_path", help="JSON file with the wall time of every run", default=None
+    )
+    parser.add_argument(
+        "--results_path", help="SQLite file with the completed runs, which are skipped on restart", default=None
+    )
+    parser.add_argument(
+        "--checkpoints_dir", help="Directory of the run checkpoints, used to resume interrupted runs", default=None
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Enable verbose output", default=False
+    )
+    parser.add_argument(
+        "--cache_path", help="SQLite file used to cache model responses", default=None
+    )
+    parser.add_argument(
+        "--cache_mode",
+        help="Use 'replay' to only serve cached responses and fail on a miss",
+        choices=["read_write", "replay"],
+        default="read_write",
+    )
+    parser.add_argument(
+        "--judgments_path", help="SQLite file used to store and reuse pair critic judgments", default=None
+    )
+    parser.add_argument(
+        "--analyses_path", help="SQLite file used to store and reuse the story analyses of the questions extractor", default=None
+    )
+    parser.add_argument(
+        "--prompts_snapshot",
+        help="JSON file with the LangFuse role prompts. Loaded if it exists, so no prompt is fetched, and written after the run",
+        default=None,
+    )
+
+    args = parser.parse_args()
+
+    configuration = load_json_file("config.json")[args.configuration]
+    runs = expand_manifest(load_json_file(args.manifest_path))
+
+    if args.cache_path:
+        enable_response_cache(args.cache_path, mode=args.cache_mode)
+
+    if args.checkpoints_dir:
+        enable_checkpoints(args.checkpoints_dir)
+
+    result_store = ResultStore(args.results_path) if args.results_path else None
+
+    if args.judgments_path:
+        enable_judgment_store(args.judgments_path)
+
+    if args.analyses_path:
+        enable_analysis_store(args.analyses_path)
+
+    if args.prompts_snapshot and Path(args.prompts_snapshot).exists():
+        get_prompt_cache().load_snapshot(args.prompts_snapshot)
+
+    results = asyncio.run(
+        run_batch(
+            runs,
+            configuration,
+            max_concurrency=args.max_concurrency,
+            verbose=args.verbose,
+            result_store=result_store,
+        )
+    )
+
+    if args.prompts_snapshot:
+        get_prompt_cache().save_snapshot(args.prompts_snapshot)
+
+    failed = [result for result in results if result.error]
+    total_time = sum(result.wall_time for result in results)
+    print(f"\n{len(results) - len(failed)}/{len(results)} runs completed, {total_time:.1f}s of run time")
+
+    if args.report_path:
+        report = [
+            {
+                "story_path": str(result.run.story_path),
+                "preferences_path": str(result.run.preferences_path),
+                "pipelines": result.run.pipelines,
+                "output_path": str(result.run.output_path),
+                "wall_time": result.wall_time,
+                "error": result.error,
+            }
+            for result in results
+        ]
+        Path(args.report_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+main()
@@ -42,4 +42,4 @@ class Organization(LangFuseOrganization):
         self._core_graph.add_edge(START, combined_agent.name)
         self._core_graph.set_finish_point(combined_agent.name)
 
-        return self._core_graph.compile()
+        return self._core_graph.compile(checkpointer=self.checkpointer)
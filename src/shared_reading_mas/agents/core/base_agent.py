@@ -2,9 +2,9 @@ from abc import ABC
 from typing import override
 
 from langchain.agents import create_agent
+from langchain.agents.middleware import ModelRequest, dynamic_prompt
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import AIMessage
-from langchain_ollama import ChatOllama
 from langgraph.graph.state import CompiledStateGraph, StateGraph
 from langgraph_supervisor.handoff import (
     create_handoff_tool,
@@ -14,12 +14,15 @@ from langgraph_supervisor.supervisor import create_supervisor
 from shared_reading_mas.agents.core.base_information import Information
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
 from shared_reading_mas.agents.core.base_organization import Organization
+from shared_reading_mas.agents.core.llm_pool import get_llm_pool
 from shared_reading_mas.roles.core.base_role import Role, RoleCollection
 
 
 def get_llm(lm_config: LMConfiguration):
     """
     Initializes and returns a language model based on the provided configuration.
+    The underlying client is shared with every agent using the same provider and
+    model, see `LLMClientPool`.
 
     Args:
         lm_config (LMConfiguration): The configuration for the language model.
@@ -27,46 +30,7 @@ def get_llm(lm_config: LMConfiguration):
     Returns:
         Language model instance.
     """
-
-    if lm_config.base_provider == "ollama":
-        model = ChatOllama(
-            model=lm_config.base_model,
-            base_url=lm_config.base_url,
-            temperature=lm_config.temperature,
-            reasoning=lm_config.reasoning,
-        )
-
-    elif lm_config.base_provider == "inferencer":
-        model = init_chat_model(
-            model_provider="openai",
-            model=lm_config.base_model,
-            base_url=lm_config.base_url,
-            temperature=lm_config.temperature,
-        )
-
-    elif lm_config.base_provider == "openrouter":
-        from langchain_openrouter import ChatOpenRouter
-
-        reasoning_dict = None
-        if lm_config.reasoning:
-            reasoning_dict = {
-                "effort": "medium",
-                "summary": "auto"
-            }
-
-        model = ChatOpenRouter(
-            model=lm_config.base_model,
-            temperature=lm_config.temperature,
-            max_retries=3,
-            openrouter_provider={
-                "order": lm_config.aditional_params.get("openrouter_provider"),
-                "allow_fallbacks": False,
-            },
-            reasoning=reasoning_dict
-        )
-
-
-    return model
+    return get_llm_pool().get(lm_config)
 
 class Agent(ABC):
     name: str
@@ -94,6 +58,18 @@ class Agent(ABC):
     Information schema for the agent.
     """
 
+    variables_key: str
+    """
+    Key of the agent in the `agents_variables` of the information. Defaults to
+    the name the agent is created with, so renamed copies share the variables.
+    """
+
+    response_format: type | None = None
+    """
+    Schema of the structured response of the agent, returned in the
+    "structured_response" of the information, or None for a free text answer.
+    """
+
     def __init__(
         self,
         name: str,
@@ -106,6 +82,7 @@ class Agent(ABC):
         Initializes the agent with the given roles.
         """
         self.name = name
+        self.variables_key = name
         self.roles = (
             roles
             if isinstance(roles, RoleCollection)
@@ -126,6 +103,13 @@ class Agent(ABC):
         """
         self.organization = organization
 
+    @property
+    def instructions(self) -> str:
+        """
+        Instructions of the active roles of the agent.
+        """
+        return self.roles.instructions
+
     def set_role_variables(self, data: dict):
         """
         Sets the role variables for the agent with the given data.
@@ -133,7 +117,24 @@ class Agent(ABC):
         Args:
             data (dict): The data to set to the agent.
         """
-        self.instructions = self.roles.set_variables(data)
+        self.roles.set_variables(data)
+
+    def format_instructions(self, variables: dict) -> str:
+        """
+        Fills the placeholders of the instructions with the given variables.
+
+        Args:
+            variables (dict): The values of the placeholders.
+
+        Returns:
+            str: The formatted instructions.
+        """
+        instructions = self.instructions
+        for key, value in variables.items():
+            instructions = instructions.replace("{{" + key + "}}", str(value))
+            instructions = instructions.replace("{" + key + "}", str(value))
+
+        return instructions
 
     def pre_core(self, data: dict) -> dict:
         """
@@ -195,11 +196,20 @@ class Agent(ABC):
             )
             self.roles.activities.add(handoff_tool)
 
+        @dynamic_prompt
+        def system_prompt(request: ModelRequest) -> str:
+            # Variables are read from the state so the graph does not depend on them
+            variables = (request.state.get("agents_variables") or {}).get(self.variables_key, {})
+            return self.format_instructions(variables)
+
+        # The middleware sets the system prompt on every call, so the
+        # instructions are not needed, nor loaded, to build the agent
         agent = create_agent(
             model=model,
             name=self.name,
-            system_prompt=self.instructions,
+            middleware=[system_prompt],
             tools=self.roles.activities,
+            response_format=self.response_format,
             state_schema=self.organization.information_schema
             if self.organization
             else self.information_schema,
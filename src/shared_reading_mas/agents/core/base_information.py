@@ -1,8 +1,19 @@
+from typing import Annotated
+
 from langchain.agents import AgentState
 
+from shared_reading_mas.utils import preserve_last
+
 
 class Information(AgentState):
     lm_configs: dict[str, dict]
     """
     Language model configurations for the agents.
     """
+
+    agents_variables: Annotated[dict[str, dict], preserve_last]
+    """
+    Prompt variables of the agents, keyed by their variables key. They fill the
+    placeholders of the system prompts at invoke time, so compiled graphs can be
+    reused across requests.
+    """
@@ -26,6 +26,11 @@ class LMConfiguration(BaseModel):
         description="The temperature to use for the language model's query generation."
     )
 
+    seed: int | None = Field(
+        default=None,
+        description="The seed passed to the provider for reproducible sampling, if the provider supports it."
+    )
+
     reasoning: bool = Field(
         default=False,
         description="Whether to enable reasoning capabilities in the language model."
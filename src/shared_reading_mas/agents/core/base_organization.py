@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
-from langgraph.graph.state import StateGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import CompiledStateGraph, StateGraph
 
 from shared_reading_mas.agents.core.base_information import Information
 
@@ -30,6 +31,11 @@ class Organization(ABC):
     Configuration for the organization.
     """
 
+    checkpointer: BaseCheckpointSaver | None
+    """
+    Checkpointer the graph is compiled with, so interrupted runs can be resumed.
+    """
+
     _agents_variables: dict
 
     def __init__(self, name: str, information_schema: type[Information] = Information, configuration: dict = {}):
@@ -46,6 +52,7 @@ class Organization(ABC):
         self.information_schema = information_schema
         self._core_graph = StateGraph(state_schema=information_schema)
         self.configuration = configuration
+        self.checkpointer = None
         self.set_agents_variables({})
 
 
@@ -60,11 +67,24 @@ class Organization(ABC):
 
     def add_agent(self, agent: any):
         """
-        Adds an agent to the organization.
+        Adds an agent to the organization, as a node of its graph.
 
         Args:
             agent (any): The agent to add.
         """
+        self._core_graph.add_node(agent.name, self.register_agent(agent))
+
+    def register_agent(self, agent: any) -> CompiledStateGraph:
+        """
+        Adds an agent to the organization without a node of its own, for
+        agents invoked from within other nodes.
+
+        Args:
+            agent (any): The agent to register.
+
+        Returns:
+            CompiledStateGraph: The compiled graph of the agent.
+        """
         agent.add_organization(self)
 
         if agent.name in self._agents_variables:
@@ -73,7 +93,7 @@ class Organization(ABC):
             agent.set_role_variables({})
 
         self.agents.append(agent)
-        self._core_graph.add_node(agent.name, agent.instanciate())
+        return agent.instanciate()
 
     def add_agents(self, agents: list[any]):
         """
@@ -0,0 +1,116 @@
+import pickle
+import threading
+from pathlib import Path
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+DOMAIN_TYPES = [
+    ("shared_reading_mas.domain.book_aggregate.book", "Book"),
+    ("shared_reading_mas.domain.book_aggregate.page", "Page"),
+    ("shared_reading_mas.domain.book_aggregate.content", "Content"),
+    ("shared_reading_mas.domain.book_aggregate.content", "ContentType"),
+    ("shared_reading_mas.domain.book_aggregate.image", "Image"),
+    ("shared_reading_mas.domain.evaluation_aggregate.evaluation", "Evaluation"),
+    ("shared_reading_mas.domain.evaluation_aggregate.category", "Category"),
+    ("shared_reading_mas.domain.preference_aggregate.preference", "Preference"),
+]
+"""
+Domain types allowed to be restored from a checkpoint.
+"""
+
+
+class FileCheckpointSaver(InMemorySaver):
+    """
+    Checkpointer that keeps every thread in memory and mirrors it to one file per
+    thread, so an interrupted graph run can be resumed by a later process.
+
+    Each file is an append-only log: every checkpoint and every batch of writes
+    appends only its own records, so saving costs the same at any point of a
+    run. Checkpoints are stored already serialized by the saver, so the files
+    only hold strings and bytes.
+    """
+
+    def __init__(self, directory: str | Path):
+        """
+        Initializes the checkpointer, loading the threads saved in the directory.
+
+        Args:
+            directory (str | Path): Directory holding one file per thread.
+        """
+        super().__init__(serde=JsonPlusSerializer(allowed_msgpack_modules=DOMAIN_TYPES))
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        for path in self.directory.glob("*.pkl"):
+            self._load(path)
+
+    def _path(self, thread_id: str) -> Path:
+        name = "".join(c if c.isalnum() or c in "-_" else "_" for c in thread_id)
+        return self.directory / f"{name}.pkl"
+
+    def _load(self, path: Path):
+        with path.open("rb") as file:
+            while True:
+                try:
+                    record = pickle.load(file)
+                except EOFError:
+                    return
+                except pickle.UnpicklingError:
+                    # The last record was cut short by an interrupted write
+                    return
+
+                match record:
+                    case ("checkpoint", thread_id, checkpoint_ns, checkpoint_id, entry, blobs):
+                        self.storage[thread_id][checkpoint_ns][checkpoint_id] = entry
+                        self.blobs.update(blobs)
+
+                    case ("writes", outer_key, writes):
+                        self.writes[outer_key].update(writes)
+
+    def _append(self, thread_id: str, record: tuple):
+        with self._lock, self._path(thread_id).open("ab") as file:
+            file.write(pickle.dumps(record))
+
+    def put(self, config: RunnableConfig, checkpoint, metadata, new_versions) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = next_config["configurable"]["thread_id"]
+        checkpoint_ns = next_config["configurable"]["checkpoint_ns"]
+        checkpoint_id = next_config["configurable"]["checkpoint_id"]
+        blob_keys = [(thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()]
+
+        self._append(
+            thread_id,
+            (
+                "checkpoint",
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                self.storage[thread_id][checkpoint_ns][checkpoint_id],
+                {key: self.blobs[key] for key in blob_keys},
+            ),
+        )
+        return next_config
+
+    def put_writes(self, config: RunnableConfig, writes, task_id: str, task_path: str = "") -> None:
+        super().put_writes(config, writes, task_id, task_path)
+
+        outer_key = (
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+        )
+        task_writes = {
+            inner_key: write
+            for inner_key, write in self.writes.get(outer_key, {}).items()
+            if inner_key[0] == task_id
+        }
+        self._append(outer_key[0], ("writes", outer_key, task_writes))
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self._lock:
+            self._path(thread_id).unlink(missing_ok=True)
@@ -0,0 +1,168 @@
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_ollama import ChatOllama
+
+from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+
+if TYPE_CHECKING:
+    from shared_reading_mas.agents.core.response_cache import SQLiteResponseCache
+
+DEFAULT_MAX_CONNECTIONS = 16
+"""
+Default maximum number of open connections per pooled client.
+"""
+
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 8
+"""
+Default maximum number of idle keep-alive connections per pooled client.
+"""
+
+# Parameters that may differ between agents sharing the same client
+PER_CALL_PARAMS = {"temperature", "seed"}
+
+
+class LLMClientPool:
+    """
+    Process-level registry of language model clients.
+
+    Agents whose configurations only differ in per-call parameters (such as the
+    temperature or the seed) share a single underlying client, and with it one
+    HTTP connection pool with keep-alive and bounded connection limits. Each
+    agent receives a shallow copy of the shared model carrying its own per-call
+    parameters.
+    """
+
+    response_cache: "SQLiteResponseCache | None"
+    """
+    Response cache attached to every model handed out, if any, scoped to the
+    whole configuration of the model.
+    """
+
+    def __init__(self):
+        self._models: dict[str, BaseChatModel] = {}
+        self._lock = threading.Lock()
+        self.response_cache = None
+
+    def get(self, lm_config: LMConfiguration) -> BaseChatModel:
+        """
+        Gets a language model for the configuration, reusing the pooled client.
+
+        Args:
+            lm_config (LMConfiguration): The configuration for the language model.
+
+        Returns:
+            BaseChatModel: A model sharing the pooled client.
+        """
+        key = self._key(lm_config)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._build(lm_config)
+                self._models[key] = model
+
+        update = {param: getattr(lm_config, param) for param in PER_CALL_PARAMS}
+        if self.response_cache is not None:
+            update["cache"] = self.response_cache.scoped(self._configuration(lm_config))
+
+        return model.model_copy(update=update)
+
+    def clear(self):
+        """
+        Drops every pooled client.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def _key(self, lm_config: LMConfiguration) -> str:
+        return json.dumps(
+            lm_config.model_dump(exclude=PER_CALL_PARAMS), sort_keys=True, default=str
+        )
+
+    def _configuration(self, lm_config: LMConfiguration) -> str:
+        return json.dumps(lm_config.model_dump(), sort_keys=True, default=str)
+
+    def _limits(self, lm_config: LMConfiguration) -> httpx.Limits:
+        params = lm_config.aditional_params
+        return httpx.Limits(
+            max_connections=params.get("max_connections", DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=params.get(
+                "max_keepalive_connections", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+        )
+
+    def _build(self, lm_config: LMConfiguration) -> BaseChatModel:
+        """
+        Initializes a language model based on the provided configuration.
+
+        Args:
+            lm_config (LMConfiguration): The configuration for the language model.
+
+        Returns:
+            BaseChatModel: Language model instance.
+        """
+        if lm_config.base_provider == "ollama":
+            model = ChatOllama(
+                model=lm_config.base_model,
+                base_url=lm_config.base_url,
+                temperature=lm_config.temperature,
+                seed=lm_config.seed,
+                reasoning=lm_config.reasoning,
+                client_kwargs={"limits": self._limits(lm_config)},
+            )
+
+        elif lm_config.base_provider == "inferencer":
+            limits = self._limits(lm_config)
+            model = init_chat_model(
+                model_provider="openai",
+                model=lm_config.base_model,
+                base_url=lm_config.base_url,
+                temperature=lm_config.temperature,
+                seed=lm_config.seed,
+                http_client=httpx.Client(limits=limits),
+                http_async_client=httpx.AsyncClient(limits=limits),
+            )
+
+        elif lm_config.base_provider == "openrouter":
+            from langchain_openrouter import ChatOpenRouter
+
+            reasoning_dict = None
+            if lm_config.reasoning:
+                reasoning_dict = {
+                    "effort": "medium",
+                    "summary": "auto"
+                }
+
+            # The OpenRouter SDK manages its own pooled HTTP client, which is
+            # shared by every copy of this model
+            model = ChatOpenRouter(
+                model=lm_config.base_model,
+                temperature=lm_config.temperature,
+                seed=lm_config.seed,
+                max_retries=3,
+                openrouter_provider={
+                    "order": lm_config.aditional_params.get("openrouter_provider"),
+                    "allow_fallbacks": False,
+                },
+                reasoning=reasoning_dict
+            )
+
+        else:
+            raise ValueError(f"Unknown language model provider: {lm_config.base_provider}")
+
+        return model
+
+
+_pool = LLMClientPool()
+
+
+def get_llm_pool() -> LLMClientPool:
+    """
+    Returns the language model client pool shared by the whole process.
+    """
+    return _pool
@@ -0,0 +1,195 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import warnings
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from shared_reading_mas.agents.core.llm_pool import get_llm_pool
+from shared_reading_mas.exceptions import CacheException
+
+
+class CacheMode(Enum):
+    READ_WRITE = "read_write"
+    """
+    Serve hits from the cache and store every new response.
+    """
+
+    REPLAY = "replay"
+    """
+    Serve hits from the cache and fail on any miss, so no model is ever called.
+    """
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    Persistent language model response cache backed by a SQLite file.
+
+    Entries are keyed by the SHA-256 of the serialized prompt, of the model
+    string LangChain builds from the provider, model and call parameters, and
+    of the language model configuration of the agent. Some providers (such as
+    Ollama) leave the model, temperature and seed out of their model string, so
+    models are only handed views of the cache scoped to their configuration,
+    see `scoped`. Image parts are inlined in the serialized prompt, so they take
+    part in the key through its digest.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CacheMode | str = CacheMode.READ_WRITE,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """
+        Initializes the cache, creating the database file if needed.
+
+        Args:
+            path (str | Path): The SQLite database file.
+            mode (CacheMode | str): Whether misses are allowed.
+            ttl (float | None): Seconds after which an entry expires.
+            max_entries (int | None): Maximum number of entries kept. The least
+                recently used entries are evicted first.
+        """
+        self.path = Path(path)
+        self.mode = CacheMode(mode)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, generations TEXT NOT NULL, "
+                "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+
+    def scoped(self, configuration: str) -> "ScopedResponseCache":
+        """
+        Gets a view of the cache whose entries are only shared by models with
+        the same configuration.
+
+        Args:
+            configuration (str): The serialized language model configuration.
+
+        Returns:
+            ScopedResponseCache: The view of the cache.
+        """
+        return ScopedResponseCache(self, configuration)
+
+    def _key(self, prompt: str, llm_string: str, configuration: str = "") -> str:
+        digest = hashlib.sha256()
+        digest.update(configuration.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(llm_string.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(
+        self, prompt: str, llm_string: str, configuration: str = ""
+    ) -> RETURN_VAL_TYPE | None:
+        key = self._key(prompt, llm_string, configuration)
+        now = time.time()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT generations, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl is not None and now - row[1] > self.ttl:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+
+            if row:
+                self._connection.execute(
+                    "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+                )
+
+        if row is None:
+            if self.mode is CacheMode.REPLAY:
+                raise CacheException(
+                    f"No cached response for request {key} in replay mode ({self.path})."
+                )
+            return None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return loads(row[0], allowed_objects="core")
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE, configuration: str = ""
+    ) -> None:
+        key = self._key(prompt, llm_string, configuration)
+        now = time.time()
+        generations = dumps(list(return_val))
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, generations, now, now),
+            )
+
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+
+class ScopedResponseCache(BaseCache):
+    """
+    View of a `SQLiteResponseCache` whose keys include a language model
+    configuration.
+    """
+
+    def __init__(self, cache: SQLiteResponseCache, configuration: str):
+        self.cache = cache
+        self.configuration = configuration
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        return self.cache.lookup(prompt, llm_string, self.configuration)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.cache.update(prompt, llm_string, return_val, self.configuration)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear(**kwargs)
+
+
+def enable_response_cache(
+    path: str | Path,
+    mode: CacheMode | str = CacheMode.READ_WRITE,
+    ttl: float | None = None,
+    max_entries: int | None = None,
+) -> SQLiteResponseCache:
+    """
+    Wraps every language model handed out by `get_llm` with a persistent
+    response cache.
+
+    Args:
+        path (str | Path): The SQLite database file.
+        mode (CacheMode | str): "read_write", or "replay" to fail on any miss.
+        ttl (float | None): Seconds after which an entry expires.
+        max_entries (int | None): Maximum number of entries kept.
+
+    Returns:
+        SQLiteResponseCache: The cache in use.
+    """
+    cache = SQLiteResponseCache(path, mode=mode, ttl=ttl, max_entries=max_entries)
+    get_llm_pool().response_cache = cache
+    return cache
@@ -1,6 +1,8 @@
 from langfuse.langchain import CallbackHandler
 
 from shared_reading_mas.agents.core.base_organization import Information, Organization
+from shared_reading_mas.roles.langfuse_role import LangFuseRole
+from shared_reading_mas.roles.prompt_cache import get_prompt_cache
 
 
 class LangFuseOrganization(Organization):
@@ -11,3 +13,33 @@ class LangFuseOrganization(Organization):
             name=name, information_schema=information_schema, configuration=configuration
         )
         self.configuration['callbacks'] = []#[CallbackHandler()]
+
+    def load_prompts(self):
+        """
+        Loads the instructions of the roles of every registered agent, once the
+        organization is instantiated. Their prompts are fetched in bulk first,
+        and missing prompts are raised before the organization is invoked.
+        """
+        get_prompt_cache().prefetch(self.get_role_names(self.agents))
+
+        for agent in self.agents:
+            for role in agent.roles:
+                role.instructions
+
+    def get_role_names(self, agents: list[any]) -> list[str]:
+        """
+        Gets the LangFuse prompts of the roles played by the agents, including
+        the inactive roles of the agents that switch between them.
+
+        Args:
+            agents (list[any]): The agents.
+
+        Returns:
+            list[str]: The names of the prompts.
+        """
+        return [
+            role.name
+            for agent in agents
+            for role in agent.roles
+            if isinstance(role, LangFuseRole)
+        ]
@@ -13,6 +13,7 @@ from shared_reading_mas.domain.services.image_editor import (
     base64_to_pil,
     pil_to_base64,
 )
+from shared_reading_mas.domain.services.image_store import get_image_store
 from shared_reading_mas.roles.personalization.image_editor import ImageEditorRole
 
 
@@ -41,7 +42,7 @@ class ImageEditorAgent(Agent):
             {"type": "text", "text": "\nImágen de **Portada**:\n"},
             {
                 "type": "image_url",
-                "image_url": {"url": f"data:image/png;base64,{book.front_page_image.data}"},
+                "image_url": {"url": f"data:image/png;base64,{get_image_store().load_base64(book.front_page_image)}"},
             }
         ])
 
@@ -52,7 +53,7 @@ class ImageEditorAgent(Agent):
                         {"type": "text", "text": f"\nImágen de **Página {i + 1}**:\n"},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{image.data}"},
+                            "image_url": {"url": f"data:image/png;base64,{get_image_store().load_base64(image)}"},
                         },
                     ]
                 )
@@ -104,7 +105,7 @@ class ImageEditorAgent(Agent):
             ):
                 parsed_request = editing_request_page.contents[0].text
 
-                pil_image = base64_to_pil(original_image.data)
+                pil_image = base64_to_pil(get_image_store().load_base64(original_image))
 
                 future = executor.submit(
                     self.base_image_editor.edit_image,
@@ -5,7 +5,7 @@ from shared_reading_mas.agents.core.base_information import Information as BaseI
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.evaluation_aggregate.evaluation import Evaluation
 from shared_reading_mas.domain.preference_aggregate.preference import Preference
-from shared_reading_mas.utils import preserve_last
+from shared_reading_mas.utils import add_unique, preserve_last
 
 
 class Information(BaseInformation):
@@ -19,16 +19,28 @@ class Information(BaseInformation):
     Original book to be shared.
     """
 
-    intermediate_books: Annotated[list[Book], operator.add]
+    intermediate_books: Annotated[list[Book], add_unique]
     """
     Intermediate personalized versions of the book.
     """
 
+    candidate_books: Annotated[list[Book], preserve_last]
+    """
+    Intermediate books that passed the deduplication and the pre-screen, and
+    compete for the winner.
+    """
+
     modified_book: Annotated[Book, preserve_last]
     """
     Personalized version of the book.
     """
 
+    score_margin: Annotated[float | None, preserve_last]
+    """
+    Score margin of the books compared by the pair critic in the comparisons
+    judged before, or None if they were not compared yet, see `DebiasPolicy`.
+    """
+
     evaluations: Required[Annotated[list[Evaluation], operator.add]]
     """
     Evaluations of the personalized book.
@@ -1,6 +1,7 @@
+import asyncio
+import hashlib
 import itertools
 import random
-from collections import Counter
 from typing import override
 
 import numpy as np
@@ -16,14 +17,38 @@ from shared_reading_mas.agents.personalization.information import Information
 from shared_reading_mas.agents.personalization.pair_critic import PairCriticAgent
 from shared_reading_mas.agents.personalization.personalizer import PersonalizerAgent
 from shared_reading_mas.agents.personalization.planner import PlannerAgent
+from shared_reading_mas.agents.personalization.triage_critic import TriageCriticAgent
 from shared_reading_mas.domain.book_aggregate.book import Book
+from shared_reading_mas.domain.services.book_digest import content_digest
+from shared_reading_mas.domain.services.candidate_screener import CandidateScreener
 from shared_reading_mas.domain.services.image_editor import image_editor_factory
+from shared_reading_mas.domain.services.ranking_aggregator import (
+    RankedCandidate,
+    RankingAggregator,
+    ranking_aggregator_factory,
+)
+from shared_reading_mas.domain.services.text_similarity import (
+    near_duplicate_groups,
+    similarity_matrix,
+)
+from shared_reading_mas.domain.services.tournament import (
+    PairResult,
+    RoundScheduler,
+    round_scheduler_factory,
+    sample_pairs,
+)
 from shared_reading_mas.exceptions import OrganizationException
 from shared_reading_mas.roles.personalization.personalizer import (
     PersonalizerEditorRole,
     PersonalizerRole,
 )
 
+ROUND_MODES = ("adaptive", "swiss", "single_elimination", "double_elimination")
+"""Evaluation modes that schedule the pair critics one round at a time."""
+
+DEFAULT_DUPLICATE_THRESHOLD = 0.9
+"""Default similarity from which two intermediate books are near-duplicates."""
+
 
 class Organization(LangFuseOrganization):
     def __init__(self, configuration: dict = None):
@@ -33,14 +58,41 @@ class Organization(LangFuseOrganization):
             configuration=configuration or {},
         )
 
-    def _prepare_eval_payload(self, state: dict, book1: Book, book2: Book) -> dict:
+    def _prepare_eval_payload(
+        self, state: dict, book1: Book, book2: Book, score_margin: float | None = None
+    ) -> dict:
         """Isolated payload for a single pair critic."""
         return {
             "preferences": state.get("preferences", []),
+            "agents_variables": state.get("agents_variables", {}),
             "original_book": state.get("original_book"),
             "intermediate_books": [book1, book2],
+            # Kept, as the critic outputs every key of the information
+            "candidate_books": state.get("candidate_books", []),
+            "score_margin": score_margin,
         }
 
+    def _evaluation_sends(self, state: dict, book_pairs: list[tuple[Book, Book]]) -> list[Send]:
+        """Dispatches each book pair to the pair critic, as a payload of its own."""
+        margins = [None] * len(book_pairs)
+
+        if self.configuration.get("pair_critic_debias") == "close_calls":
+            # The critic tells close calls apart by the margin of the books in
+            # the earlier rounds, so books not compared yet have none
+            compared = {uid for result in self.get_pair_results(state) for uid in result[:2]}
+            scores = {candidate.uid: candidate.score for candidate in self.get_ranking(state)}
+            margins = [
+                abs(scores[str(b1.uid)] - scores[str(b2.uid)])
+                if {str(b1.uid), str(b2.uid)} <= compared
+                else None
+                for b1, b2 in book_pairs
+            ]
+
+        return [
+            Send("pair_critic", self._prepare_eval_payload(state, b1, b2, margin))
+            for (b1, b2), margin in zip(book_pairs, margins)
+        ]
+
     def get_number_of_evaluations(self) -> int:
         """
         Determines the number of evaluations based on the evaluation mode.
@@ -64,19 +116,147 @@ class Organization(LangFuseOrganization):
                 num_evals = num_generations * (num_generations - 1) // 2
 
             case "random" | "randoms":
-                pass
+                # Distinct ordered pairs of different books
+                num_pairs = num_generations * (num_generations - 1)
+                if num_evals > num_pairs:
+                    raise OrganizationException(
+                        f"Cannot run {num_evals} random evaluations over {num_pairs} distinct pairs of books"
+                    )
+
+            case "streaming":
+                # At most a round robin, scheduled as the books are generated
+                num_evals = num_generations * (num_generations - 1) // 2
+
+            case "adaptive" | "swiss" | "single_elimination" | "double_elimination":
+                # Only the first round is known up front
+                num_evals = self.get_scheduler().get_round_size(num_generations)
 
             case _:
                 raise OrganizationException(f"Unknown evaluation mode: {mode}")
 
         return num_evals
 
-    def get_evaluation_pairs(self, books: list[Book]) -> list[tuple[Book, Book]]:
+    def get_scheduler(self) -> RoundScheduler:
+        """
+        Builds the scheduler of a round-based evaluation mode.
+
+        Returns:
+            RoundScheduler: The scheduler.
+        """
+        mode = self.configuration.get("evaluation_mode", "random")
+
+        match mode:
+            case "adaptive":
+                return round_scheduler_factory(mode, round_size=self.configuration.get("adaptive_round_size"))
+
+            case "swiss":
+                return round_scheduler_factory(mode, num_rounds=self.configuration.get("swiss_rounds"))
+
+            case _:
+                return round_scheduler_factory(mode)
+
+    def get_candidates(self, state: dict) -> list[Book]:
+        """
+        Gets the books competing for the winner: the ones left by the
+        deduplication and the pre-screen, or every intermediate book if there
+        is none.
+
+        Args:
+            state (dict): The information of the organization.
+
+        Returns:
+            list[Book]: The candidate books.
+        """
+        return state.get("candidate_books") or state.get("intermediate_books", [])
+
+    def get_screener(self) -> CandidateScreener | None:
+        """
+        Builds the screener of the "prescreen" configuration key, either true
+        or the arguments of `CandidateScreener`.
+
+        Returns:
+            CandidateScreener | None: The screener, or None if the pre-screen is disabled.
+        """
+        options = self.configuration.get("prescreen")
+        if not options and options != {}:
+            return None
+
+        return CandidateScreener(**(options if isinstance(options, dict) else {}))
+
+    def get_duplicate_groups(self, books: list[Book]) -> list[list[Book]]:
+        """
+        Groups the near-duplicate books, following the "deduplicate"
+        configuration key: either true or a dictionary with the "method" of
+        `similarity_matrix`, the "threshold" similarity and the arguments of
+        the method.
+
+        Args:
+            books (list[Book]): The books.
+
+        Returns:
+            list[list[Book]]: The groups of books, each one led by its first
+                book in the given order.
+        """
+        options = self.configuration.get("deduplicate")
+        options = dict(options) if isinstance(options, dict) else {}
+        method = options.pop("method", "tfidf")
+        threshold = options.pop("threshold", DEFAULT_DUPLICATE_THRESHOLD)
+
+        if len(books) < 2:
+            return [[book] for book in books]
+
+        similarities = similarity_matrix([book.text() for book in books], method, **options)
+        return [[books[i] for i in group] for group in near_duplicate_groups(similarities, threshold)]
+
+    def get_ranking_aggregator(self) -> RankingAggregator:
+        """
+        Builds the aggregator that ranks the books from the pair critic
+        comparisons, set by the "ranking_aggregator" configuration key.
+
+        Returns:
+            RankingAggregator: The aggregator.
+        """
+        return ranking_aggregator_factory(self.configuration.get("ranking_aggregator", "win_count"))
+
+    def get_ranking(self, state: dict) -> list[RankedCandidate]:
+        """
+        Ranks the intermediate books from the comparisons judged so far.
+
+        Args:
+            state (dict): The information of the organization.
+
+        Returns:
+            list[RankedCandidate]: The books from the best to the worst.
+        """
+        candidates = [str(book.uid) for book in self.get_candidates(state)]
+        return self.get_ranking_aggregator().rank(candidates, self.get_pair_results(state))
+
+    def get_pair_results(self, state: dict) -> list[PairResult]:
+        """
+        Gets the pairwise comparisons judged so far.
+
+        Args:
+            state (dict): The information of the organization.
+
+        Returns:
+            list[PairResult]: The compared uids and the winner of each comparison.
+        """
+        return [
+            (evaluation.compared[0], evaluation.compared[1], evaluation.label)
+            for evaluation in state.get("evaluations", [])
+            if evaluation.compared
+        ]
+
+    def get_evaluation_pairs(
+        self, books: list[Book], results: list[PairResult] | None = None
+    ) -> list[tuple[Book, Book]]:
         """
         Generates book pairs based on the evaluation mode.
 
         Args:
             books (list[Book]): List of books to generate pairs from.
+            results (list[PairResult] | None): Comparisons judged so far. Only
+                used by the round-based modes, which schedule one round at a time.
 
         Returns:
             list[tuple[Book, Book]]: List of book pairs for evaluation.
@@ -97,16 +277,63 @@ class Organization(LangFuseOrganization):
                 book_pairs = list(itertools.combinations(books, 2))
 
             case "random" | "randoms":
-                while len(book_pairs) < num_evals:
-                    pair = tuple(random.sample(books, 2))
-                    if pair not in book_pairs:
-                        book_pairs.append(pair)
+                if len(books) < 2:
+                    return []
+
+                # The deduplication and the pre-screen may leave fewer books than
+                # were generated, so the evaluations are capped to the pairs left
+                num_evals = min(num_evals, len(books) * (len(books) - 1))
+
+                # Books arrive in the order they finish, so they are sorted first
+                books = sorted(books, key=content_digest)
+                try:
+                    indices = sample_pairs(
+                        len(books),
+                        num_evals,
+                        balanced=self.configuration.get("balanced_evaluations", False),
+                        rng=self.get_rng(books),
+                    )
+                except ValueError as e:
+                    raise OrganizationException(str(e)) from e
+
+                book_pairs = [(books[first], books[second]) for first, second in indices]
+
+            case "adaptive" | "swiss" | "single_elimination" | "double_elimination":
+                books_by_uid = {str(book.uid): book for book in books}
+                book_pairs = [
+                    (books_by_uid[first], books_by_uid[second])
+                    for first, second in self.get_scheduler().next_round(
+                        list(books_by_uid), results or []
+                    )
+                ]
 
             case _:
                 raise OrganizationException(f"Unknown evaluation mode: {mode}")
 
         return book_pairs
 
+    def get_rng(self, books: list[Book]) -> random.Random | None:
+        """
+        Builds the random generator of a run, seeded by the "seed" configuration
+        key and the content of the books, so a rerun draws the same pairs.
+
+        Args:
+            books (list[Book]): The books of the run.
+
+        Returns:
+            random.Random | None: The generator, or None to use the global one
+                if no seed is configured.
+        """
+        seed = self.configuration.get("seed")
+        if seed is None:
+            return None
+
+        digest = hashlib.sha256(str(seed).encode("utf-8"))
+        for book in books:
+            digest.update(content_digest(book).encode("utf-8"))
+
+        return random.Random(digest.hexdigest())
+
     def route_edition(self, state: dict) -> str:
         """Routes to the personalization editor after evaluations."""
 
@@ -123,34 +350,226 @@ class Organization(LangFuseOrganization):
     def collect_books(self, state: dict):
         return {"original_book": state.get("original_book")}
 
-    def distribute_evaluations(self, state: dict) -> list[Send]:
+    def deduplicate(self, state: dict) -> dict:
+        """
+        Collapses the near-duplicate intermediate books into one candidate, so
+        they are not compared against each other.
+        """
+        groups = self.get_duplicate_groups(state.get("intermediate_books", []))
+
+        for representative, *duplicates in groups:
+            if duplicates:
+                print(
+                    f"Books {', '.join(str(book.uid) for book in duplicates)} merged into "
+                    f"their near-duplicate {representative.uid}."
+                )
+
+        return {"candidate_books": [group[0] for group in groups]}
+
+    async def prescreen(self, state: dict) -> dict:
+        """Discards the candidate books unfit to be compared."""
+        books = self.get_candidates(state)
+        candidates = await self._screen_books(state, books)
+
+        if not candidates:
+            print("No book passed the pre-screen, all of them are compared.")
+            candidates = books
+
+        return {"candidate_books": candidates}
+
+    def distribute_evaluations(self, state: dict) -> str | list[Send]:
         """A conditional router that dispatches isolated book pairs to critics."""
-        books = state.get("intermediate_books", [])
+        books = self.get_candidates(state)
 
         book_pairs = self.get_evaluation_pairs(books)
-        final_routing = [
-            Send(f"pair_critic_eval_{i + 1}", self._prepare_eval_payload(state, b1, b2))
-            for i, (b1, b2) in enumerate(book_pairs)
-        ]
-        return final_routing
+        if not book_pairs:
+            # A single candidate wins without comparisons
+            return "merge_evaluations"
+
+        return self._evaluation_sends(state, book_pairs)
+
+    def route_evaluations(self, state: dict) -> str | list[Send]:
+        """
+        Routes the round-based modes to their next round of comparisons, or to
+        the edition critic once the winner is decided.
+        """
+        books = self.get_candidates(state)
+        results = self.get_pair_results(state)
+        total = self.get_scheduler().total_comparisons(len(books))
+
+        # A confident enough ranking stops before the winner is mathematically decided
+        threshold = self.configuration.get("winner_confidence")
+        book_pairs = self.get_evaluation_pairs(books, results)
+
+        if book_pairs and threshold is not None:
+            winner = self.get_ranking(state)[0]
+            if winner.confidence >= threshold:
+                print(f"Winner {winner.uid} reached a confidence of {winner.confidence:.2f}.")
+                book_pairs = []
+
+        if book_pairs:
+            return self._evaluation_sends(state, book_pairs)
+
+        mode = self.configuration.get("evaluation_mode")
+        print(
+            f"{mode.capitalize().replace('_', ' ')} evaluation decided after {len(results)} judge calls, "
+            f"{total - len(results)} fewer than the {total} of an exhaustive round robin."
+        )
+        return "edition_critic"
+
+    async def stream_evaluations(self, state: dict) -> dict:
+        """
+        Streaming evaluation mode. Runs the personalizer generations and judges
+        every book as soon as it is generated, instead of waiting for all of
+        them. Once the leader reaches the "winner_confidence", the generations
+        and comparisons left are cancelled.
+        """
+        critic = self.get_agent("pair_critic")
+        screener = self.get_screener()
+        deduplicate = self.configuration.get("deduplicate")
+        threshold = self.configuration.get("winner_confidence")
+        pairing = self.configuration.get("streaming_pairing", "round_robin")
+        num_messages = len(state.get("messages", []))
+
+        generations = {
+            asyncio.create_task(generator.ainvoke(state)): name
+            for name, generator in self._generators.items()
+        }
+        comparisons = set()
+        generated, books, evaluations, messages = [], [], [], []
+
+        try:
+            while generations or comparisons:
+                done, _ = await asyncio.wait(
+                    [*generations, *comparisons], return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task in generations:
+                        del generations[task]
+                        result = task.result()
+                        messages.extend(result.get("messages", [])[num_messages:])
+
+                        for book in result.get("intermediate_books", []):
+                            if book in generated:
+                                continue
+
+                            generated.append(book)
+                            if deduplicate and [book] not in self.get_duplicate_groups([*books, book]):
+                                print(f"Book {book.uid} merged into a near-duplicate candidate.")
+                                continue
+
+                            if screener and not await self._screen_books(state, [book], known=generated[:-1]):
+                                continue
+
+                            opponents = books
+                            if pairing == "challenger" and books:
+                                # Only the current leader defends its place
+                                leader = self.get_ranking({"intermediate_books": books, "evaluations": evaluations})[0]
+                                opponents = [b for b in books if str(b.uid) == leader.uid]
+
+                            comparisons.update(
+                                asyncio.create_task(critic.judge(self._prepare_eval_payload(state, opponent, book)))
+                                for opponent in opponents
+                            )
+                            books.append(book)
+
+                    else:
+                        comparisons.discard(task)
+                        result = task.result()
+                        evaluations.extend(result["evaluations"])
+                        messages.extend(result["messages"])
+
+                if threshold is None or len(books) < 2:
+                    continue
+
+                # Books still being generated could beat the leader, so they are
+                # ranked too, without comparisons
+                uids = [str(book.uid) for book in books]
+                ranking = self.get_ranking_aggregator().rank(
+                    uids + [f"pending:{name}" for name in generations.values()],
+                    self.get_pair_results({"evaluations": evaluations}),
+                )
+                leader = next(candidate for candidate in ranking if candidate.uid in uids)
+
+                if leader.confidence >= threshold and (generations or comparisons):
+                    print(
+                        f"Winner {leader.uid} reached a confidence of {leader.confidence:.2f}, "
+                        f"cancelling {len(generations)} generations and {len(comparisons)} comparisons."
+                    )
+                    break
+
+        finally:
+            for task in [*generations, *comparisons]:
+                task.cancel()
+
+            await asyncio.gather(*generations, *comparisons, return_exceptions=True)
+
+        print(f"Streaming evaluation judged {len(evaluations)} comparisons of {len(books)} books.")
+        return {
+            "intermediate_books": generated,
+            "candidate_books": books,
+            "evaluations": evaluations,
+            "messages": messages,
+        }
 
     def merge_evaluations(self, state: dict) -> dict:
         """Aggregates results from all parallel evaluations."""
         evaluations = state.get("evaluations", [])
-        intermediate_books = state.get("intermediate_books", [])
+        intermediate_books = self.get_candidates(state)
 
-        if not evaluations:
+        if len(intermediate_books) == 1:
+            return {"modified_book": intermediate_books[0]}
+
+        if not any(evaluation.label for evaluation in evaluations):
             return {"modified_book": None}
 
-        win_counts = Counter(e.label for e in evaluations)
-        print(win_counts)
-        winning_uid = win_counts.most_common(1)[0][0]
+        ranking = self.get_ranking(state)
+        for candidate in ranking:
+            print(f"{candidate.uid}: score {candidate.score:.2f}, confidence {candidate.confidence:.2f}")
+
+        winning_uid = ranking[0].uid
+        if self.configuration.get("evaluation_mode") in ROUND_MODES:
+            candidates = [str(book.uid) for book in intermediate_books]
+            winning_uid = self.get_scheduler().champion(candidates, self.get_pair_results(state)) or winning_uid
 
         winning_book = next(
             (book for book in intermediate_books if str(book.uid) == winning_uid), None
         )
         return {"modified_book": winning_book}
 
+    async def _screen_books(
+        self, state: dict, books: list[Book], known: list[Book] | None = None
+    ) -> list[Book]:
+        screener = self.get_screener()
+        results = screener.screen(
+            state.get("original_book"), books, state.get("preferences", []), known=known
+        )
+
+        viable = []
+        for book, result in zip(books, results):
+            if result.passed:
+                viable.append(book)
+            else:
+                print(f"Book {result.uid} discarded by the pre-screen: it {', '.join(result.reasons)}.")
+
+        # The small model only triages the books that passed the local checks
+        triage = self.get_agent("triage_critic")
+        if triage is None:
+            return viable
+
+        verdicts = await asyncio.gather(
+            *(
+                self._triage_graph.ainvoke({**state, "intermediate_books": [book], "messages": []})
+                for book in viable
+            )
+        )
+        return [
+            book
+            for book, verdict in zip(viable, verdicts)
+            if verdict["evaluations"][-1].label != "inválido"
+        ]
+
     def end_text_personalization(self, state: dict) -> dict:
         """Final node of the organization, returns the modified book."""
         return {"modified_book": state.get("modified_book")}
@@ -170,25 +589,28 @@ class Organization(LangFuseOrganization):
     def instantiate(self):
         agents_config = self.configuration["agents"]
         num_generations = self.configuration["num_generations"]
-        num_evals = self.get_number_of_evaluations()
+        # Validates the evaluation mode, the pair critic is sized at run time
+        self.get_number_of_evaluations()
 
         self._add_core_nodes()
 
-        self._add_personalizers(
-            agents_config["personalizer"],
-            num_generations,
-        )
+        if self.configuration.get("evaluation_mode") == "streaming":
+            critic_name = self._add_streaming_evaluation(agents_config, num_generations)
 
-        critic_names = self._add_pair_critics(
-            agents_config["pair_critic"],
-            num_evals,
-        )
+        else:
+            self._add_personalizers(
+                agents_config["personalizer"],
+                num_generations,
+            )
+
+            critic_name = self._add_pair_critic(agents_config["pair_critic"])
+            self._wire_collector_to_critic(critic_name)
 
-        self._wire_collector_to_critics(critic_names)
-        self._add_post_evaluation_pipeline(agents_config)
+        self._add_triage_critic(agents_config)
+        self._add_post_evaluation_pipeline(agents_config, critic_name)
         self._add_image_editing_pipeline(agents_config)
 
-        return self._core_graph.compile()
+        return self._core_graph.compile(checkpointer=self.checkpointer)
 
     def _add_image_editing_pipeline(self, agents_config):
         # Image editor
@@ -211,7 +633,7 @@ class Organization(LangFuseOrganization):
         self._core_graph.add_node("end_text_personalization", self.end_text_personalization)
 
     def _add_personalizers(self, personalizer_cfg, num_generations):
-        temperatures = self._sample_temperatures(num_generations)
+        temperatures, seeds = self._sample_generations(personalizer_cfg, num_generations)
 
         # extractor_agent = self._build_extractor(
         #     extractor_cfg,
@@ -221,7 +643,7 @@ class Organization(LangFuseOrganization):
         # self._core_graph.add_edge(START, extractor_agent.name)
 
         agents = []
-        for i, temp in enumerate(temperatures):
+        for i, (temp, seed) in enumerate(zip(temperatures, seeds)):
             # planner_agent = self._build_planner(
             #     planner_cfg,
             #     temperature=float(temp),
@@ -232,6 +654,7 @@ class Organization(LangFuseOrganization):
                 personalizer_cfg,
                 temperature=float(temp),
                 name=f"personalizer_gen_{i + 1}",
+                seed=seed,
             )
 
             self.add_agent(agent)
@@ -243,6 +666,30 @@ class Organization(LangFuseOrganization):
 
         self._core_graph.add_edge(agents, "collector")
 
+    def _add_streaming_evaluation(self, agents_config, num_generations):
+        temperatures, seeds = self._sample_generations(agents_config["personalizer"], num_generations)
+
+        # Generations and comparisons are run from a single node, so each one
+        # can start or be cancelled on its own
+        self._generators = {}
+        for i, (temp, seed) in enumerate(zip(temperatures, seeds)):
+            agent = self._build_personalizer(
+                agents_config["personalizer"],
+                temperature=float(temp),
+                name=f"personalizer_gen_{i + 1}",
+                seed=seed,
+            )
+            self._generators[agent.name] = self.register_agent(agent)
+
+        critic = self._build_pair_critic(agents_config["pair_critic"], name="pair_critic")
+        self.register_agent(critic)
+
+        self._core_graph.add_node("stream_evaluations", self.stream_evaluations)
+        self._core_graph.add_edge(START, "stream_evaluations")
+        self._core_graph.add_edge("stream_evaluations", "merge_evaluations")
+
+        return critic.name
+
     def _build_planner(self, cfg, temperature, name):
         config = LMConfiguration.model_validate(cfg)
         config.temperature = temperature
@@ -252,9 +699,11 @@ class Organization(LangFuseOrganization):
         agent.set_role_variables(self._agents_variables.get("planner", {}))
         return agent
 
-    def _build_personalizer(self, cfg, temperature, name):
+    def _build_personalizer(self, cfg, temperature, name, seed=None):
         config = LMConfiguration.model_validate(cfg)
         config.temperature = temperature
+        if seed is not None:
+            config.seed = seed
 
         agent = PersonalizerAgent(config)
         agent.name = name
@@ -270,44 +719,74 @@ class Organization(LangFuseOrganization):
         agent.set_role_variables(self._agents_variables.get("extractor", {}))
         return agent
 
-    def _sample_temperatures(self, num_generations):
+    def _sample_generations(self, personalizer_cfg, num_generations):
+        # Without a seed, every instantiation samples new temperatures, and the
+        # pipelines build the organization again for every run
+        rng = np.random.default_rng(self.configuration.get("seed"))
+
         min_temp, max_temp = self.configuration.get("temperatures", [0.5, 1.5])
-        return np.random.normal(
+        temperatures = rng.normal(
             np.linspace(min_temp, max_temp, num_generations),
             (1 / (2 ** (num_generations - 1))),
         ).clip(0, 2)
 
-    def _add_pair_critics(self, pair_critic_cfg, num_evals):
-        critic_names = []
+        # Provider seeds are only sent when asked for, as not every model honors them
+        seeds = [None] * num_generations
+        if self.configuration.get("provider_seeds", False):
+            seeds = rng.integers(0, 2**31 - 1, num_generations).tolist()
 
-        for i in range(num_evals):
-            agent = self._build_pair_critic(
-                pair_critic_cfg,
-                name=f"pair_critic_eval_{i + 1}",
-            )
-            critic_names.append(agent.name)
+        return temperatures, seeds
 
-            self.add_agent(agent)
-            self._core_graph.add_edge(agent.name, "merge_evaluations")
+    def _add_triage_critic(self, agents_config):
+        # The triage runs inside the pre-screen, and only if a model is configured
+        if not self.get_screener() or "triage_critic" not in agents_config:
+            return
+
+        agent = TriageCriticAgent(LMConfiguration.model_validate(agents_config["triage_critic"]))
+        self._triage_graph = self.register_agent(agent)
+
+    def _add_pair_critic(self, pair_critic_cfg):
+        # A single node judges every comparison, each one sent with its own payload
+        agent = self._build_pair_critic(pair_critic_cfg, name="pair_critic")
 
-        return critic_names
+        self.add_agent(agent)
+        self._core_graph.add_edge(agent.name, "merge_evaluations")
+
+        return agent.name
 
     def _build_pair_critic(self, cfg, name):
         config = LMConfiguration.model_validate(cfg)
 
-        agent = PairCriticAgent(config)
+        agent = PairCriticAgent(
+            config,
+            debias=self.configuration.get("pair_critic_debias", "none"),
+            max_concurrency=self.configuration.get("pair_critic_concurrency"),
+            close_call_margin=self.configuration.get("close_call_margin", 0),
+        )
         agent.name = name
         agent.set_role_variables(self._agents_variables.get("pair_critic", {}))
         return agent
 
-    def _wire_collector_to_critics(self, critic_names):
+    def _wire_collector_to_critic(self, critic_name):
+        source = "collector"
+
+        if self.configuration.get("deduplicate"):
+            self._core_graph.add_node("deduplicate", self.deduplicate)
+            self._core_graph.add_edge(source, "deduplicate")
+            source = "deduplicate"
+
+        if self.get_screener():
+            self._core_graph.add_node("prescreen", self.prescreen)
+            self._core_graph.add_edge(source, "prescreen")
+            source = "prescreen"
+
         self._core_graph.add_conditional_edges(
-            "collector",
+            source,
             self.distribute_evaluations,
-            {name: name for name in critic_names},
+            {critic_name: critic_name, "merge_evaluations": "merge_evaluations"},
         )
 
-    def _add_post_evaluation_pipeline(self, agents_config):
+    def _add_post_evaluation_pipeline(self, agents_config, critic_name):
         # Edition critic
         edition_critic_config = LMConfiguration.model_validate(
             agents_config["edition_critic"]
@@ -322,7 +801,14 @@ class Organization(LangFuseOrganization):
         editor.set_role_variables(self._agents_variables.get("personalizer", {}))
         self.add_agent(editor)
 
-        self._core_graph.add_edge("merge_evaluations", "edition_critic")
+        if self.configuration.get("evaluation_mode") in ROUND_MODES:
+            self._core_graph.add_conditional_edges(
+                "merge_evaluations",
+                self.route_evaluations,
+                {"edition_critic": "edition_critic", critic_name: critic_name},
+            )
+        else:
+            self._core_graph.add_edge("merge_evaluations", "edition_critic")
 
         self._core_graph.add_conditional_edges(
             "edition_critic",
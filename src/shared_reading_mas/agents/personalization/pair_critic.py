@@ -1,23 +1,87 @@
+import asyncio
+import contextlib
 import random
+import weakref
+from enum import Enum
+from typing import override
 
 from langchain.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph, StateGraph
 
 from shared_reading_mas.agents.core.base_agent import Agent
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.evaluation_aggregate.category import Category
 from shared_reading_mas.domain.evaluation_aggregate.evaluation import Evaluation
+from shared_reading_mas.domain.services.book_digest import content_digest
 from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.judgment_store import get_judgment_store
 from shared_reading_mas.roles.personalization.pair_critic import PairCriticRole
 
 
+class DebiasPolicy(Enum):
+    NONE = "none"
+    """
+    Judge the books in the given order. Only a repeated comparison in the same
+    order is answered from the judgment store.
+    """
+
+    SWAP = "swap"
+    """
+    Judge the books in one order, answering the swapped comparison from the
+    same judgment, so each pair of books is only judged once.
+    """
+
+    BOTH = "both"
+    """
+    Judge both orders concurrently. If the verdicts disagree, the comparison is
+    a tie.
+    """
+
+    CLOSE_CALLS = "close_calls"
+    """
+    Judge the books in one order as with SWAP, and then in the swapped order if
+    the comparison is a close call: the verdict is missing, or the books were
+    within the close call margin in the comparisons judged before. If the
+    verdicts disagree, the comparison is a tie.
+    """
+
+
+_in_flight: dict[tuple, asyncio.Future] = {}
+"""
+Judgments being made, so a concurrent comparison of the same books waits for
+them instead of calling the judge again.
+"""
+
+
 class PairCriticAgent(Agent):
     """
     Agent that evaluates responses based on user preferences.
     """
 
+    debias: DebiasPolicy
+    """
+    How the agent deals with the position bias of the judge.
+    """
+
+    max_concurrency: int | None
+    """
+    Maximum number of judge calls in flight at once, or None for no limit. The
+    organization sends every comparison to the same agent, so this bounds the
+    whole fan-out.
+    """
+
+    close_call_margin: float
+    """
+    Maximum score margin of the books of a close call, see `DebiasPolicy`.
+    """
+
     def __init__(
         self,
         lm_config: LMConfiguration | None = None,
+        debias: DebiasPolicy | str = DebiasPolicy.NONE,
+        max_concurrency: int | None = None,
+        close_call_margin: float = 0,
     ):
         super().__init__(
             name="pair_critic",
@@ -26,6 +90,11 @@ class PairCriticAgent(Agent):
             ],
             lm_config=lm_config,
         )
+        self.debias = DebiasPolicy(debias)
+        self.max_concurrency = max_concurrency
+        self.close_call_margin = close_call_margin
+        # Semaphores are bound to an event loop, and graphs are reused across loops
+        self._semaphores = weakref.WeakKeyDictionary()
 
     def pre_core(self, data: dict) -> dict:
         renderer = BookMarkdownRenderer()
@@ -37,26 +106,30 @@ class PairCriticAgent(Agent):
         else:
             book_1, book_2 = random.sample(data.get("intermediate_books", []), 2)
 
-        self.book_1 = book_1.uid
-        self.book_2 = book_2.uid
-
         message = HumanMessage(
             "Porfavor, indica con una etiqueta (A o B) cuál cuento es mejor. Da tu respuesta **sin explicaciones adicionales**.\n\n**Cuento original**:\n"
             + renderer.render(data.get("original_book", ""))
             + "\n\n**Cuento personalizado A**:\n"
             + renderer.render(book_1)
             + "\n\n**Cuento personalizado B**:\n"
-            + renderer.render(book_2)
+            + renderer.render(book_2),
+            # Kept in the message, not in the agent, so concurrent runs never mix pairs
+            additional_kwargs={"compared_books": [str(book_1.uid), str(book_2.uid)]},
         )
 
         return {"messages": [message]}
 
     def post_core(self, data: dict) -> dict:
         last_message = data["messages"][-1].content
+        book_1, book_2 = next(
+            message.additional_kwargs["compared_books"]
+            for message in reversed(data["messages"])
+            if "compared_books" in message.additional_kwargs
+        )
 
         lines = last_message.replace("*", "").replace("`", "").splitlines()
 
-        evaluation = Evaluation(label="", reasoning="", changes="")
+        evaluation = self._evaluation(book_1, book_2, "")
         finish = False
         i = 0
 
@@ -69,24 +142,162 @@ class PairCriticAgent(Agent):
 
                 if word == "A":
                     print(f"Agent {self.name} selected book A as better.")
-                    evaluation.label = str(self.book_1)
+                    evaluation.label = book_1
                     finish = True
 
                 elif word == "B":
                     print(f"Agent {self.name} selected book B as better.")
-                    evaluation.label = str(self.book_2)
+                    evaluation.label = book_2
                     finish = True
 
                 j += 1
 
             i += 1
 
-        evaluation.criteria = Category(
-            type="Pairwise Comparison",
-            description="Comparison between two personalized versions of the book.",
-            indicators=[],
-            importance="high",
-        )
         return_dict = {"evaluations": [evaluation]}
 
         return return_dict
+
+    async def judge(self, data: dict) -> dict:
+        """
+        Compares the two intermediate books, in one or both orders depending on
+        the debiasing policy, reusing stored and in-flight judgments.
+
+        Args:
+            data (dict): The information data for the agent.
+
+        Returns:
+            dict: The evaluation of the comparison and the judge messages.
+        """
+        books = data.get("intermediate_books", [])
+        book_1, book_2 = books if len(books) == 2 else random.sample(books, 2)
+
+        if content_digest(book_1) == content_digest(book_2):
+            print(f"Agent {self.name} compared two books with the same content, the comparison is a tie.")
+            return {"evaluations": [self._evaluation(str(book_1.uid), str(book_2.uid), "")], "messages": []}
+
+        orders = [(book_1, book_2)]
+        if self.debias is DebiasPolicy.BOTH:
+            orders.append((book_2, book_1))
+
+        # Both orders are two opinions, so they are never answered from each other
+        symmetric = len(orders) == 1 and self.debias is not DebiasPolicy.NONE
+        judgments = await asyncio.gather(
+            *(self._judge_order(data, first, second, symmetric) for first, second in orders)
+        )
+
+        winners = {winner for winner, _ in judgments}
+        if self.debias is DebiasPolicy.CLOSE_CALLS:
+            margin = data.get("score_margin")
+            if not judgments[0][0] or (margin is not None and margin <= self.close_call_margin):
+                print(f"Agent {self.name} judges a close call in the swapped order too.")
+                judgments.append(await self._judge_order(data, book_2, book_1, False))
+                # A missing verdict is no opinion, so the swapped order decides
+                winners = {winner for winner, _ in judgments if winner}
+
+        label = winners.pop() if len(winners) == 1 else ""
+        if len(winners) > 1:
+            print(f"Agent {self.name} got opposite verdicts in both orders, the comparison is a tie.")
+
+        return {
+            "evaluations": [self._evaluation(str(book_1.uid), str(book_2.uid), label)],
+            "messages": [message for _, messages in judgments for message in messages],
+        }
+
+    @override
+    def instanciate(self) -> CompiledStateGraph:
+        self._agent = self.core()
+
+        graph = StateGraph(
+            state_schema=self.organization.information_schema
+            if self.organization
+            else self.information_schema
+        )
+        graph.add_node(self.name + "_judge", self.judge)
+        graph.set_entry_point(self.name + "_judge")
+        graph.set_finish_point(self.name + "_judge")
+        return graph.compile()
+
+    async def _judge_order(
+        self, data: dict, first: Book, second: Book, symmetric: bool
+    ) -> tuple[str, list]:
+        store = get_judgment_store()
+        judge_model = f"{self.lm_config.base_provider}/{self.lm_config.base_model}"
+        original_digest = content_digest(data["original_book"])
+        first_digest, second_digest = content_digest(first), content_digest(second)
+
+        # Verdicts are stored by position and shared by content digest, which
+        # differs between the books, as identical books are never judged
+        winners = {"A": first_digest, "B": second_digest, "": ""}
+        uids = {first_digest: str(first.uid), second_digest: str(second.uid), "": ""}
+
+        if store:
+            verdict = store.get(original_digest, first_digest, second_digest, judge_model)
+            if verdict is None and symmetric:
+                verdict = {"A": "B", "B": "A", "": ""}.get(
+                    store.get(original_digest, second_digest, first_digest, judge_model)
+                )
+
+            if verdict is not None:
+                print(f"Agent {self.name} reused a stored judgment.")
+                return {"A": str(first.uid), "B": str(second.uid), "": ""}[verdict], []
+
+        loop = asyncio.get_running_loop()
+        pair = frozenset((first_digest, second_digest)) if symmetric else (first_digest, second_digest)
+        key = (id(loop), original_digest, pair, judge_model)
+
+        if key in _in_flight:
+            print(f"Agent {self.name} waits for the same comparison in flight.")
+            return uids.get(await _in_flight[key], ""), []
+
+        future = _in_flight[key] = loop.create_future()
+        try:
+            order_data = {**data, "intermediate_books": [first, second]}
+            order_data.update(self.pre_core(order_data))
+            order_data.update(self.apply_permissions(order_data))
+
+            async with self._limit():
+                result = await self._agent.ainvoke(order_data)
+            label = self.post_core(result)["evaluations"][0].label
+            result["messages"][-1].name = self.name
+
+            verdict = "A" if label == str(first.uid) else "B" if label == str(second.uid) else ""
+            if store:
+                store.put(original_digest, first_digest, second_digest, judge_model, verdict)
+
+            future.set_result(winners[verdict])
+            return label, result["messages"]
+
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved, so it is not reported when no comparison was waiting
+            future.exception()
+            raise
+
+        finally:
+            future.cancel()
+            del _in_flight[key]
+
+    def _limit(self) -> asyncio.Semaphore | contextlib.nullcontext:
+        if self.max_concurrency is None:
+            return contextlib.nullcontext()
+
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphores[loop]
+
+    def _evaluation(self, book_1: str, book_2: str, label: str) -> Evaluation:
+        return Evaluation(
+            label=label,
+            reasoning="",
+            changes="",
+            compared=[book_1, book_2],
+            criteria=Category(
+                type="Pairwise Comparison",
+                description="Comparison between two personalized versions of the book.",
+                indicators=[],
+                importance="high",
+            ),
+        )
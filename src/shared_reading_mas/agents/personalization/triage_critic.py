@@ -0,0 +1,85 @@
+import re
+
+from langchain.messages import HumanMessage
+
+from shared_reading_mas.agents.core.base_agent import Agent
+from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+from shared_reading_mas.domain.evaluation_aggregate.category import Category
+from shared_reading_mas.domain.evaluation_aggregate.evaluation import Evaluation
+from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.roles.personalization.triage_critic import TriageCriticRole
+
+REJECTION = re.compile(r"\bINV[AÁ]LIDO\b|^\W*NO\b")
+"""
+Answers that reject a book: INVÁLIDO anywhere, or an answer starting with NO.
+"""
+
+
+def triage_label(answer: str) -> str:
+    """
+    Gets the label of a triage answer. Anything but an explicit rejection keeps
+    the book, a triage never discards a good candidate on an unclear answer.
+
+    Args:
+        answer (str): The answer of the triage critic.
+
+    Returns:
+        str: "inválido" if the answer rejects the book, otherwise "válido".
+    """
+    return "inválido" if REJECTION.search(answer.upper()) else "válido"
+
+
+class TriageCriticAgent(Agent):
+    """
+    Agent that decides, with a small model, whether a personalization response
+    is worth comparing with the premium pair critic.
+    """
+
+    def __init__(
+        self,
+        lm_config: LMConfiguration | None = None,
+    ):
+        super().__init__(
+            name="triage_critic",
+            roles=[TriageCriticRole()],
+            lm_config=lm_config,
+        )
+
+    def pre_core(self, data: dict) -> dict:
+        super().pre_core(data)
+
+        renderer = BookMarkdownRenderer()
+        book = data["intermediate_books"][-1]
+
+        request = HumanMessage(
+            "Porfavor, indica si el cuento personalizado es una personalización válida del cuento original. "
+            "Responde únicamente VÁLIDO o INVÁLIDO, **sin explicaciones adicionales**."
+            + "\n\n**Cuento original**:\n"
+            + renderer.render(data.get("original_book", ""))
+            + "\n\n**Cuento personalizado**:\n"
+            + renderer.render(book)
+        )
+
+        return {"messages": [request]}
+
+    def post_core(self, data: dict) -> dict:
+        super().post_core(data)
+
+        last_message = data["messages"][-1].content
+        book = data["intermediate_books"][-1].uid
+
+        label = triage_label(last_message)
+        print(f"Agent {self.name} found book {book} {label}.")
+
+        evaluation = Evaluation(
+            label=label,
+            reasoning="",
+            changes="",
+            criteria=Category(
+                type="Triage",
+                description="Whether a personalized version of the book is worth comparing.",
+                indicators=[],
+                importance="low",
+            ),
+        )
+        return {"evaluations": [evaluation]}
@@ -1,15 +1,22 @@
 import copy
 import random
+from typing import override
 
 from langchain.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph, StateGraph
 
 from shared_reading_mas.agents.core.base_agent import Agent
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+from shared_reading_mas.agents.questions.page_questions import (
+    PageQuestions,
+    request_page_questions,
+)
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.book_aggregate.content import Content, ContentType
 from shared_reading_mas.domain.book_aggregate.page import Page
 from shared_reading_mas.domain.services.book_parser import BookParser
 from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.domain.services.question_preselector import QuestionPreselector
 from shared_reading_mas.roles.questions.aggregator import AggregatorRole
 
 
@@ -18,6 +25,24 @@ class AggregatorAgent(Agent):
     Agent that aggregates questions for a story.
     """
 
+    page_retries: int = 1
+    """
+    Number of times the pages missing from a structured response are requested
+    again.
+    """
+
+    preselector: QuestionPreselector | None = None
+    """
+    Local pre-aggregation of the questions, which leaves the model a compact
+    set of candidates per page, or None to show it every question.
+    """
+
+    rules: bool = False
+    """
+    Whether the questions are selected by the preselector alone, without
+    calling the model.
+    """
+
     def __init__(
         self,
         lm_config: LMConfiguration | None = None,
@@ -28,19 +53,54 @@ class AggregatorAgent(Agent):
             lm_config=lm_config,
         )
 
+    def set_structured_output(self, enabled: bool, retries: int = 1):
+        """
+        Sets the structured output mode, where the selected questions are
+        answered as a `PageQuestions` response instead of a markdown book.
+        Pages missing from the response are requested again on their own.
+
+        Args:
+            enabled (bool): Whether the structured output mode is used.
+            retries (int): Number of times the missing pages are requested again.
+        """
+        self.response_format = PageQuestions if enabled else None
+        self.page_retries = retries
+
+    def set_preselection(self, preselector: QuestionPreselector | None, rules: bool = False):
+        """
+        Sets the local pre-aggregation of the questions.
+
+        Args:
+            preselector (QuestionPreselector | None): The preselector, or None to
+                show the model every question.
+            rules (bool): Whether the preselector selects the questions alone,
+                without calling the model.
+        """
+        self.preselector = preselector
+        self.rules = rules
+
     def pre_core(self, data: dict) -> dict:
         super().pre_core(data)
         renderer = BookMarkdownRenderer()
+        num_pages = len(data.get("original_book").pages)
+        books = list(data.get("questions_books", []))
+
+        if self.preselector:
+            candidates = self.preselector.candidates(books, num_pages)
+        else:
+            candidates = [
+                [(questions_book.title, questions_book.pages[page_number].contents[0].text) for questions_book in books]
+                for page_number in range(num_pages)
+            ]
 
         # Aggregate questions from different questioner agents into a single book with all the questions per page.
         aggregated_questions = Book(title="# CROWD Questions per page", pages=[])
-        for page_number in range(len(data.get("original_book").pages)):
+        for page_candidates in candidates:
             content_str = ""
 
-            books = list(data.get("questions_books", []))
-
-            for questions_book in random.sample(books, len(books)):
-                content_str += f"**{questions_book.title}**: {questions_book.pages[page_number].contents[0].text}\n"
+            # Shuffled, so the model does not favour a type by its position
+            for question_type, question in random.sample(page_candidates, len(page_candidates)):
+                content_str += f"**{question_type}**: {question}\n"
 
             aggregated_questions.pages.append(
                 Page(
@@ -60,6 +120,12 @@ class AggregatorAgent(Agent):
             + "\n\n"
             + "**Intervenciones CROWD para cada página**:\n"
             + renderer.render(aggregated_questions)
+            + (
+                f"\n\nResponde con la pregunta seleccionada para cada página, de la 1 a la "
+                f"{len(aggregated_questions.pages)}, indicando su número de página."
+                if self.response_format is not None
+                else ""
+            )
         )
 
         return {"messages": [request]}
@@ -79,3 +145,80 @@ class AggregatorAgent(Agent):
             )
 
         return {"questions_book": book, "modified_book": modified_book}
+
+    async def select_questions(self, data: dict) -> dict:
+        """
+        Selects the question of each page with a structured response, requesting
+        again only the pages left without one.
+
+        Args:
+            data (dict): The information data for the agent.
+
+        Returns:
+            dict: The questions book, the book with the questions and the messages.
+        """
+        request_data = {**data, **self.pre_core(data)}
+        request_data.update(self.apply_permissions(request_data))
+
+        pages = range(1, len(data["original_book"].pages) + 1)
+        questions, messages = await request_page_questions(self, request_data, pages, self.page_retries)
+
+        return {**self._questions_result(data, questions), "messages": messages}
+
+    def select_by_rules(self, data: dict) -> dict:
+        """
+        Selects the question of each page with the preselector alone.
+
+        Args:
+            data (dict): The information data for the agent.
+
+        Returns:
+            dict: The questions book and the book with the questions.
+        """
+        selection = self.preselector.select(
+            list(data.get("questions_books", [])), len(data["original_book"].pages)
+        )
+        return self._questions_result(
+            data,
+            {page: question.text for page, question in enumerate(selection, start=1) if question},
+        )
+
+    def _questions_result(self, data: dict, questions: dict[int, str]) -> dict:
+        pages = range(1, len(data["original_book"].pages) + 1)
+        book = Book(
+            title="CROWD",
+            pages=[
+                Page(contents=[Content(type=ContentType.QUESTION, text=questions.get(page, ""))])
+                for page in pages
+            ],
+        )
+
+        # Pages without a selected question are left as they are
+        modified_book = copy.deepcopy(data["original_book"])
+        for page, original_page in zip(pages, modified_book.pages):
+            if page in questions:
+                original_page.contents.append(
+                    Content(type=ContentType.QUESTION, text=questions[page])
+                )
+
+        return {"questions_book": book, "modified_book": modified_book}
+
+    @override
+    def instanciate(self) -> CompiledStateGraph:
+        if self.response_format is None and not self.rules:
+            return super().instanciate()
+
+        graph = StateGraph(
+            state_schema=self.organization.information_schema
+            if self.organization
+            else self.information_schema
+        )
+
+        if self.rules:
+            graph.add_node(self.name + "_select", self.select_by_rules)
+        else:
+            self._agent = self.core()
+            graph.add_node(self.name + "_select", self.select_questions)
+        graph.set_entry_point(self.name + "_select")
+        graph.set_finish_point(self.name + "_select")
+        return graph.compile()
@@ -1,8 +1,12 @@
-from langchain.messages import HumanMessage
+from langchain.messages import AIMessage, HumanMessage
 
 from shared_reading_mas.agents.core.base_agent import Agent
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+from shared_reading_mas.analysis_store import get_analysis_store
+from shared_reading_mas.domain.book_aggregate.book import Book
+from shared_reading_mas.domain.services.book_digest import content_digest
 from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.roles.prompt_cache import get_prompt_cache
 from shared_reading_mas.roles.questions.extractor import ExtractorRole
 
 
@@ -31,3 +35,50 @@ class ExtractorAgent(Agent):
 
         return {"messages": [request]}
 
+    def post_core(self, data: dict) -> dict:
+        super().post_core(data)
+
+        store = get_analysis_store()
+        if store:
+            store.put(*self.analysis_key(data["original_book"]), data["messages"][-1].text)
+
+        return {}
+
+    def analysis_key(self, book: Book) -> tuple[str, str, str]:
+        """
+        Gets the key of the analysis of a book in the analysis store.
+
+        Args:
+            book (Book): The analysed book.
+
+        Returns:
+            tuple[str, str, str]: The content digest of the book, the extractor
+                model and the version of the extractor prompt.
+        """
+        prompt_version = get_prompt_cache().get_entry(next(iter(self.roles)).name)["version"]
+        return (
+            content_digest(book),
+            f"{self.lm_config.base_provider}/{self.lm_config.base_model}",
+            str(prompt_version),
+        )
+
+    def stored_analysis(self, data: dict) -> str | None:
+        """
+        Gets the stored analysis of the original book.
+
+        Args:
+            data (dict): The information data for the agent.
+
+        Returns:
+            str | None: The analysis, or None if it must be extracted.
+        """
+        store = get_analysis_store()
+        if store is None:
+            return None
+
+        return store.get(*self.analysis_key(data["original_book"]))
+
+    def reuse_analysis(self, data: dict) -> dict:
+        """Answers with the stored analysis of the original book, without calling the model."""
+        print(f"Agent {self.name} reused a stored analysis.")
+        return {"messages": [AIMessage(self.stored_analysis(data), name=self.name)]}
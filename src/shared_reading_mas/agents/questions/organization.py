@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import override
 
 from langgraph.graph import END, START
@@ -17,6 +18,11 @@ from shared_reading_mas.agents.questions.questioner import (
     RecallQuestionerAgent,
     WhQuestionerAgent,
 )
+from shared_reading_mas.domain.services.image_attachments import (
+    DEFAULT_MAX_SIZE,
+    ImageAttachments,
+)
+from shared_reading_mas.domain.services.question_preselector import QuestionPreselector
 
 
 class Organization(LangFuseOrganization):
@@ -40,6 +46,31 @@ class Organization(LangFuseOrganization):
     def collect_books(self, state: dict):
         return {"original_book": state.get("original_book")}
 
+    def route_analysis(self, state: dict) -> str:
+        """Skips the extractor if the original book was analysed before."""
+        extractor = self.get_agent("extractor")
+
+        if extractor.stored_analysis(state) is not None:
+            return "stored_analysis"
+
+        return extractor.name
+
+    def get_preselector(self) -> QuestionPreselector | None:
+        """
+        Builds the preselector of the "preaggregation" configuration key, either
+        true or the arguments of `QuestionPreselector`. The "rules" aggregation
+        mode always needs one.
+
+        Returns:
+            QuestionPreselector | None: The preselector, or None if the aggregator
+                sees every question.
+        """
+        options = self.configuration.get("preaggregation")
+        if not options and options != {} and self.configuration.get("aggregation_mode") != "rules":
+            return None
+
+        return QuestionPreselector(**(options if isinstance(options, dict) else {}))
+
     def route_edition(self, state: dict) -> str:
         """Routes to the questions editor after evaluations."""
 
@@ -69,9 +100,38 @@ class Organization(LangFuseOrganization):
 
         distancing_agent = DistancingQuestionerAgent(lm_config=lm_config)
 
+        # Images are downsized and encoded once for every questioner using them
+        url_root = self.configuration.get("image_url_root")
+        attachments = ImageAttachments(
+            max_size=self.configuration.get("image_max_size", DEFAULT_MAX_SIZE),
+            url_base=self.configuration.get("image_url_base"),
+            url_root=Path(url_root) if url_root else None,
+        )
+
+        # Long books are split into windows of pages, requested concurrently
+        for questioner in (recall_agent, open_ended_agent, wh_agent, distancing_agent):
+            questioner.attachments = attachments
+            questioner.set_structured_output(
+                self.configuration.get("response_mode", "markdown") == "structured",
+                retries=self.configuration.get("page_retries", 1),
+            )
+            questioner.set_chunking(
+                self.configuration.get("chunk_size"),
+                overlap=self.configuration.get("chunk_overlap", 0),
+                retries=self.configuration.get("chunk_retries", 1),
+            )
+
         aggregator_agent = AggregatorAgent(
             lm_config=LMConfiguration.model_validate(agents_config["aggregator"])
         )
+        aggregator_agent.set_structured_output(
+            self.configuration.get("response_mode", "markdown") == "structured",
+            retries=self.configuration.get("page_retries", 1),
+        )
+        aggregator_agent.set_preselection(
+            self.get_preselector(),
+            rules=self.configuration.get("aggregation_mode", "llm") == "rules",
+        )
 
         extractor_agent = ExtractorAgent(
             lm_config=LMConfiguration.model_validate(agents_config["extractor"])
@@ -91,14 +151,21 @@ class Organization(LangFuseOrganization):
         )
 
         self._core_graph.add_node("collector", self.collect_books)
+        self._core_graph.add_node("stored_analysis", extractor_agent.reuse_analysis)
 
-        # Entry point
-        self._core_graph.add_edge(START, extractor_agent.name)
+        # Entry point, an analysis in the analysis store replaces the extractor
+        self._core_graph.add_conditional_edges(
+            START,
+            self.route_analysis,
+            {extractor_agent.name: extractor_agent.name, "stored_analysis": "stored_analysis"},
+        )
         #self._core_graph.add_edge(extractor_agent.name, completion_agent.name)
         self._core_graph.add_edge(extractor_agent.name, recall_agent.name)
         self._core_graph.add_edge(extractor_agent.name, open_ended_agent.name)
         self._core_graph.add_edge(extractor_agent.name, wh_agent.name)
         self._core_graph.add_edge(extractor_agent.name, distancing_agent.name)
+        for questioner in (recall_agent, open_ended_agent, wh_agent, distancing_agent):
+            self._core_graph.add_edge("stored_analysis", questioner.name)
         #self._core_graph.add_edge(completion_agent.name, completion_refiner_agent.name)
         self._core_graph.add_edge(
             [
@@ -123,4 +190,4 @@ class Organization(LangFuseOrganization):
         #     },
         # )
 
-        return self._core_graph.compile()
+        return self._core_graph.compile(checkpointer=self.checkpointer)
@@ -0,0 +1,92 @@
+from langchain.messages import AIMessage, HumanMessage
+from pydantic import BaseModel, Field, ValidationError
+
+from shared_reading_mas.agents.core.base_agent import Agent
+
+
+class PageQuestion(BaseModel):
+    """The question of a page of the story."""
+
+    page: int = Field(..., description="Number of the page, starting at 1.")
+    question: str = Field(..., description="The question for the page.")
+
+
+class PageQuestions(BaseModel):
+    """The questions of the pages of the story, one per page."""
+
+    questions: list[PageQuestion] = Field(
+        ..., description="The question of each page, in page order."
+    )
+
+
+def decode_page_questions(response: PageQuestions | dict | None, pages: range) -> dict[int, str]:
+    """
+    Validates a structured response, keeping the first non-empty question of
+    each expected page.
+
+    Args:
+        response (PageQuestions | dict | None): The structured response.
+        pages (range): The expected page numbers.
+
+    Returns:
+        dict[int, str]: The question of each answered page.
+    """
+    if isinstance(response, dict):
+        try:
+            response = PageQuestions.model_validate(response)
+        except ValidationError:
+            return {}
+
+    questions = {}
+    for item in response.questions if response else []:
+        if item.page in pages and item.question.strip() and item.page not in questions:
+            questions[item.page] = item.question.strip()
+
+    return questions
+
+
+async def request_page_questions(
+    agent: Agent, data: dict, pages: range, retries: int = 1
+) -> tuple[dict[int, str], list]:
+    """
+    Requests the questions of the pages with the structured response of the
+    agent. Pages left without a valid question are requested again in the
+    same conversation, without the pages already answered.
+
+    Args:
+        agent (Agent): The agent, compiled with `PageQuestions` as its response format.
+        data (dict): The information data with the request.
+        pages (range): The page numbers to answer.
+        retries (int): Number of times the missing pages are requested again.
+
+    Returns:
+        tuple[dict[int, str], list]: The question of each answered page, and the
+            messages of the conversation.
+    """
+    questions = {}
+    messages = data["messages"]
+
+    for attempt in range(retries + 1):
+        result = await agent._agent.ainvoke({**data, "messages": messages})
+        messages = result["messages"]
+        for message in messages:
+            if isinstance(message, AIMessage) and not message.name:
+                message.name = agent.name
+
+        for page, question in decode_page_questions(result.get("structured_response"), pages).items():
+            questions.setdefault(page, question)
+
+        missing = [page for page in pages if page not in questions]
+        if not missing:
+            break
+
+        print(f"Agent {agent.name} missed the pages {', '.join(map(str, missing))}, attempt {attempt + 1}.")
+        messages = [
+            *messages,
+            HumanMessage(
+                f"Faltan las preguntas de las páginas {', '.join(map(str, missing))}. "
+                "Genéralas solo para esas páginas."
+            ),
+        ]
+
+    return questions, messages
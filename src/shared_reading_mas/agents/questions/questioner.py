@@ -1,14 +1,28 @@
+import asyncio
 import copy
+from typing import override
 
 from langchain.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph, StateGraph
 
 from shared_reading_mas.agents.core.base_agent import Agent
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
 from shared_reading_mas.agents.personalization.information import Information
+from shared_reading_mas.agents.questions.page_questions import (
+    PageQuestions,
+    request_page_questions,
+)
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.book_aggregate.content import Content, ContentType
+from shared_reading_mas.domain.book_aggregate.page import Page
+from shared_reading_mas.domain.services.book_chunker import (
+    BookChunk,
+    chunk_book,
+    page_owners,
+)
 from shared_reading_mas.domain.services.book_parser import BookParser
 from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.domain.services.image_attachments import ImageAttachments
 from shared_reading_mas.roles.core.base_role import Role, RoleCollection
 from shared_reading_mas.roles.questions.questioner import (
     CompletionQuestionerRole,
@@ -19,12 +33,46 @@ from shared_reading_mas.roles.questions.questioner import (
     WhQuestionerRole,
 )
 
+URL_PROVIDERS = {"openrouter", "inferencer"}
+"""
+Providers that download the images referenced by URL.
+"""
+
 
 class QuestionerAgent(Agent):
     """
     Agent that creates questions for a story.
     """
 
+    chunk_size: int | None = None
+    """
+    Number of pages per request in the chunked mode, or None to ask for the
+    questions of the whole book at once.
+    """
+
+    chunk_overlap: int = 0
+    """
+    Number of pages shared by consecutive chunks, given as context.
+    """
+
+    chunk_retries: int = 1
+    """
+    Number of times a chunk is requested again if the answer does not have one
+    question per page.
+    """
+
+    page_retries: int = 1
+    """
+    Number of times the pages missing from a structured response are requested
+    again.
+    """
+
+    attachments: ImageAttachments
+    """
+    Builds the image parts of the requests, shared by every questioner of the
+    organization.
+    """
+
     def __init__(
         self,
         name: str,
@@ -36,6 +84,35 @@ class QuestionerAgent(Agent):
             name=name, roles=roles, lm_config=lm_config, information_schema=Information
         )
         self.uses_images = uses_images
+        self.attachments = ImageAttachments()
+
+    def set_chunking(self, size: int | None, overlap: int = 0, retries: int = 1):
+        """
+        Sets the chunked mode, where the pages of the book are split into
+        windows whose questions are requested concurrently, and then stitched
+        back together. A malformed answer only requests its chunk again.
+
+        Args:
+            size (int | None): Number of pages per chunk, or None to disable it.
+            overlap (int): Number of pages shared by consecutive chunks.
+            retries (int): Number of times a malformed chunk is requested again.
+        """
+        self.chunk_size = size
+        self.chunk_overlap = overlap
+        self.chunk_retries = retries
+
+    def set_structured_output(self, enabled: bool, retries: int = 1):
+        """
+        Sets the structured output mode, where the questions are answered as a
+        `PageQuestions` response instead of a markdown book. Pages missing from
+        the response are requested again on their own.
+
+        Args:
+            enabled (bool): Whether the structured output mode is used.
+            retries (int): Number of times the missing pages are requested again.
+        """
+        self.response_format = PageQuestions if enabled else None
+        self.page_retries = retries
 
     def pre_core(self, data: dict) -> dict:
         super().pre_core(data)
@@ -46,26 +123,31 @@ class QuestionerAgent(Agent):
 
         contents = [{"type": "text", "text": f"Porfavor, genera para el siguiente cuento:\n\n{renderer.render(original_book)}"}]
 
+        # Only set by the chunked mode, which renders a window of the book
+        first, last, total = data.get("page_range") or (1, len(original_book.pages), len(original_book.pages))
+        if data.get("page_range"):
+            contents.append({"type": "text", "text": f"\nEste fragmento contiene las páginas {first} a {last} de las {total} del cuento. Genera una para cada página del fragmento."})
+
+        if self.response_format is not None:
+            contents.append({"type": "text", "text": f"\nResponde con una pregunta para cada página, de la {first} a la {last}, indicando su número de página."})
+
         if self.uses_images and original_book.has_images(include_front_page_image=False):
-            contents.extend(self._create_images_messages(original_book))
+            contents.extend(self._create_images_messages(original_book, first_page=first))
 
         contents.append({"type": "text", "text": f"\n**Debes usar este análisis del cuento original, para las preguntas**:\n{last_message}"})
         request = HumanMessage(content=contents)
 
         return {"messages": [request]}
 
-    def _create_images_messages(self, book: Book) -> list[HumanMessage]:
+    def _create_images_messages(self, book: Book, first_page: int = 1) -> list[HumanMessage]:
         images_parts = []
 
         for i, page in enumerate(book.pages):
             for image in page.images:
                 images_parts.extend(
                     [
-                        {"type": "text", "text": f"\nImágen de **Página {i + 1}**:\n"},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{image.data}"},
-                        },
+                        {"type": "text", "text": f"\nImágen de **Página {first_page + i}**:\n"},
+                        self.attachments.part(image, allow_urls=self.lm_config.base_provider in URL_PROVIDERS),
                     ]
                 )
 
@@ -86,6 +168,104 @@ class QuestionerAgent(Agent):
         else:
             return {}
 
+    async def generate_by_chunks(self, data: dict) -> dict:
+        """
+        Generates the questions of the book one chunk of pages at a time, all
+        chunks concurrently, and stitches them into a single questions book.
+        Without a chunk size, the whole book is a single chunk.
+
+        Args:
+            data (dict): The information data for the agent.
+
+        Returns:
+            dict: The questions book and the messages of every chunk.
+        """
+        original_book = data["original_book"]
+        chunk_size = self.chunk_size or max(1, len(original_book.pages))
+        chunks = chunk_book(original_book, chunk_size, self.chunk_overlap)
+        results = await asyncio.gather(
+            *(self._generate_chunk(data, chunk, len(original_book.pages)) for chunk in chunks)
+        )
+
+        pages = [
+            results[owner][0].pages[page - chunks[owner].start]
+            for page, owner in enumerate(page_owners(chunks, len(original_book.pages)))
+        ]
+        book = Book(title=next(iter(self.roles)).prompt.type, pages=pages)
+        messages = [message for _, chunk_messages in results for message in chunk_messages]
+
+        if book.title != "C: Completion":
+            return {"questions_books": [book], "messages": messages}
+        else:
+            return {"messages": messages}
+
+    @override
+    def instanciate(self) -> CompiledStateGraph:
+        if self.chunk_size is None and self.response_format is None:
+            return super().instanciate()
+
+        self._agent = self.core()
+
+        graph = StateGraph(
+            state_schema=self.organization.information_schema
+            if self.organization
+            else self.information_schema
+        )
+        graph.add_node(self.name + "_chunks", self.generate_by_chunks)
+        graph.set_entry_point(self.name + "_chunks")
+        graph.set_finish_point(self.name + "_chunks")
+        return graph.compile()
+
+    async def _generate_chunk(
+        self, data: dict, chunk: BookChunk, num_pages: int
+    ) -> tuple[Book, list]:
+        chunk_data = {
+            **data,
+            "original_book": chunk.book,
+            "page_range": (chunk.pages.start + 1, chunk.pages.stop, num_pages)
+            if len(chunk.book.pages) < num_pages
+            else None,
+        }
+        chunk_data.update(self.pre_core(chunk_data))
+        chunk_data.update(self.apply_permissions(chunk_data))
+
+        if self.response_format is not None:
+            pages = range(chunk.pages.start + 1, chunk.pages.stop + 1)
+            questions, messages = await request_page_questions(self, chunk_data, pages, self.page_retries)
+
+            # The aggregator expects a question per page, so the missing ones are left empty
+            return Book(
+                title=next(iter(self.roles)).prompt.type,
+                pages=[
+                    Page(contents=[Content(type=ContentType.QUESTION, text=questions.get(page, ""))])
+                    for page in pages
+                ],
+            ), messages
+
+        messages = []
+        for attempt in range(self.chunk_retries + 1):
+            result = await self._agent.ainvoke(chunk_data)
+            result["messages"][-1].name = self.name
+            messages.extend(result["messages"])
+
+            book = BookParser().parse(result["messages"][-1].content)
+            if len(book.pages) == len(chunk.book.pages) and all(page.contents for page in book.pages):
+                return book, messages
+
+            print(
+                f"Agent {self.name} answered {len(book.pages)} pages for pages "
+                f"{chunk.pages.start + 1} to {chunk.pages.stop}, attempt {attempt + 1}."
+            )
+
+        # The aggregator expects a question per page, so the missing ones are left empty
+        pages = [
+            book.pages[i]
+            if i < len(book.pages) and book.pages[i].contents
+            else Page(contents=[Content(type=ContentType.QUESTION, text="")])
+            for i in range(len(chunk.book.pages))
+        ]
+        return Book(title=book.title, pages=pages), messages
+
 
 class CompletionQuestionerAgent(QuestionerAgent):
     """
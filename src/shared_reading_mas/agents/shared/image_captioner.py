@@ -2,6 +2,7 @@ from langchain.messages import HumanMessage
 
 from shared_reading_mas.agents.core.base_agent import Agent
 from shared_reading_mas.agents.core.base_lm_config import LMConfiguration
+from shared_reading_mas.domain.services.image_store import get_image_store
 from shared_reading_mas.roles.shared.image_captioner import ImageCaptionerRole
 
 
@@ -21,7 +22,7 @@ class ImageCaptionerAgent(Agent):
         )
 
     def pre_core(self, data: dict) -> dict:
-        image = data.get("image").data
+        image = get_image_store().load_base64(data.get("image"))
         request = HumanMessage(
             content=[
                 {"type": "text", "text": "Hazlo para esta imagen:"},
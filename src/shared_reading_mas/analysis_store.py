@@ -0,0 +1,101 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class AnalysisStore:
+    """
+    Persistent store of the story analyses of the questions extractor, backed
+    by a SQLite file.
+
+    Each analysis is keyed by the content digest of the analysed book, the
+    extractor model and the version of the extractor prompt, so a new model or
+    prompt analyses the story again.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Initializes the store, creating the database file if needed.
+
+        Args:
+            path (str | Path): The SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "book_digest TEXT NOT NULL, extractor_model TEXT NOT NULL, "
+                "prompt_version TEXT NOT NULL, analysis TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (book_digest, extractor_model, prompt_version))"
+            )
+
+    def get(self, book_digest: str, extractor_model: str, prompt_version: str) -> str | None:
+        """
+        Gets the analysis of a book.
+
+        Args:
+            book_digest (str): The content digest of the book.
+            extractor_model (str): The provider and model of the extractor.
+            prompt_version (str): The version of the extractor prompt.
+
+        Returns:
+            str | None: The analysis, or None if the book was never analysed.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT analysis FROM analyses WHERE book_digest = ? AND extractor_model = ? "
+                "AND prompt_version = ?",
+                (book_digest, extractor_model, prompt_version),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def put(self, book_digest: str, extractor_model: str, prompt_version: str, analysis: str):
+        """
+        Stores the analysis of a book.
+
+        Args:
+            book_digest (str): The content digest of the book.
+            extractor_model (str): The provider and model of the extractor.
+            prompt_version (str): The version of the extractor prompt.
+            analysis (str): The analysis.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                (book_digest, extractor_model, prompt_version, analysis, time.time()),
+            )
+
+
+_analysis_store: AnalysisStore | None = None
+
+
+def enable_analysis_store(path: str | Path) -> AnalysisStore:
+    """
+    Makes every questions extractor read and write its analyses in a
+    persistent store.
+
+    Args:
+        path (str | Path): The SQLite database file.
+
+    Returns:
+        AnalysisStore: The store in use.
+    """
+    global _analysis_store
+    _analysis_store = AnalysisStore(path)
+    return _analysis_store
+
+
+def get_analysis_store() -> AnalysisStore | None:
+    """
+    Gets the analysis store in use.
+
+    Returns:
+        AnalysisStore | None: The store, or None if analyses are not persisted.
+    """
+    return _analysis_store
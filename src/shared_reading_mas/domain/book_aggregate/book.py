@@ -3,6 +3,7 @@ from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+from shared_reading_mas.domain.book_aggregate.content import ContentType
 from shared_reading_mas.domain.book_aggregate.image import Image
 from shared_reading_mas.domain.book_aggregate.page import Page
 
@@ -27,6 +28,16 @@ class Book(BaseModel):
     def __hash__(self):
         return hash(self.uid)
 
+    def text(self) -> str:
+        """Returns the title and the text blocks of the book, without questions."""
+        blocks = [
+            content.text
+            for page in self.pages
+            for content in page.contents
+            if content.type == ContentType.TEXT
+        ]
+        return "\n".join([self.title, *blocks])
+
     def has_images(self, include_front_page_image: bool = False) -> bool:
         """Checks if the book has any images."""
         contains_images = True
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -5,8 +8,12 @@ class Image(BaseModel):
     """Represents an image resource within the book."""
 
     data: str = Field(
-        ..., description="The image source, typically a URL or base64 string."
+        default="",
+        description="The image content as a base64 string. Empty while a file-backed image is not loaded.",
     )
     caption: str = Field(
         default="", description="A caption or description for the image."
     )
+    path: Optional[Path] = Field(
+        default=None, description="File the image content is lazily loaded from."
+    )
@@ -21,3 +21,7 @@ class Evaluation(BaseModel):
     reasoning: Optional[str] = Field(
         None, description="The reasoning behind the evaluation label."
     )
+    compared: list[str] = Field(
+        default_factory=list,
+        description="Uids of the books compared, for pairwise evaluations.",
+    )
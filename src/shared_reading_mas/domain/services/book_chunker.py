@@ -0,0 +1,68 @@
+from typing import NamedTuple
+
+from shared_reading_mas.domain.book_aggregate.book import Book
+
+
+class BookChunk(NamedTuple):
+    start: int
+    """
+    Index of the first page of the chunk in the whole book.
+    """
+
+    book: Book
+    """
+    Book with the title and the pages of the chunk.
+    """
+
+    @property
+    def pages(self) -> range:
+        return range(self.start, self.start + len(self.book.pages))
+
+
+def chunk_book(book: Book, size: int, overlap: int = 0) -> list[BookChunk]:
+    """
+    Splits a book into windows of consecutive pages. Consecutive windows share
+    `overlap` pages, so every page but the first and last ones is seen with
+    some context around it.
+
+    Args:
+        book (Book): The book.
+        size (int): Number of pages per window.
+        overlap (int): Number of pages shared by consecutive windows.
+
+    Returns:
+        list[BookChunk]: The windows, in page order.
+    """
+    if size < 1 or not 0 <= overlap < size:
+        raise ValueError(f"Invalid window of {size} pages with an overlap of {overlap}")
+
+    chunks = []
+    start = 0
+    while True:
+        chunks.append(BookChunk(start, Book(title=book.title, pages=book.pages[start : start + size])))
+        if start + size >= len(book.pages):
+            return chunks
+
+        start += size - overlap
+
+
+def page_owners(chunks: list[BookChunk], num_pages: int) -> list[int]:
+    """
+    Chooses the chunk whose result is kept for each page of the book: the one
+    where the page is farthest from the window edges, so it had the most
+    context around it.
+
+    Args:
+        chunks (list[BookChunk]): The chunks of the book.
+        num_pages (int): Number of pages of the book.
+
+    Returns:
+        list[int]: The index of the chosen chunk for each page.
+    """
+    return [
+        max(
+            (i for i, chunk in enumerate(chunks) if page in chunk.pages),
+            key=lambda i: min(page - chunks[i].pages.start, chunks[i].pages.stop - 1 - page),
+        )
+        for page in range(num_pages)
+    ]
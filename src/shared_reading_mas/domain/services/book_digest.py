@@ -0,0 +1,33 @@
+import hashlib
+
+from shared_reading_mas.domain.book_aggregate.book import Book
+from shared_reading_mas.domain.services.image_store import get_image_store
+
+
+def content_digest(book: Book) -> str:
+    """
+    Computes the SHA-256 digest of the content of a book. Unlike the uid, it is
+    the same for two books with equal title, texts and images.
+
+    Args:
+        book (Book): The book.
+
+    Returns:
+        str: The hex digest of the book content.
+    """
+    store = get_image_store()
+    digest = hashlib.sha256()
+    digest.update(book.title.encode("utf-8"))
+
+    if book.front_page_image is not None:
+        digest.update(store.digest(book.front_page_image).encode("utf-8"))
+
+    for page in book.pages:
+        digest.update(b"\x00page")
+        for content in page.contents:
+            digest.update(b"\x00" + content.type.value.encode("utf-8"))
+            digest.update(b"\x00" + content.text.encode("utf-8"))
+        for image in page.images:
+            digest.update(b"\x00" + store.digest(image).encode("utf-8"))
+
+    return digest.hexdigest()
@@ -1,14 +1,15 @@
-import base64
+import re
 from pathlib import Path
 from typing import List, Union
 
-from lark import Lark, Transformer
+from lark import Transformer
 
 # Domain Imports
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.book_aggregate.content import Content, ContentType
 from shared_reading_mas.domain.book_aggregate.image import Image
 from shared_reading_mas.domain.book_aggregate.page import Page
+from shared_reading_mas.domain.services.parser_registry import get_parser
 
 
 class BookDomainTransformer(Transformer):
@@ -64,22 +65,25 @@ class BookDomainTransformer(Transformer):
         return Content(type=ContentType.TEXT, text=full_text)
 
     def image_entry(self, items) -> Image:
+        """
+        Creates a file-backed image. Its content is only read when a prompt or
+        renderer asks for it.
+        """
         raw = str(items[0]).strip()
         try:
             parts = raw.split("](")
             caption = parts[0].replace("![", "", 1).strip()
             url = parts[1].rstrip(")").strip()
 
-            print(f"Url: {url}, Caption: {caption}")
-
+            path = Path(url)
             if self.from_path and not url.startswith(("http://", "https://")):
-                url = (self.from_path / url).resolve()
+                path = self.from_path / url
 
-            print()
-            with open(url, "rb") as f:
-                data = base64.b64encode(f.read()).decode("utf-8")
+            path = path.resolve()
+            if not path.is_file():
+                raise FileNotFoundError(path)
 
-            return Image(data=data, caption=caption)
+            return Image(path=path, caption=caption)
         except Exception:
             return Image(data="", caption="Invalid Image Format")
 
@@ -123,6 +127,124 @@ class BookDomainTransformer(Transformer):
         return Book(title="Untitled", front_page_image=None, pages=items)
 
 
+class AmbiguousBookInput(Exception):
+    """
+    Raised by the BookLineScanner when the input needs the full grammar.
+    """
+
+
+class BookLineScanner:
+    """
+    Single-pass scanner for the book markdown format.
+
+    Mirrors the tokenization of BookParser._GRAMMAR (the same terminals, tried in
+    the same priority order) and builds the domain objects through the
+    BookDomainTransformer callbacks, so both paths produce identical books.
+    Headers that deviate from the plain `# title` / front image layout raise
+    AmbiguousBookInput so the caller can fall back to the Lark grammar.
+    """
+
+    _IMAGE_LINE = re.compile(r"!\[.*?\]\([^)]+\)")
+    _PARA_SEP = re.compile(r"\n{2,}")
+    _WS_INLINE = re.compile(r"[ \t]+")
+    _WS_AFTER_IMAGE = re.compile(r"(?:\n(?!\n))?[ \t]")
+    _HEADER_LAYOUT = re.compile(r"T?P?I?P?")
+
+    def __init__(self, transformer: BookDomainTransformer):
+        self._transformer = transformer
+
+    def scan(self, text: str) -> Book:
+        transformer = self._transformer
+        length = len(text)
+        pos = 0
+
+        # Header tokens: T (title), P (paragraph break) and I (front image)
+        header_layout = ""
+        header_items = []
+
+        pages = []
+        page_items = None
+        text_items = []
+
+        while pos < length:
+            char = text[pos]
+
+            if char == "\n":
+                match = self._PARA_SEP.match(text, pos)
+                if match:
+                    if page_items is None:
+                        header_layout += "P"
+                        header_items.append(transformer.PARA_SEP(None))
+                    else:
+                        text_items.append(transformer.PARA_SEP(None))
+                    pos = match.end()
+                else:
+                    pos += 1
+                continue
+
+            if text.startswith("---", pos):
+                if page_items is not None:
+                    self._close_text_block(page_items, text_items)
+                    pages.append(transformer.page_block(page_items))
+                page_items = []
+                pos += 3
+                continue
+
+            match = self._IMAGE_LINE.match(text, pos)
+            if match:
+                image = transformer.image_entry([match.group()])
+                if page_items is None:
+                    # Lark lexes the whitespace after an image with the page
+                    # terminals, as TEXT, which the header then rejects
+                    if self._WS_AFTER_IMAGE.match(text, match.end()):
+                        raise AmbiguousBookInput(f"Whitespace after the front image at {pos}")
+                    header_layout += "I"
+                    header_items.append(image)
+                else:
+                    self._close_text_block(page_items, text_items)
+                    page_items.append(image)
+                pos = match.end()
+                continue
+
+            end = text.find("\n", pos)
+            end = length if end == -1 else end
+
+            if page_items is not None:
+                text_items.append(transformer.TEXT(text[pos:end]))
+                pos = end
+                continue
+
+            # Inside the header, free text is only valid as the title
+            if char in " \t":
+                pos = self._WS_INLINE.match(text, pos).end()
+            elif char == "#" and not header_layout and end > pos + 1:
+                header_layout += "T"
+                header_items.append(transformer.title_line([text[pos + 1 : end]]))
+                pos = end
+            else:
+                raise AmbiguousBookInput(f"Unexpected header content at {pos}")
+
+        if page_items is None:
+            raise AmbiguousBookInput("The book has no pages")
+
+        if not self._HEADER_LAYOUT.fullmatch(header_layout):
+            raise AmbiguousBookInput(f"Unexpected header layout: {header_layout}")
+
+        self._close_text_block(page_items, text_items)
+        pages.append(transformer.page_block(page_items))
+
+        if header_items:
+            return transformer.start([transformer.header(header_items)] + pages)
+
+        return transformer.start(pages)
+
+    def _close_text_block(self, page_items: list, text_items: list):
+        """Moves the pending lines into the page as a single text block."""
+        if text_items:
+            page_items.append(self._transformer.text_block(list(text_items)))
+            text_items.clear()
+
+
 class BookParser:
     """
     Service Facade for parsing text into Book objects.
@@ -153,14 +275,29 @@ class BookParser:
         %ignore /\n/
     """
 
-    def __init__(self, from_path: Path | None = None):
-        self._lark = Lark(self._GRAMMAR, parser="lalr")
+    def __init__(self, from_path: Path | None = None, fast_path: bool = True):
+        """
+        Initializes the parser.
+
+        Args:
+            from_path (Path | None): Directory of the story, used to load `story.md`
+                and to resolve relative image paths.
+            fast_path (bool): Whether to try the single-pass BookLineScanner before
+                the Lark grammar.
+        """
         self._transformer = BookDomainTransformer()
         self._transformer.from_path = from_path
+        self._scanner = BookLineScanner(self._transformer) if fast_path else None
 
     def parse(self, text: str | None = None) -> Book:
         if not text and self._transformer.from_path:
             text = (self._transformer.from_path / "story.md").read_text(encoding="utf-8")
 
-        tree = self._lark.parse(text)
+        if self._scanner and text:
+            try:
+                return self._scanner.scan(text)
+            except AmbiguousBookInput:
+                pass
+
+        tree = get_parser(self._GRAMMAR, parser="lalr").parse(text)
         return self._transformer.transform(tree)
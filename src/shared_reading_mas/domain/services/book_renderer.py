@@ -1,18 +1,39 @@
-import base64
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import NamedTuple
 
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.book_aggregate.content import Content, ContentType
 from shared_reading_mas.domain.book_aggregate.image import Image
 from shared_reading_mas.domain.book_aggregate.page import Page
+from shared_reading_mas.domain.services.image_store import get_image_store
+
+
+class RenderCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
 
 
 class BookMarkdownRenderer:
     """
     Service responsible for converting Book domain objects into Markdown.
     Follows the Single Responsibility Principle.
+
+    Renders without a `to_path` are memoized process-wide, keyed by the book
+    uid, a fingerprint of its content and the render options. Mutating a book
+    changes its fingerprint, so stale renders are never returned.
     """
 
+    cache_max_size: int = 512
+
+    _cache: OrderedDict[tuple, str] = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_hits: int = 0
+    _cache_misses: int = 0
+
     def __init__(
         self,
         to_path: Path | None = None,
@@ -27,9 +48,82 @@ class BookMarkdownRenderer:
         self.include_num_pages = include_num_pages
         self.ignore_types = ignore_content_types or []
 
+    @classmethod
+    def cache_info(cls) -> RenderCacheInfo:
+        """Returns the hit and miss counters of the render cache."""
+        with cls._cache_lock:
+            return RenderCacheInfo(
+                cls._cache_hits, cls._cache_misses, len(cls._cache), cls.cache_max_size
+            )
+
+    @classmethod
+    def cache_clear(cls):
+        """Empties the render cache and resets its counters."""
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls._cache_hits = 0
+            cls._cache_misses = 0
+
     def render(self, book: Book) -> str:
         """Orchestrates the rendering of the entire book."""
 
+        # Renders that write files have side effects, so they are never cached
+        if self.to_path:
+            return self._render_book(book)
+
+        key = self._cache_key(book)
+
+        with self._cache_lock:
+            book_md = self._cache.get(key)
+            if book_md is not None:
+                self._cache.move_to_end(key)
+                BookMarkdownRenderer._cache_hits += 1
+                return book_md
+
+        book_md = self._render_book(book)
+
+        with self._cache_lock:
+            BookMarkdownRenderer._cache_misses += 1
+            self._cache[key] = book_md
+            if len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
+
+        return book_md
+
+    def _cache_key(self, book: Book) -> tuple:
+        """
+        Builds the cache key of a render. The fingerprint holds the book strings
+        themselves, whose hashes Python caches, so it is cheap to build and
+        never confuses two different books.
+        """
+        fingerprint = (
+            book.title,
+            self._image_fingerprint(book.front_page_image),
+            tuple(
+                (
+                    tuple((content.type, content.text) for content in page.contents),
+                    tuple(self._image_fingerprint(image) for image in page.images),
+                )
+                for page in book.pages
+            ),
+        )
+
+        return (
+            book.uid,
+            fingerprint,
+            self.include_images,
+            self.include_images_data,
+            self.include_num_pages,
+            tuple(self.ignore_types),
+        )
+
+    def _image_fingerprint(self, image: Image | None) -> tuple | None:
+        if image is None:
+            return None
+
+        return (image.caption, image.data, image.path)
+
+    def _render_book(self, book: Book) -> str:
         if self.include_num_pages:
             book_title = f"{book.title} (Total Pages: {len(book.pages)})"
         else:
@@ -96,12 +190,12 @@ class BookMarkdownRenderer:
             images_dir.mkdir(parents=True, exist_ok=True)
 
             image_path = self.to_path / "images" / f"{name}.png"
-            image_path.write_bytes(base64.b64decode(image.data))
+            image_path.write_bytes(get_image_store().load_bytes(image))
             return f"![{image.caption}]({Path('images') / f'{name}.png'})"
 
         if self.include_images_data:
             # Assumes data is base64
-            return f"![{image.caption}](data:image/png;base64,{image.data})"
+            return f"![{image.caption}](data:image/png;base64,{get_image_store().load_base64(image)})"
         else:
             # Fallback to a placeholder or filename if URL isn't available in data
             return f"Image Description: {image.caption}"
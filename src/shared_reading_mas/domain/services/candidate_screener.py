@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from typing import NamedTuple
+
+from shared_reading_mas.domain.book_aggregate.book import Book
+from shared_reading_mas.domain.book_aggregate.content import ContentType
+from shared_reading_mas.domain.preference_aggregate.preference import Preference
+from shared_reading_mas.domain.services.book_digest import content_digest
+
+
+class ScreeningResult(NamedTuple):
+    uid: str
+    reasons: list[str]
+    """
+    Why the candidate was discarded, empty if it passed.
+    """
+
+    @property
+    def passed(self) -> bool:
+        return not self.reasons
+
+
+class CandidateScreener:
+    """
+    Cheap checks that discard obviously broken personalizations before they are
+    judged: a page count different from the original book, pages left without
+    text, a length far from the original one, preferences never mentioned and
+    exact duplicates of an earlier candidate.
+    """
+
+    def __init__(
+        self,
+        min_length_ratio: float = 0.5,
+        max_length_ratio: float = 2.0,
+        min_keyword_coverage: float = 0.0,
+        check_pages: bool = True,
+    ):
+        """
+        Initializes the screener.
+
+        Args:
+            min_length_ratio (float): Minimum number of words of a candidate,
+                relative to the original book.
+            max_length_ratio (float): Maximum number of words of a candidate,
+                relative to the original book.
+            min_keyword_coverage (float): Minimum share of the preferences with a
+                keyword mentioned in the candidate.
+            check_pages (bool): Whether a candidate must keep the pages of the
+                original book.
+        """
+        self.min_length_ratio = min_length_ratio
+        self.max_length_ratio = max_length_ratio
+        self.min_keyword_coverage = min_keyword_coverage
+        self.check_pages = check_pages
+
+    def screen(
+        self,
+        original_book: Book,
+        candidates: list[Book],
+        preferences: list[Preference],
+        known: list[Book] | None = None,
+    ) -> list[ScreeningResult]:
+        """
+        Screens the candidates.
+
+        Args:
+            original_book (Book): The book the candidates personalize.
+            candidates (list[Book]): The candidates to screen.
+            preferences (list[Preference]): The preferences of the reader.
+            known (list[Book] | None): Candidates screened before, which the new
+                ones must not duplicate.
+
+        Returns:
+            list[ScreeningResult]: The result of each candidate, in order.
+        """
+        original_words = max(1, self._count_words(original_book))
+        digests = {content_digest(book): str(book.uid) for book in known or []}
+
+        results = []
+        for candidate in candidates:
+            reasons = []
+
+            if self.check_pages and len(candidate.pages) != len(original_book.pages):
+                reasons.append(
+                    f"has {len(candidate.pages)} pages instead of {len(original_book.pages)}"
+                )
+
+            # Pages with only images in the original book may stay without text
+            if any(
+                self._page_text(original).strip() and not self._page_text(page).strip()
+                for page, original in zip(candidate.pages, original_book.pages)
+            ):
+                reasons.append("has empty pages")
+
+            ratio = self._count_words(candidate) / original_words
+            if not self.min_length_ratio <= ratio <= self.max_length_ratio:
+                reasons.append(f"is {ratio:.2f} times as long as the original book")
+
+            coverage = self.keyword_coverage(candidate, preferences)
+            if coverage < self.min_keyword_coverage:
+                reasons.append(f"only mentions {coverage:.0%} of the preferences")
+
+            digest = content_digest(candidate)
+            if digest in digests:
+                reasons.append(f"duplicates {digests[digest]}")
+            else:
+                digests[digest] = str(candidate.uid)
+
+            results.append(ScreeningResult(str(candidate.uid), reasons))
+
+        return results
+
+    def keyword_coverage(self, book: Book, preferences: list[Preference]) -> float:
+        """
+        Gets the share of the preferences with a keyword mentioned in the book.
+        Keywords are the long words of each preference, matched by their first
+        letters so plurals and gender variants count.
+
+        Args:
+            book (Book): The book.
+            preferences (list[Preference]): The preferences of the reader.
+
+        Returns:
+            float: The coverage, 1 if there are no preferences.
+        """
+        stems = [
+            {word[:5] for word in self._words(preference.value) if len(word) >= 5}
+            for preference in preferences
+        ]
+        stems = [preference_stems for preference_stems in stems if preference_stems]
+        if not stems:
+            return 1.0
+
+        text = " ".join(self._page_text(page) for page in book.pages)
+        book_stems = {word[:5] for word in self._words(f"{book.title} {text}")}
+
+        return sum(bool(preference_stems & book_stems) for preference_stems in stems) / len(stems)
+
+    def _page_text(self, page) -> str:
+        return " ".join(
+            content.text for content in page.contents if content.type == ContentType.TEXT
+        )
+
+    def _count_words(self, book: Book) -> int:
+        return sum(len(self._words(self._page_text(page))) for page in book.pages)
+
+    def _words(self, text: str) -> list[str]:
+        # Accents are dropped, so "dragón" and "dragon" match
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(char for char in text if not unicodedata.combining(char))
+        return re.findall(r"[a-z]+", text)
@@ -1,6 +1,7 @@
-from lark import Lark, Transformer
+from lark import Transformer
 
 from shared_reading_mas.domain.evaluation_aggregate.evaluation import Evaluation
+from shared_reading_mas.domain.services.parser_registry import get_parser
 
 
 class EvaluationTransformer(Transformer):
@@ -59,7 +60,7 @@ class EvaluationParser:
     """
 
     def __init__(self):
-        self._lark = Lark(self._GRAMMAR, parser="earley")
+        self._lark = get_parser(self._GRAMMAR, parser="earley")
         self._transformer = EvaluationTransformer()
 
     def parse(self, text: str) -> Evaluation:
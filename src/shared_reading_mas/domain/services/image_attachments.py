@@ -0,0 +1,141 @@
+import base64
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from shared_reading_mas.domain.book_aggregate.image import Image
+from shared_reading_mas.domain.services.image_store import get_image_store
+
+DEFAULT_MAX_SIZE = 1024
+"""
+Default maximum width and height, in pixels, of the attached images.
+"""
+
+
+class ImageAttachments:
+    """
+    Builds the image parts of multimodal requests.
+
+    Images are downsized to a maximum resolution and encoded once per process:
+    the data URIs are memoized by the image digest and the maximum size, so
+    every agent attaching the same image reuses the same encoded string.
+    Images stored under `url_root` can be referenced by their URL under
+    `url_base` instead, for the providers that download images themselves.
+    """
+
+    cache_max_size: int = 256
+
+    _cache: OrderedDict[tuple, str] = OrderedDict()
+    _in_flight: dict[tuple, Future] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_size: int | None = DEFAULT_MAX_SIZE,
+        url_base: str | None = None,
+        url_root: Path | None = None,
+    ):
+        """
+        Initializes the attachments.
+
+        Args:
+            max_size (int | None): Maximum width and height of the images, or
+                None to attach them at their original resolution.
+            url_base (str | None): URL where the files under `url_root` are
+                served, or None to always attach the images inline.
+            url_root (Path | None): Directory served at `url_base`. Defaults to
+                the working directory.
+        """
+        self.max_size = max_size
+        self.url_base = url_base
+        self.url_root = url_root
+
+    @classmethod
+    def cache_clear(cls):
+        """Empties the cache of encoded images."""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def part(self, image: Image, allow_urls: bool = False) -> dict:
+        """
+        Builds the content part of an image.
+
+        Args:
+            image (Image): The image.
+            allow_urls (bool): Whether the provider accepts images by URL.
+
+        Returns:
+            dict: The "image_url" content part.
+        """
+        url = self._url(image) if allow_urls else None
+        return {"type": "image_url", "image_url": {"url": url or self._data_uri(image)}}
+
+    def _url(self, image: Image) -> str | None:
+        if self.url_base is None or image.path is None:
+            return None
+
+        try:
+            relative = image.path.resolve().relative_to((self.url_root or Path.cwd()).resolve())
+        except ValueError:
+            return None
+
+        return f"{self.url_base.rstrip('/')}/{relative.as_posix()}"
+
+    def _data_uri(self, image: Image) -> str:
+        key = (get_image_store().digest(image), self.max_size)
+
+        # The lock only guards the cache, images are encoded outside of it and
+        # concurrent requests for the same image wait for the first encoding
+        with self._cache_lock:
+            data_uri = self._cache.get(key)
+            if data_uri is not None:
+                self._cache.move_to_end(key)
+                return data_uri
+
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return future.result()
+
+        try:
+            data, mime_type = self._encode(get_image_store().load_bytes(image))
+            data_uri = f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"
+        except BaseException as e:
+            with self._cache_lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._cache_lock:
+            self._cache[key] = data_uri
+            if len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
+            del self._in_flight[key]
+
+        future.set_result(data_uri)
+        return data_uri
+
+    def _encode(self, data: bytes) -> tuple[bytes, str]:
+        try:
+            pil_image = PILImage.open(io.BytesIO(data))
+            image_format = pil_image.format or "PNG"
+        except Exception:
+            # Left as is, the provider reports what it cannot read
+            return data, "image/png"
+
+        if self.max_size and max(pil_image.size) > self.max_size:
+            pil_image.thumbnail((self.max_size, self.max_size))
+            buffer = io.BytesIO()
+            pil_image.save(buffer, format=image_format)
+            data = buffer.getvalue()
+
+        return data, PILImage.MIME.get(image_format, "image/png")
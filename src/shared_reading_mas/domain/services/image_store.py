@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import threading
+from pathlib import Path
+
+from shared_reading_mas.domain.book_aggregate.image import Image
+
+
+class ImageStore:
+    """
+    Per-process, content-addressed store for image files.
+
+    Files are read only when their bytes are first requested and are kept under
+    the SHA-256 of their content, so identical illustrations referenced from
+    several stories, or parsed again in later pipeline runs, are held in memory
+    once. The base64 form is derived from the bytes on demand and cached too.
+    Images with inline data are served from it.
+    """
+
+    def __init__(self):
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._bytes: dict[str, bytes] = {}
+        self._base64: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, image: Image) -> str:
+        """
+        Gets the SHA-256 digest of the content of an image, reading its file on
+        the first request.
+
+        Args:
+            image (Image): The image.
+
+        Returns:
+            str: The hex digest of the image content.
+        """
+        if image.data or image.path is None:
+            return hashlib.sha256(base64.b64decode(image.data)).hexdigest()
+
+        return self._file_digest(image.path)
+
+    def load_bytes(self, image: Image) -> bytes:
+        """
+        Gets the raw content of an image.
+
+        Args:
+            image (Image): The image.
+
+        Returns:
+            bytes: The content of the image.
+        """
+        if image.data or image.path is None:
+            return base64.b64decode(image.data)
+
+        return self._bytes[self._file_digest(image.path)]
+
+    def load_base64(self, image: Image) -> str:
+        """
+        Gets the base64 encoding of the content of an image.
+
+        Args:
+            image (Image): The image.
+
+        Returns:
+            str: The base64 encoded content of the image.
+        """
+        if image.data or image.path is None:
+            return image.data
+
+        digest = self._file_digest(image.path)
+
+        encoded = self._base64.get(digest)
+        if encoded is None:
+            encoded = base64.b64encode(self._bytes[digest]).decode("utf-8")
+            with self._lock:
+                self._base64[digest] = encoded
+
+        return encoded
+
+    def clear(self):
+        """
+        Drops every loaded image.
+        """
+        with self._lock:
+            self._digests.clear()
+            self._bytes.clear()
+            self._base64.clear()
+
+    def _file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        # A changed file gets a new key, so stale digests are never reused
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        digest = self._digests.get(key)
+        if digest is not None:
+            return digest
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            self._bytes.setdefault(digest, data)
+            self._digests[key] = digest
+
+        return digest
+
+
+_store = ImageStore()
+
+
+def get_image_store() -> ImageStore:
+    """
+    Returns the image store shared by the whole process.
+    """
+    return _store
@@ -0,0 +1,54 @@
+import threading
+
+from lark import Lark
+
+_parsers: dict[tuple[str, str], Lark] = {}
+_lock = threading.Lock()
+
+
+def get_parser(grammar: str, parser: str = "lalr", cache: bool | str = True) -> Lark:
+    """
+    Returns a compiled Lark parser for the given grammar, compiling it only once
+    per process.
+
+    Compiled parsers are shared between every facade that uses the same grammar.
+    A Lark instance keeps no state between calls to `parse`, so a shared parser
+    is safe to use from several threads or coroutines at once.
+
+    Args:
+        grammar (str): The Lark grammar to compile.
+        parser (str): The Lark parsing algorithm ("lalr" or "earley").
+        cache (bool | str): For LALR grammars, whether to persist the parse tables
+            on disk so later processes skip table generation. A string is used as
+            the cache file path. Ignored for other parsing algorithms, which Lark
+            cannot cache.
+
+    Returns:
+        Lark: The compiled parser.
+    """
+    key = (grammar, parser)
+
+    compiled = _parsers.get(key)
+    if compiled is not None:
+        return compiled
+
+    with _lock:
+        # Another thread may have compiled it while we were waiting
+        compiled = _parsers.get(key)
+        if compiled is None:
+            options = {"parser": parser}
+            if parser == "lalr" and cache:
+                options["cache"] = cache
+
+            compiled = Lark(grammar, **options)
+            _parsers[key] = compiled
+
+    return compiled
+
+
+def clear_parsers():
+    """
+    Drops every compiled parser held by the registry.
+    """
+    with _lock:
+        _parsers.clear()
@@ -1,8 +1,9 @@
 from pathlib import Path
 
-from lark import Lark, Transformer
+from lark import Transformer
 
 from shared_reading_mas.domain.preference_aggregate.preference import Preference
+from shared_reading_mas.domain.services.parser_registry import get_parser
 
 
 class PreferenceTransformer(Transformer):
@@ -52,7 +53,7 @@ class PreferenceParser:
     """
 
     def __init__(self, from_path: Path | None = None):
-        self._lark = Lark(self._GRAMMAR, parser="earley")
+        self._lark = get_parser(self._GRAMMAR, parser="earley")
         self._transformer = PreferenceTransformer()
         self.from_path = from_path
 
@@ -0,0 +1,142 @@
+import math
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+
+from shared_reading_mas.domain.book_aggregate.book import Book
+from shared_reading_mas.domain.services.text_similarity import (
+    near_duplicate_groups,
+    similarity_matrix,
+)
+
+
+class CandidateQuestion(NamedTuple):
+    type: str
+    """
+    Type of the question, the title of the questions book it comes from.
+    """
+
+    text: str
+
+
+class QuestionPreselector:
+    """
+    Local pre-aggregation of the questions of every questioner. Near-identical
+    questions of the same page are merged, and each page keeps a few
+    candidates, favouring the types furthest from their quota of the pages.
+    """
+
+    def __init__(
+        self,
+        max_candidates: int = 2,
+        quotas: dict[str, float] | None = None,
+        threshold: float = 0.8,
+        method: str = "tfidf",
+    ):
+        """
+        Initializes the preselector.
+
+        Args:
+            max_candidates (int): Maximum number of candidates kept per page.
+            quotas (dict[str, float] | None): Maximum share of the candidates of
+                each question type. Types without a quota are not limited, and a
+                quota of 0 excludes the type. If None, every type gets an equal
+                share.
+            threshold (float): Minimum similarity of two near-identical questions.
+            method (str): Similarity method, see `similarity_matrix`.
+        """
+        self.max_candidates = max_candidates
+        self.quotas = quotas
+        self.threshold = threshold
+        self.method = method
+
+    def candidates(self, questions_books: list[Book], num_pages: int) -> list[list[CandidateQuestion]]:
+        """
+        Gets the candidate questions of every page.
+
+        Quotas are soft: a type over its quota is only kept when the page has
+        no other candidates left. Types with a quota of 0 are never kept.
+
+        Args:
+            questions_books (list[Book]): The questions of each questioner, one
+                per page, with the question type as the title.
+            num_pages (int): Number of pages of the book.
+
+        Returns:
+            list[list[CandidateQuestion]]: The candidates of each page, the
+                preferred one first.
+        """
+        # Sorted, so the result does not depend on the order of the questioners
+        books = sorted(questions_books, key=lambda book: book.title)
+        types = [book.title for book in books]
+        limits = {
+            question_type: self._limit(question_type, len(types), num_pages) for question_type in types
+        }
+
+        # Excluded before the similarity pass, so they never hide a near-duplicate
+        books = [book for book in books if limits[book.title] > 0]
+
+        pages, questions = [], []
+        for page in range(num_pages):
+            for book in books:
+                if page < len(book.pages) and book.pages[page].contents:
+                    text = book.pages[page].contents[0].text.strip()
+                    if text:
+                        pages.append(page)
+                        questions.append(CandidateQuestion(book.title, text))
+
+        # A single similarity pass over the whole book, masked to same-page pairs
+        per_page = [[] for _ in range(num_pages)]
+        if questions:
+            similarities = similarity_matrix([q.text for q in questions], self.method, shingle_size=1)
+            page_ids = np.array(pages)
+            similarities = np.where(page_ids[:, None] == page_ids[None, :], similarities, 0)
+
+            for group in near_duplicate_groups(similarities, self.threshold):
+                per_page[pages[group[0]]].append(questions[group[0]])
+
+        counts = Counter()
+
+        candidates = []
+        for page_questions in per_page:
+            ranked = sorted(
+                page_questions,
+                key=lambda q: (
+                    counts[q.type] >= limits[q.type],
+                    counts[q.type] / limits[q.type],
+                    types.index(q.type),
+                ),
+            )[: self.max_candidates]
+
+            counts.update(q.type for q in ranked)
+            candidates.append(ranked)
+
+        return candidates
+
+    def select(self, questions_books: list[Book], num_pages: int) -> list[CandidateQuestion | None]:
+        """
+        Selects the question of every page without a language model: the
+        preferred candidate of the page, with a single candidate per page for
+        the quotas.
+
+        Args:
+            questions_books (list[Book]): The questions of each questioner.
+            num_pages (int): Number of pages of the book.
+
+        Returns:
+            list[CandidateQuestion | None]: The question of each page, or None if
+                the page has no questions.
+        """
+        preselector = QuestionPreselector(1, self.quotas, self.threshold, self.method)
+        return [
+            page_candidates[0] if page_candidates else None
+            for page_candidates in preselector.candidates(questions_books, num_pages)
+        ]
+
+    def _limit(self, question_type: str, num_types: int, num_pages: int) -> float:
+        share = 1 / num_types if self.quotas is None else self.quotas.get(question_type, 1.0)
+        if share <= 0:
+            return 0
+
+        return max(1, math.ceil(share * num_pages * self.max_candidates))
@@ -0,0 +1,278 @@
+import itertools
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import numpy as np
+
+from shared_reading_mas.domain.services.tournament import PairResult
+
+
+class RankedCandidate(NamedTuple):
+    uid: str
+    score: float
+    confidence: float
+
+
+def ranking_aggregator_factory(aggregator: str, **kwargs) -> "RankingAggregator":
+    """
+    Builds a ranking aggregator by name.
+
+    Args:
+        aggregator (str): "win_count", "bradley_terry", "elo" or "copeland".
+        **kwargs: Arguments of the aggregator.
+
+    Returns:
+        RankingAggregator: The aggregator.
+    """
+    match aggregator:
+        case "win_count":
+            return WinCountAggregator(**kwargs)
+        case "bradley_terry":
+            return BradleyTerryAggregator(**kwargs)
+        case "elo":
+            return EloAggregator(**kwargs)
+        case "copeland":
+            return CopelandAggregator(**kwargs)
+        case _:
+            raise ValueError(f"Unknown ranking aggregator: {aggregator}")
+
+
+def bradley_terry_strengths(wins: np.ndarray, prior: float = 0.5, iterations: int = 100) -> np.ndarray:
+    """
+    Fits Bradley-Terry strengths with minorization-maximization. A prior of
+    virtual wins between every pair keeps undefeated candidates finite.
+
+    Args:
+        wins (np.ndarray): Wins of each candidate over each other one, with shape
+            (samples, candidates, candidates).
+        prior (float): Virtual wins of every candidate over every other one.
+        iterations (int): Number of minorization-maximization iterations.
+
+    Returns:
+        np.ndarray: The strengths, with shape (samples, candidates) and a
+            geometric mean of one. The strengths stay finite, even for
+            candidates without games.
+    """
+    num_candidates = wins.shape[-1]
+    wins = wins + prior * (1 - np.eye(num_candidates))
+
+    games = wins + wins.transpose(0, 2, 1)
+    total_wins = wins.sum(axis=2)
+    strengths = np.ones(total_wins.shape)
+    if num_candidates == 0:
+        return strengths
+
+    for _ in range(iterations):
+        pair_strengths = strengths[:, :, None] + strengths[:, None, :]
+        denominators = (games / pair_strengths).sum(axis=2)
+
+        # Without a prior, strengths of candidates without wins or losses tend
+        # to zero or infinity, so they are bounded to keep their logs finite
+        strengths = np.divide(total_wins, denominators, out=strengths, where=denominators > 0)
+        strengths = np.clip(strengths, 1e-10, 1e10)
+        strengths /= np.exp(np.log(strengths).mean(axis=1, keepdims=True))
+
+    return strengths
+
+
+class RankingAggregator(ABC):
+    """
+    Ranks candidates from the results of pairwise comparisons.
+
+    Besides its score, every candidate gets a confidence: the probability that
+    it ranks first once every pair of candidates has been compared. Pairs not
+    compared yet are simulated from a Bradley-Terry fit of the judged ones, and
+    the confidence is the share of simulations the candidate wins. Aggregators
+    score all simulations at once, as arrays of winner and loser indices.
+    """
+
+    def __init__(self, num_samples: int = 200, seed: int = 0):
+        """
+        Initializes the aggregator.
+
+        Args:
+            num_samples (int): Number of simulations used for the confidence.
+            seed (int): Seed of the simulations.
+        """
+        self.num_samples = num_samples
+        self.seed = seed
+
+    def rank(self, candidates: list[str], results: list[PairResult]) -> list[RankedCandidate]:
+        """
+        Ranks the candidates from the best to the worst.
+
+        Ties are broken by the order of the first win of each candidate in the
+        results, as the most common winner of the comparisons, and then by the
+        order of the candidates.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The judged comparisons.
+
+        Returns:
+            list[RankedCandidate]: The candidates with their score and confidence.
+        """
+        if not candidates:
+            return []
+
+        winners, losers = self._encode(candidates, results)
+        scores = self._batch_scores(winners[None], losers[None], len(candidates))[0]
+        confidence = self._confidence(candidates, results, winners, losers)
+
+        first_wins = np.full(len(candidates), len(winners))
+        np.minimum.at(first_wins, winners, np.arange(len(winners)))
+
+        order = sorted(range(len(candidates)), key=lambda i: (-scores[i], first_wins[i], i))
+        return [RankedCandidate(candidates[i], float(scores[i]), float(confidence[i])) for i in order]
+
+    @abstractmethod
+    def _batch_scores(self, winners: np.ndarray, losers: np.ndarray, num_candidates: int) -> np.ndarray:
+        """
+        Scores the candidates for a batch of comparison samples.
+
+        Args:
+            winners (np.ndarray): Winner indices, with shape (samples, comparisons).
+            losers (np.ndarray): Loser indices, with shape (samples, comparisons).
+            num_candidates (int): The number of candidates.
+
+        Returns:
+            np.ndarray: The scores, with shape (samples, candidates).
+        """
+        ...
+
+    def _encode(self, candidates: list[str], results: list[PairResult]) -> tuple[np.ndarray, np.ndarray]:
+        index = {uid: i for i, uid in enumerate(candidates)}
+        decided = [
+            (index[winner], index[second if winner == first else first])
+            for first, second, winner in results
+            if winner in (first, second) and first in index and second in index
+        ]
+
+        pairs = np.array(decided, dtype=int).reshape(-1, 2)
+        return pairs[:, 0], pairs[:, 1]
+
+    def _confidence(
+        self,
+        candidates: list[str],
+        results: list[PairResult],
+        winners: np.ndarray,
+        losers: np.ndarray,
+    ) -> np.ndarray:
+        num_candidates = len(candidates)
+        index = {uid: i for i, uid in enumerate(candidates)}
+
+        # Pairs judged without a verdict still count as compared
+        compared = {frozenset((first, second)) for first, second, _ in results}
+        unplayed = np.array(
+            [
+                (index[first], index[second])
+                for first, second in itertools.combinations(candidates, 2)
+                if frozenset((first, second)) not in compared
+            ],
+            dtype=int,
+        ).reshape(-1, 2)
+
+        rng = np.random.default_rng(self.seed)
+        samples = (self.num_samples, len(unplayed))
+
+        wins = self._win_matrix(winners[None], losers[None], num_candidates)
+        strengths = bradley_terry_strengths(wins)[0]
+        first, second = unplayed[:, 0], unplayed[:, 1]
+        first_wins = rng.random(samples) < strengths[first] / (strengths[first] + strengths[second])
+
+        simulated_winners = np.where(first_wins, first, second)
+        simulated_losers = np.where(first_wins, second, first)
+
+        scores = self._batch_scores(
+            np.concatenate([np.broadcast_to(winners, (self.num_samples, len(winners))), simulated_winners], axis=1),
+            np.concatenate([np.broadcast_to(losers, (self.num_samples, len(losers))), simulated_losers], axis=1),
+            num_candidates,
+        )
+
+        # Ties at the top are broken at random
+        jitter = rng.random(scores.shape) * 1e-9
+        best = np.argmax(scores + jitter, axis=1)
+
+        return np.bincount(best, minlength=num_candidates) / self.num_samples
+
+    def _win_matrix(self, winners: np.ndarray, losers: np.ndarray, num_candidates: int) -> np.ndarray:
+        """Counts, for every sample, the wins of each candidate over each other one."""
+        num_samples = winners.shape[0]
+        wins = np.zeros((num_samples, num_candidates, num_candidates))
+        rows = np.broadcast_to(np.arange(num_samples)[:, None], winners.shape)
+        np.add.at(wins, (rows, winners, losers), 1)
+        return wins
+
+
+class WinCountAggregator(RankingAggregator):
+    """
+    Scores each candidate by its number of wins.
+    """
+
+    def _batch_scores(self, winners, losers, num_candidates):
+        return self._win_matrix(winners, losers, num_candidates).sum(axis=2)
+
+
+class CopelandAggregator(RankingAggregator):
+    """
+    Scores each candidate by its head-to-head majorities won minus the ones lost.
+    """
+
+    def _batch_scores(self, winners, losers, num_candidates):
+        wins = self._win_matrix(winners, losers, num_candidates)
+        return np.sign(wins - wins.transpose(0, 2, 1)).sum(axis=2)
+
+
+class BradleyTerryAggregator(RankingAggregator):
+    """
+    Scores each candidate by its log strength in a Bradley-Terry model.
+    """
+
+    def __init__(self, prior: float = 0.5, iterations: int = 100, **kwargs):
+        """
+        Initializes the aggregator.
+
+        Args:
+            prior (float): Virtual wins of every candidate over every other one.
+            iterations (int): Number of minorization-maximization iterations.
+            **kwargs: Arguments of `RankingAggregator`.
+        """
+        super().__init__(**kwargs)
+        self.prior = prior
+        self.iterations = iterations
+
+    def _batch_scores(self, winners, losers, num_candidates):
+        wins = self._win_matrix(winners, losers, num_candidates)
+        return np.log(bradley_terry_strengths(wins, self.prior, self.iterations))
+
+
+class EloAggregator(RankingAggregator):
+    """
+    Scores each candidate by its Elo rating after playing the comparisons in order.
+    """
+
+    def __init__(self, k: float = 32, initial_rating: float = 1000, **kwargs):
+        """
+        Initializes the aggregator.
+
+        Args:
+            k (float): Maximum rating change of a comparison.
+            initial_rating (float): Rating of every candidate before any comparison.
+            **kwargs: Arguments of `RankingAggregator`.
+        """
+        super().__init__(**kwargs)
+        self.k = k
+        self.initial_rating = initial_rating
+
+    def _batch_scores(self, winners, losers, num_candidates):
+        num_samples = winners.shape[0]
+        ratings = np.full((num_samples, num_candidates), float(self.initial_rating))
+        rows = np.arange(num_samples)
+
+        for t in range(winners.shape[1]):
+            winner, loser = winners[:, t], losers[:, t]
+            expected = 1 / (1 + 10 ** ((ratings[rows, loser] - ratings[rows, winner]) / 400))
+            ratings[rows, winner] += self.k * (1 - expected)
+            ratings[rows, loser] -= self.k * (1 - expected)
+
+        return ratings
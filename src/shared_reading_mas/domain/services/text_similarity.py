@@ -0,0 +1,157 @@
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+MINHASH_PRIME = (1 << 32) - 5
+"""
+Modulus of the MinHash permutations, the largest prime below 2^32, so the
+products of the hashes and the coefficients fit in 64 bits.
+"""
+
+
+def shingles(text: str, size: int = 3) -> list[str]:
+    """
+    Splits a text into overlapping word shingles.
+
+    Args:
+        text (str): The text.
+        size (int): Number of words per shingle.
+
+    Returns:
+        list[str]: The shingles, or the whole text if it has fewer words.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    words = re.findall(r"\w+", "".join(char for char in text if not unicodedata.combining(char)))
+
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+
+    return [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+
+
+def tfidf_similarity(texts: list[str], shingle_size: int = 3) -> np.ndarray:
+    """
+    Computes the cosine similarity between the TF-IDF vectors of the shingles of
+    every pair of texts, in a single matrix product.
+
+    Args:
+        texts (list[str]): The texts.
+        shingle_size (int): Number of words per shingle.
+
+    Returns:
+        np.ndarray: The similarities, with shape (texts, texts).
+    """
+    documents = [shingles(text, shingle_size) for text in texts]
+    vocabulary = {shingle: i for i, shingle in enumerate(sorted({s for doc in documents for s in doc}))}
+
+    counts = np.zeros((len(texts), max(1, len(vocabulary))))
+    for row, document in enumerate(documents):
+        np.add.at(counts[row], [vocabulary[shingle] for shingle in document], 1)
+
+    # Smoothed inverse document frequency, as shingles shared by every text
+    # still tell near-duplicates apart from loosely related texts
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+
+    vectors = counts * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    return vectors @ vectors.T
+
+
+def minhash_similarity(
+    texts: list[str], shingle_size: int = 3, num_permutations: int = 128, seed: int = 0
+) -> np.ndarray:
+    """
+    Estimates the Jaccard similarity between the shingle sets of every pair of
+    texts with MinHash signatures, all computed at once.
+
+    Args:
+        texts (list[str]): The texts.
+        shingle_size (int): Number of words per shingle.
+        num_permutations (int): Number of hash permutations of the signatures.
+        seed (int): Seed of the permutations.
+
+    Returns:
+        np.ndarray: The estimated similarities, with shape (texts, texts). Texts
+            without shingles have a similarity of 0, as with TF-IDF.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MINHASH_PRIME, num_permutations, dtype=np.uint64)
+    b = rng.integers(0, MINHASH_PRIME, num_permutations, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_permutations), np.iinfo(np.uint64).max, dtype=np.uint64)
+    empty = np.zeros(len(texts), dtype=bool)
+    for row, text in enumerate(texts):
+        # Stable across processes, unlike the built-in hash
+        hashes = np.array(
+            sorted({zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text, shingle_size)}),
+            dtype=np.uint64,
+        )
+        if len(hashes):
+            # Below 2^32 once reduced, so a * h + b < 2^64 does not wrap around
+            permuted = ((hashes[:, None] % MINHASH_PRIME) * a + b) % MINHASH_PRIME
+            signatures[row] = permuted.min(axis=0)
+        else:
+            empty[row] = True
+
+    similarities = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    similarities[empty, :] = 0
+    similarities[:, empty] = 0
+    return similarities
+
+
+def similarity_matrix(texts: list[str], method: str = "tfidf", **kwargs) -> np.ndarray:
+    """
+    Computes the pairwise similarity of the texts.
+
+    Args:
+        texts (list[str]): The texts.
+        method (str): "tfidf" for the cosine of TF-IDF vectors, or "minhash" for
+            the estimated Jaccard similarity.
+        **kwargs: Arguments of the method.
+
+    Returns:
+        np.ndarray: The similarities, with shape (texts, texts).
+    """
+    match method:
+        case "tfidf":
+            return tfidf_similarity(texts, **kwargs)
+        case "minhash":
+            return minhash_similarity(texts, **kwargs)
+        case _:
+            raise ValueError(f"Unknown similarity method: {method}")
+
+
+def near_duplicate_groups(similarities: np.ndarray, threshold: float) -> list[list[int]]:
+    """
+    Groups the items linked by a similarity of at least the threshold, directly
+    or through other items.
+
+    Args:
+        similarities (np.ndarray): The pairwise similarities.
+        threshold (float): Minimum similarity of two near-duplicates.
+
+    Returns:
+        list[list[int]]: The groups of item indices, ordered by their first item.
+    """
+    parents = list(range(len(similarities)))
+
+    def find(item: int) -> int:
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    for first, second in zip(*np.nonzero(np.triu(similarities >= threshold, k=1))):
+        roots = sorted((find(int(first)), find(int(second))))
+        parents[roots[1]] = roots[0]
+
+    groups = {}
+    for item in range(len(similarities)):
+        groups.setdefault(find(item), []).append(item)
+
+    return list(groups.values())
@@ -0,0 +1,411 @@
+import itertools
+import math
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+
+PairResult = tuple[str, str, str]
+"""
+A judged pair: the uids of the two compared books and the uid of the winner,
+or an empty string if the judge gave no verdict.
+"""
+
+
+def sample_pairs(
+    num_items: int, num_pairs: int, balanced: bool = False, rng: random.Random | None = None
+) -> list[tuple[int, int]]:
+    """
+    Samples distinct ordered pairs of different items, without replacement.
+
+    Pairs are drawn straight from the index space of the n * (n - 1) ordered
+    pairs, so no draw is ever rejected. A balanced sample instead builds every
+    pair around the item with the fewest comparisons so far, so all items
+    appear in a similar number of pairs.
+
+    Args:
+        num_items (int): The number of items.
+        num_pairs (int): The number of pairs to sample.
+        balanced (bool): Whether to balance the appearances of the items.
+        rng (random.Random | None): Source of randomness. Defaults to the
+            `random` module.
+
+    Returns:
+        list[tuple[int, int]]: The sampled pairs of item indices.
+    """
+    rng = rng or random
+    total = num_items * (num_items - 1)
+
+    if not 0 <= num_pairs <= total:
+        raise ValueError(f"Cannot sample {num_pairs} distinct pairs out of {total}")
+
+    if not balanced:
+        pairs = []
+        for index in rng.sample(range(total), num_pairs):
+            first, second = divmod(index, num_items - 1)
+            # Skip the diagonal of the pair matrix
+            pairs.append((first, second + (second >= first)))
+        return pairs
+
+    appearances = [0] * num_items
+    used = set()
+    pairs = []
+
+    while len(pairs) < num_pairs:
+        # Items with the fewest appearances first, ties in random order
+        order = sorted(range(num_items), key=lambda item: (appearances[item], rng.random()))
+
+        pair = next(
+            pair
+            for first in order
+            for second in order
+            if second != first
+            for pair in rng.sample([(first, second), (second, first)], 2)
+            if pair not in used
+        )
+        used.add(pair)
+        pairs.append(pair)
+        appearances[pair[0]] += 1
+        appearances[pair[1]] += 1
+
+    return pairs
+
+
+def round_scheduler_factory(mode: str, **kwargs) -> "RoundScheduler":
+    """
+    Builds the scheduler of a round-based evaluation mode.
+
+    Args:
+        mode (str): "adaptive", "swiss", "single_elimination" or "double_elimination".
+        **kwargs: Arguments of the scheduler.
+
+    Returns:
+        RoundScheduler: The scheduler.
+    """
+    match mode:
+        case "adaptive":
+            return AdaptiveScheduler(**kwargs)
+        case "swiss":
+            return SwissScheduler(**kwargs)
+        case "single_elimination":
+            return EliminationScheduler(lives=1, **kwargs)
+        case "double_elimination":
+            return EliminationScheduler(lives=2, **kwargs)
+        case _:
+            raise ValueError(f"Unknown round scheduler: {mode}")
+
+
+class RoundScheduler(ABC):
+    """
+    Schedules pairwise comparisons in rounds, instead of all up front.
+
+    Schedulers are stateless: every round is derived from the comparisons
+    judged so far, so a resumed run schedules the same round again.
+    """
+
+    def get_round_size(self, num_candidates: int) -> int:
+        """
+        Gets the maximum number of comparisons of a round.
+
+        Args:
+            num_candidates (int): The number of candidates.
+
+        Returns:
+            int: The maximum number of comparisons per round.
+        """
+        return max(1, num_candidates // 2)
+
+    def total_comparisons(self, num_candidates: int) -> int:
+        """
+        Gets the number of comparisons of an exhaustive round robin.
+
+        Args:
+            num_candidates (int): The number of candidates.
+
+        Returns:
+            int: The number of unordered pairs of candidates.
+        """
+        return num_candidates * (num_candidates - 1) // 2
+
+    def champion(self, candidates: list[str], results: list[PairResult]) -> str | None:
+        """
+        Gets the winner set by the format of the tournament, if any.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The comparisons judged so far.
+
+        Returns:
+            str | None: The winner, or None to leave it to the ranking of the results.
+        """
+        return None
+
+    @abstractmethod
+    def is_decided(self, candidates: list[str], results: list[PairResult]) -> bool:
+        """
+        Checks whether the tournament is over.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The comparisons judged so far.
+
+        Returns:
+            bool: True if no more comparisons are needed.
+        """
+        ...
+
+    @abstractmethod
+    def next_round(self, candidates: list[str], results: list[PairResult]) -> list[tuple[str, str]]:
+        """
+        Schedules the next round of comparisons.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The comparisons judged so far.
+
+        Returns:
+            list[tuple[str, str]]: The pairs to compare, empty once the tournament is over.
+        """
+        ...
+
+    def _wins(self, results: list[PairResult]) -> Counter:
+        return Counter(winner for _, _, winner in results if winner)
+
+
+class AdaptiveScheduler(RoundScheduler):
+    """
+    Schedules the comparisons of a round robin, stopping as soon as the winner
+    is decided.
+
+    Candidates are ranked by their number of wins. After every round the
+    scheduler checks whether any other candidate could still reach the wins of
+    the leader with the comparisons left; once none can, the winner is decided
+    and no more comparisons are scheduled. Each round only holds comparisons
+    involving a candidate that can still win, and no candidate is judged twice
+    in the same round.
+    """
+
+    def __init__(self, round_size: int | None = None):
+        """
+        Initializes the scheduler.
+
+        Args:
+            round_size (int | None): Maximum number of comparisons per round.
+                Defaults to half the number of candidates.
+        """
+        self.round_size = round_size
+
+    def get_round_size(self, num_candidates: int) -> int:
+        return self.round_size or super().get_round_size(num_candidates)
+
+    def is_decided(self, candidates: list[str], results: list[PairResult]) -> bool:
+        """
+        Checks whether the leader can no longer be caught.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The comparisons judged so far.
+
+        Returns:
+            bool: True if no further comparison can change the winner.
+        """
+        unplayed = self._unplayed(candidates, results)
+        if not unplayed:
+            return True
+
+        wins = self._wins(results)
+        leader = max(candidates, key=lambda uid: wins[uid])
+        remaining = self._remaining(unplayed)
+
+        if all(
+            wins[uid] + remaining[uid] < wins[leader]
+            for uid in candidates
+            if uid != leader
+        ):
+            return True
+
+        # Ties at the top that no comparison left can break
+        return not self._useful(candidates, results, unplayed)
+
+    def next_round(self, candidates: list[str], results: list[PairResult]) -> list[tuple[str, str]]:
+        """
+        Schedules the next round of comparisons.
+
+        Args:
+            candidates (list[str]): The uids of the candidates.
+            results (list[PairResult]): The comparisons judged so far.
+
+        Returns:
+            list[tuple[str, str]]: The pairs to compare, empty if the winner is decided.
+        """
+        if self.is_decided(candidates, results):
+            return []
+
+        useful = self._useful(candidates, results, self._unplayed(candidates, results))
+
+        round_size = self.get_round_size(len(candidates))
+        scheduled, busy = [], set()
+
+        for first, second in useful:
+            if len(scheduled) == round_size:
+                break
+
+            if first in busy or second in busy:
+                continue
+
+            scheduled.append((first, second))
+            busy.update((first, second))
+
+        return scheduled
+
+    def _useful(
+        self, candidates: list[str], results: list[PairResult], unplayed: list[tuple[str, str]]
+    ) -> list[tuple[str, str]]:
+        wins = self._wins(results)
+        remaining = self._remaining(unplayed)
+        leader_wins = max(wins[uid] for uid in candidates)
+
+        # Candidates that could still reach the leader
+        contenders = {
+            uid for uid in candidates if wins[uid] + remaining[uid] >= leader_wins
+        }
+
+        # Comparisons between two contenders settle the most, then the ones
+        # involving the strongest candidates
+        return sorted(
+            (pair for pair in unplayed if contenders & set(pair)),
+            key=lambda pair: (
+                -len(contenders & set(pair)),
+                -(wins[pair[0]] + wins[pair[1]]),
+            ),
+        )
+
+    def _unplayed(self, candidates: list[str], results: list[PairResult]) -> list[tuple[str, str]]:
+        played = {frozenset((first, second)) for first, second, _ in results}
+        return [
+            pair
+            for pair in itertools.combinations(candidates, 2)
+            if frozenset(pair) not in played
+        ]
+
+    def _remaining(self, unplayed: list[tuple[str, str]]) -> Counter:
+        return Counter(uid for pair in unplayed for uid in pair)
+
+
+class SwissScheduler(RoundScheduler):
+    """
+    Schedules a Swiss-system tournament.
+
+    Every round pairs the candidates with the closest number of wins, avoiding
+    rematches when possible, so the strongest candidates meet each other after
+    a logarithmic number of rounds. With an odd number of candidates, the last
+    one ranked sits the round out.
+    """
+
+    def __init__(self, num_rounds: int | None = None):
+        """
+        Initializes the scheduler.
+
+        Args:
+            num_rounds (int | None): Number of rounds. Defaults to the base 2
+                logarithm of the number of candidates, rounded up.
+        """
+        self.num_rounds = num_rounds
+
+    def get_num_rounds(self, num_candidates: int) -> int:
+        """
+        Gets the number of rounds of the tournament.
+
+        Args:
+            num_candidates (int): The number of candidates.
+
+        Returns:
+            int: The number of rounds.
+        """
+        return self.num_rounds or max(1, math.ceil(math.log2(max(num_candidates, 2))))
+
+    def is_decided(self, candidates: list[str], results: list[PairResult]) -> bool:
+        if len(candidates) < 2:
+            return True
+
+        # Every round compares the same number of pairs
+        rounds_played = len(results) // self.get_round_size(len(candidates))
+        return rounds_played >= self.get_num_rounds(len(candidates))
+
+    def next_round(self, candidates: list[str], results: list[PairResult]) -> list[tuple[str, str]]:
+        if self.is_decided(candidates, results):
+            return []
+
+        wins = self._wins(results)
+        played = Counter(frozenset((first, second)) for first, second, _ in results)
+
+        # Stable sort, so equal records keep the order of the candidates
+        standings = sorted(candidates, key=lambda uid: -wins[uid])
+        round_size = self.get_round_size(len(candidates))
+
+        scheduled = []
+        while standings and len(scheduled) < round_size:
+            first = standings.pop(0)
+
+            # The closest opponent they have met the fewest times
+            second = min(standings, key=lambda uid: played[frozenset((first, uid))])
+            standings.remove(second)
+            scheduled.append((first, second))
+
+        return scheduled
+
+
+class EliminationScheduler(RoundScheduler):
+    """
+    Schedules a single or double elimination bracket.
+
+    A candidate is eliminated after losing `lives` comparisons. Every round
+    pairs the remaining candidates with the same number of losses in the order
+    of the candidates, and the ones left over from the brackets face each
+    other, which also plays the final. A comparison without a verdict counts
+    as a loss for the second book, so every comparison eliminates a life and
+    the tournament takes at most `lives` times the number of candidates.
+    """
+
+    def __init__(self, lives: int = 1):
+        """
+        Initializes the scheduler.
+
+        Args:
+            lives (int): Number of losses that eliminate a candidate.
+        """
+        self.lives = lives
+
+    def champion(self, candidates: list[str], results: list[PairResult]) -> str | None:
+        alive = self._alive(candidates, results)
+        return alive[0] if len(alive) == 1 else None
+
+    def is_decided(self, candidates: list[str], results: list[PairResult]) -> bool:
+        return len(self._alive(candidates, results)) < 2
+
+    def next_round(self, candidates: list[str], results: list[PairResult]) -> list[tuple[str, str]]:
+        if self.is_decided(candidates, results):
+            return []
+
+        losses = self._losses(results)
+        alive = self._alive(candidates, results)
+
+        scheduled, left_over = [], []
+        for lives_lost in range(self.lives):
+            bracket = [uid for uid in alive if losses[uid] == lives_lost]
+            scheduled.extend(zip(bracket[0::2], bracket[1::2]))
+
+            if len(bracket) % 2:
+                left_over.append(bracket[-1])
+
+        # The best two of the left over candidates face each other, the rest get a bye
+        if len(left_over) >= 2:
+            scheduled.append((left_over[0], left_over[1]))
+
+        return scheduled
+
+    def _losses(self, results: list[PairResult]) -> Counter:
+        return Counter(first if winner == second else second for first, second, winner in results)
+
+    def _alive(self, candidates: list[str], results: list[PairResult]) -> list[str]:
+        losses = self._losses(results)
+        return [uid for uid in candidates if losses[uid] < self.lives]
@@ -6,3 +6,6 @@ class PermissionException(Exception):
 
 class OrganizationException(Exception):
     ...
+
+class CacheException(Exception):
+    ...
@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class JudgmentStore:
+    """
+    Persistent store of pair critic judgments backed by a SQLite file.
+
+    Each judgment is keyed by the content digest of the original book, the
+    content digests of the two candidates in the order they were shown and the
+    judge model. The verdict is positional: "A" for the first candidate, "B"
+    for the second one, or an empty string if the judge gave none.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Initializes the store, creating the database file if needed.
+
+        Args:
+            path (str | Path): The SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS judgments ("
+                "original_digest TEXT NOT NULL, first_digest TEXT NOT NULL, "
+                "second_digest TEXT NOT NULL, judge_model TEXT NOT NULL, "
+                "verdict TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (original_digest, first_digest, second_digest, judge_model))"
+            )
+
+    def get(
+        self, original_digest: str, first_digest: str, second_digest: str, judge_model: str
+    ) -> str | None:
+        """
+        Gets the verdict of a comparison in the given order.
+
+        Args:
+            original_digest (str): The content digest of the original book.
+            first_digest (str): The content digest of the candidate shown as "A".
+            second_digest (str): The content digest of the candidate shown as "B".
+            judge_model (str): The provider and model of the judge.
+
+        Returns:
+            str | None: "A", "B" or "", or None if the comparison was never judged.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT verdict FROM judgments WHERE original_digest = ? AND first_digest = ? "
+                "AND second_digest = ? AND judge_model = ?",
+                (original_digest, first_digest, second_digest, judge_model),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def put(
+        self,
+        original_digest: str,
+        first_digest: str,
+        second_digest: str,
+        judge_model: str,
+        verdict: str,
+    ):
+        """
+        Stores the verdict of a comparison in the given order.
+
+        Args:
+            original_digest (str): The content digest of the original book.
+            first_digest (str): The content digest of the candidate shown as "A".
+            second_digest (str): The content digest of the candidate shown as "B".
+            judge_model (str): The provider and model of the judge.
+            verdict (str): "A", "B" or "".
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?, ?, ?)",
+                (original_digest, first_digest, second_digest, judge_model, verdict, time.time()),
+            )
+
+
+_judgment_store: JudgmentStore | None = None
+
+
+def enable_judgment_store(path: str | Path) -> JudgmentStore:
+    """
+    Makes every pair critic read and write its judgments in a persistent store.
+
+    Args:
+        path (str | Path): The SQLite database file.
+
+    Returns:
+        JudgmentStore: The store in use.
+    """
+    global _judgment_store
+    _judgment_store = JudgmentStore(path)
+    return _judgment_store
+
+
+def get_judgment_store() -> JudgmentStore | None:
+    """
+    Gets the judgment store in use.
+
+    Returns:
+        JudgmentStore | None: The store, or None if judgments are not persisted.
+    """
+    return _judgment_store
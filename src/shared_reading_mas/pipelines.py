@@ -1,6 +1,23 @@
+import asyncio
+import contextlib
+import copy
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import CompiledStateGraph
+
 from shared_reading_mas.agents.combined.organization import (
     Organization as CombinedOrganization,
 )
+from shared_reading_mas.agents.core.checkpointer import FileCheckpointSaver
+from shared_reading_mas.agents.langfuse_organization import LangFuseOrganization
 from shared_reading_mas.agents.personalization.organization import (
     Organization as PersonalizationOrganization,
 )
@@ -9,58 +26,271 @@ from shared_reading_mas.agents.questions.organization import (
 )
 from shared_reading_mas.domain.book_aggregate.book import Book
 from shared_reading_mas.domain.preference_aggregate.preference import Preference
+from shared_reading_mas.domain.services.book_digest import content_digest
+from shared_reading_mas.domain.services.book_parser import BookParser
+from shared_reading_mas.domain.services.book_renderer import BookMarkdownRenderer
+from shared_reading_mas.domain.services.preference_parser import PreferenceParser
 from shared_reading_mas.domain.services.preference_renderer import (
     PreferenceMarkdownRenderer,
 )
+from shared_reading_mas.result_store import ResultStore
 
+ORGANIZATIONS: dict[str, type[LangFuseOrganization]] = {
+    "personalization": PersonalizationOrganization,
+    "questions": QuestionsOrganization,
+    "single": CombinedOrganization,
+}
+"""
+Organization that runs each pipeline.
+"""
 
-async def run_personalization_pipeline(
-    story: Book, preferences: list[Preference], configuration: dict = {}, verbose: bool = False
-) -> Book:
+PIPELINE_CONFIGURATIONS: dict[str, str] = {
+    "personalization": "personalization",
+    "questions": "questions",
+    "single": "combined",
+}
+"""
+Key of the organization configuration of each pipeline.
+"""
+
+PREFERENCE_PIPELINES = {"personalization", "single"}
+"""
+Pipelines whose result depends on the preferences.
+"""
+
+SAMPLING_PIPELINES = {"personalization"}
+"""
+Pipelines whose organization samples the temperatures of its generations when
+it is instantiated, drawn from the "seed" configuration key if given.
+"""
+
+
+class BatchRun(NamedTuple):
+    story_path: Path
+    preferences_path: Path
+    pipelines: list[str]
+    output_path: Path
+
+
+class BatchResult(NamedTuple):
+    run: BatchRun
+    wall_time: float
+    error: str | None = None
+
+
+_graphs: dict[tuple[str, str], tuple[LangFuseOrganization, CompiledStateGraph]] = {}
+_graphs_lock = threading.Lock()
+_checkpointer: BaseCheckpointSaver | None = None
+
+
+def configuration_digest(configuration: dict) -> str:
     """
-    Runs the personalization pipeline on a given story with user preferences.
+    Computes a digest of an organization configuration. Callbacks are runtime
+    objects set by the organizations themselves, so they are left out.
 
     Args:
-        story (Book): The original story to be personalized.
-        preferences (list[Preference]): The user reading preferences.
         configuration (dict): Configuration for the organization.
-        verbose (bool): If True, prints detailed output during the process.
 
     Returns:
-        Book: The personalized version of the story.
+        str: The SHA-256 digest of the configuration.
     """
-    organization = PersonalizationOrganization(configuration=configuration)
-    organization.set_agents_variables(
-        {
-            "personalizer": {
-                "preferences": PreferenceMarkdownRenderer().render(preferences)
-            },
-            "pair_critic": {
-                "preferences": PreferenceMarkdownRenderer().render(preferences)
-            },
-            "edition_critic": {
-                "preferences": PreferenceMarkdownRenderer().render(preferences)
-            },
-        }
-    )
+    payload = {key: value for key, value in configuration.items() if key != "callbacks"}
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def get_organization(
+    pipeline: str, configuration: dict
+) -> tuple[LangFuseOrganization, CompiledStateGraph]:
+    """
+    Gets the organization of a pipeline and its compiled graph. Organizations
+    are built and compiled once per process and configuration, and request data
+    is passed to the graph at invoke time. Organizations that sample without a
+    seed are built for every run instead, so each run draws new samples.
+
+    Args:
+        pipeline (str): The pipeline, "personalization", "questions" or "single".
+        configuration (dict): Configuration for the organization.
 
+    Returns:
+        tuple[LangFuseOrganization, CompiledStateGraph]: The organization and its graph.
+    """
+    if pipeline in SAMPLING_PIPELINES and configuration.get("seed") is None:
+        return build_organization(pipeline, configuration)
+
+    key = (pipeline, configuration_digest(configuration))
+
+    with _graphs_lock:
+        cached = _graphs.get(key)
+        if cached is None:
+            cached = _graphs[key] = build_organization(pipeline, configuration)
+
+    return cached
+
+
+def build_organization(
+    pipeline: str, configuration: dict
+) -> tuple[LangFuseOrganization, CompiledStateGraph]:
+    """
+    Builds the organization of a pipeline and compiles its graph.
+
+    Args:
+        pipeline (str): The pipeline, "personalization", "questions" or "single".
+        configuration (dict): Configuration for the organization.
+
+    Returns:
+        tuple[LangFuseOrganization, CompiledStateGraph]: The organization and its graph.
+    """
+    # Copied so later changes to the caller's configuration never leak into a
+    # cached organization
+    organization = ORGANIZATIONS[pipeline](
+        configuration=copy.deepcopy(
+            {k: v for k, v in configuration.items() if k != "callbacks"}
+        )
+    )
+    organization.checkpointer = _checkpointer
     graph = organization.instantiate()
+    organization.load_prompts()
+
+    return organization, graph
+
+
+def preferences_digest(preferences: list[Preference]) -> str:
+    """
+    Computes a digest of the user reading preferences.
+
+    Args:
+        preferences (list[Preference]): The user reading preferences.
+
+    Returns:
+        str: The SHA-256 digest of the preferences.
+    """
+    payload = [(preference.type, preference.value) for preference in preferences]
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def enable_checkpoints(directory: str | Path) -> FileCheckpointSaver:
+    """
+    Compiles every organization graph with a checkpointer persisted to disk, so
+    a run interrupted halfway resumes from its last checkpoint when it is
+    started again with the same thread.
+
+    Args:
+        directory (str | Path): Directory holding one checkpoint file per thread.
+
+    Returns:
+        FileCheckpointSaver: The checkpointer in use.
+    """
+    global _checkpointer
+
+    _checkpointer = FileCheckpointSaver(directory)
+
+    # Graphs compiled before have no checkpointer
+    clear_organizations()
+    return _checkpointer
+
+
+def clear_organizations():
+    """
+    Drops every cached organization and graph.
+    """
+    with _graphs_lock:
+        _graphs.clear()
+
+
+async def _run_graph(
+    pipeline: str,
+    configuration: dict,
+    input: dict,
+    verbose: bool = False,
+    thread_id: str | None = None,
+) -> dict:
+    organization, graph = get_organization(pipeline, configuration)
+
+    config = organization.configuration
+    checkpointed = organization.checkpointer is not None and thread_id is not None
+
+    if checkpointed:
+        config = {**config, "configurable": {"thread_id": thread_id}}
+
+        # A thread with pending nodes was interrupted, so it is resumed. A
+        # finished one is left over from a run whose thread was not deleted,
+        # and the reducers would add the new input onto its state
+        snapshot = await graph.aget_state(config)
+        if snapshot.next:
+            print(f"Resuming {pipeline} run {thread_id} at {', '.join(snapshot.next)}")
+            input = None
+        elif snapshot.values:
+            organization.checkpointer.delete_thread(thread_id)
 
     final_state = {}
 
     async for step in graph.astream(
-        input={"original_book": story, "preferences": preferences},
-        config=organization.configuration,
+        input=input,
+        config=config,
     ):
         for update in step.values():
-            final_state.update(update)
+            final_state.update(update or {})
             if verbose:
-                for message in update.get("messages", []):
+                for message in (update or {}).get("messages", []):
                     message.pretty_print()
 
+    if checkpointed:
+        # Includes the updates made before the run was resumed
+        final_state = (await graph.aget_state(config)).values
+
+        # The run is complete, so the checkpoints are no longer needed
+        organization.checkpointer.delete_thread(thread_id)
+
+    return final_state
+
+
+async def run_personalization_pipeline(
+    story: Book,
+    preferences: list[Preference],
+    configuration: dict = {},
+    verbose: bool = False,
+    thread_id: str | None = None,
+) -> Book:
+    """
+    Runs the personalization pipeline on a given story with user preferences.
+
+    Args:
+        story (Book): The original story to be personalized.
+        preferences (list[Preference]): The user reading preferences.
+        configuration (dict): Configuration for the organization.
+        verbose (bool): If True, prints detailed output during the process.
+        thread_id (str | None): Checkpoint thread of the run, used to resume it.
+
+    Returns:
+        Book: The personalized version of the story.
+    """
+    rendered_preferences = PreferenceMarkdownRenderer().render(preferences)
+
+    final_state = await _run_graph(
+        "personalization",
+        configuration,
+        {
+            "original_book": story,
+            "preferences": preferences,
+            "agents_variables": {
+                "personalizer": {"preferences": rendered_preferences},
+                "pair_critic": {"preferences": rendered_preferences},
+                "edition_critic": {"preferences": rendered_preferences},
+            },
+        },
+        verbose,
+        thread_id,
+    )
+
     return final_state["modified_book"]
 
-async def run_questions_pipeline(story: Book, configuration: dict = {}, verbose: bool = False) -> Book:
+async def run_questions_pipeline(
+    story: Book, configuration: dict = {}, verbose: bool = False, thread_id: str | None = None
+) -> Book:
     """
     Runs the question generation pipeline on a given story.
 
@@ -68,30 +298,23 @@ async def run_questions_pipeline(story: Book, configuration: dict = {}, verbose:
         story (Book): The story for which to generate questions.
         configuration (dict): Configuration for the organization.
         verbose (bool): If True, prints detailed output during the process.
+        thread_id (str | None): Checkpoint thread of the run, used to resume it.
 
     Returns:
         Book: The story with generated questions.
     """
-    organization = QuestionsOrganization(configuration=configuration)
-
-    graph = organization.instantiate()
-
-    final_state = {}
-
-    async for step in graph.astream(
-        input={"original_book": story},
-        config=organization.configuration,
-    ):
-        for update in step.values():
-            final_state.update(update)
-            if verbose:
-                for message in update.get("messages", []):
-                    message.pretty_print()
+    final_state = await _run_graph(
+        "questions", configuration, {"original_book": story}, verbose, thread_id
+    )
 
     return final_state["modified_book"]
 
 async def run_combined_pipeline(
-        story: Book, preferences: list[Preference], configuration: dict = {}, verbose: bool = False
+        story: Book,
+        preferences: list[Preference],
+        configuration: dict = {},
+        verbose: bool = False,
+        thread_id: str | None = None,
     ) -> Book:
     """
     Runs the combined generation pipeline on a given story.
@@ -101,48 +324,54 @@ async def run_combined_pipeline(
         preferences (list[Preference]): The user reading preferences.
         configuration (dict): Configuration for the organization.
         verbose (bool): If True, prints detailed output during the process.
+        thread_id (str | None): Checkpoint thread of the run, used to resume it.
 
     Returns:
         Book: The story with generated questions.
     """
-    organization = CombinedOrganization(configuration=configuration)
-
-    organization.set_agents_variables(
+    final_state = await _run_graph(
+        "single",
+        configuration,
         {
-            "combined": {
-                "preferences": PreferenceMarkdownRenderer().render(preferences)
-            }
-        }
+            "original_book": story,
+            "agents_variables": {
+                "combined": {
+                    "preferences": PreferenceMarkdownRenderer().render(preferences)
+                }
+            },
+        },
+        verbose,
+        thread_id,
     )
 
-    graph = organization.instantiate()
-
-    final_state = {}
-
-    async for step in graph.stream(
-        input={"original_book": story},
-        config=organization.configuration,
-    ):
-        for update in step.values():
-            final_state.update(update)
-            if verbose:
-                for message in update.get("messages", []):
-                    message.pretty_print()
-
     return final_state["modified_book"]
 
 async def run_pipelines(
-    story: Book, preferences: list[Preference], pipelines: list[str], configuration: dict = {},verbose: bool = False
+    story: Book,
+    preferences: list[Preference],
+    pipelines: list[str],
+    configuration: dict = {},
+    verbose: bool = False,
+    result_store: ResultStore | None = None,
+    cell_locks: defaultdict[str, asyncio.Lock] | None = None,
 ) -> Book:
     """
     Runs the specified pipelines on a given story with user preferences.
 
+    Each pipeline is a cell keyed by the input story, the preferences (if the
+    pipeline uses them), the pipeline and its configuration. Cells found in the
+    result store are not run again, and the checkpoint thread of a cell is named
+    after its key, so an interrupted cell resumes where it stopped.
+
     Args:
         story (Book): The original story to be processed.
         preferences (list[Preference]): The user reading preferences.
         pipelines (list[str]): The pipelines to run. It can be "PERSONALIZATION", "QUESTIONS", "NARRATION" or "SINGLE".
         configuration (dict): Configuration for the organizations.
         verbose (bool): If True, prints detailed output during the process.
+        result_store (ResultStore | None): Store of the completed cells.
+        cell_locks (defaultdict[str, asyncio.Lock] | None): Locks of the cells,
+            shared by the concurrent runs of a batch.
 
     Returns:
         Book: The processed version of the story.
@@ -158,16 +387,135 @@ async def run_pipelines(
     sorted_pipelines = sorted(lower_pipelines, key=lambda x: priority[x])
 
     for pipeline in sorted_pipelines:
-        match pipeline:
-            case "personalization":
-                story = await run_personalization_pipeline(story, preferences, configuration["organizations"]["personalization"], verbose)
-            case "questions":
-                story = await run_questions_pipeline(story, configuration["organizations"]["questions"], verbose)
-            case "narration":
+        if pipeline == "narration":
+            continue
+
+        if pipeline not in PIPELINE_CONFIGURATIONS:
+            raise ValueError(f"Unknown pipeline: {pipeline}")
+
+        organization_configuration = configuration["organizations"][PIPELINE_CONFIGURATIONS[pipeline]]
+        cell = (
+            content_digest(story),
+            preferences_digest(preferences) if pipeline in PREFERENCE_PIPELINES else "",
+            pipeline,
+            configuration_digest(organization_configuration),
+        )
+
+        thread_id = hashlib.sha256(":".join(cell).encode("utf-8")).hexdigest()
+
+        # Runs sharing a cell wait for each other instead of sharing a thread
+        async with cell_locks[thread_id] if cell_locks is not None else contextlib.nullcontext():
+            result = result_store.get(*cell) if result_store is not None else None
+            if result is not None:
+                story = result
                 continue
-            case "single":
-                story = await run_combined_pipeline(story, preferences, configuration["organizations"]["combined"], verbose)
-            case _:
-                raise ValueError(f"Unknown pipeline: {pipeline}")
+
+            match pipeline:
+                case "personalization":
+                    story = await run_personalization_pipeline(story, preferences, organization_configuration, verbose, thread_id)
+                case "questions":
+                    story = await run_questions_pipeline(story, organization_configuration, verbose, thread_id)
+                case "single":
+                    story = await run_combined_pipeline(story, preferences, organization_configuration, verbose, thread_id)
+
+            if result_store is not None:
+                result_store.put(*cell, story)
 
     return story
+
+
+def expand_manifest(manifest: dict) -> list[BatchRun]:
+    """
+    Expands a batch manifest into its runs. The manifest holds a list of
+    experiments under "experiments", each one with the "stories", "profiles"
+    and "pipelines" to combine and the "output_dir" of its results. Every
+    (story, profile) pair is a run, written to `<output_dir>/<profile>_<story>`,
+    or to the "output_name" of the experiment, a template of the `{profile}`
+    and `{story}` names.
+
+    Args:
+        manifest (dict): The batch manifest.
+
+    Returns:
+        list[BatchRun]: The runs of the batch.
+    """
+    runs = []
+
+    for experiment in manifest["experiments"]:
+        output_dir = Path(experiment["output_dir"])
+        output_name = experiment.get("output_name", "{profile}_{story}")
+
+        for story, profile in itertools.product(
+            experiment["stories"], experiment["profiles"]
+        ):
+            story_path, preferences_path = Path(story), Path(profile)
+            runs.append(
+                BatchRun(
+                    story_path=story_path,
+                    preferences_path=preferences_path,
+                    pipelines=experiment["pipelines"],
+                    output_path=output_dir
+                    / output_name.format(profile=preferences_path.stem, story=story_path.stem),
+                )
+            )
+
+    return runs
+
+async def run_batch(
+    runs: list[BatchRun],
+    configuration: dict,
+    max_concurrency: int = 4,
+    verbose: bool = False,
+    result_store: ResultStore | None = None,
+) -> list[BatchResult]:
+    """
+    Runs a batch of pipeline runs concurrently in the current event loop. Each
+    result is written as soon as its run completes, and a failed run does not
+    stop the rest of the batch.
+
+    Args:
+        runs (list[BatchRun]): The runs to execute.
+        configuration (dict): Configuration for the organizations.
+        max_concurrency (int): Maximum number of runs in flight at once.
+        verbose (bool): If True, prints detailed output during the process.
+        result_store (ResultStore | None): Store of the completed cells, which
+            are skipped.
+
+    Returns:
+        list[BatchResult]: The result of every run, in completion order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    cell_locks = defaultdict(asyncio.Lock)
+
+    async def execute(run: BatchRun) -> BatchResult:
+        async with semaphore:
+            start = time.perf_counter()
+
+            try:
+                story = BookParser(from_path=run.story_path).parse()
+                preferences = PreferenceParser(from_path=run.preferences_path).parse()
+
+                modified_story = await run_pipelines(
+                    story, preferences, run.pipelines, configuration, verbose, result_store, cell_locks
+                )
+
+                BookMarkdownRenderer(
+                    to_path=run.output_path, include_images=modified_story.has_images()
+                ).render(modified_story)
+
+                error = None
+
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            result = BatchResult(run, time.perf_counter() - start, error)
+            status = "failed: " + error if error else "done"
+            print(f"[{result.wall_time:.1f}s] {run.output_path} {status}")
+
+            return result
+
+    results = []
+    for task in asyncio.as_completed([execute(run) for run in runs]):
+        results.append(await task)
+
+    return results
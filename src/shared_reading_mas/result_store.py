@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from shared_reading_mas.domain.book_aggregate.book import Book
+
+
+class ResultStore:
+    """
+    Persistent store of pipeline results backed by a SQLite file.
+
+    Each result is a cell keyed by the digest of the input story, the digest of
+    the profile, the pipeline and the digest of the organization configuration,
+    so a restarted batch skips every cell it already completed.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Initializes the store, creating the database file if needed.
+
+        Args:
+            path (str | Path): The SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "story_digest TEXT NOT NULL, profile_digest TEXT NOT NULL, "
+                "pipeline TEXT NOT NULL, config_digest TEXT NOT NULL, "
+                "book TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (story_digest, profile_digest, pipeline, config_digest))"
+            )
+
+    def get(
+        self, story_digest: str, profile_digest: str, pipeline: str, config_digest: str
+    ) -> Book | None:
+        """
+        Gets the result of a cell.
+
+        Args:
+            story_digest (str): The content digest of the input story.
+            profile_digest (str): The digest of the preferences.
+            pipeline (str): The pipeline.
+            config_digest (str): The digest of the organization configuration.
+
+        Returns:
+            Book | None: The resulting book, or None if the cell is not completed.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT book FROM results WHERE story_digest = ? AND profile_digest = ? "
+                "AND pipeline = ? AND config_digest = ?",
+                (story_digest, profile_digest, pipeline, config_digest),
+            ).fetchone()
+
+        return Book.model_validate_json(row[0]) if row else None
+
+    def put(
+        self,
+        story_digest: str,
+        profile_digest: str,
+        pipeline: str,
+        config_digest: str,
+        book: Book,
+    ):
+        """
+        Stores the result of a cell.
+
+        Args:
+            story_digest (str): The content digest of the input story.
+            profile_digest (str): The digest of the preferences.
+            pipeline (str): The pipeline.
+            config_digest (str): The digest of the organization configuration.
+            book (Book): The resulting book.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    story_digest,
+                    profile_digest,
+                    pipeline,
+                    config_digest,
+                    book.model_dump_json(),
+                    time.time(),
+                ),
+            )
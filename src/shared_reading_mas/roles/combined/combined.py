@@ -31,7 +31,7 @@ class CombinedRole(LangFuseRole):
         description = "".join(f"- **{type.type}**: {type.description}\n" for type in types)
         tips = "".join(f"**{type.type}**: \n {"".join(f"- {indicator}\n" for indicator in type.indicators) }" for type in types)
 
-        self.configure({
+        self.set_variables({
             "description": description,
             "tips": tips
         })
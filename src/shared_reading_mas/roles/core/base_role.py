@@ -39,11 +39,6 @@ class Role(ABC):
     Protocols associated with the role.
     """
 
-    instructions: str
-    """
-    Instructions for the role.
-    """
-
     def __init__(
         self,
         name: str,
@@ -74,7 +69,23 @@ class Role(ABC):
             if protocols is not None
             else ProtocolCollection()
         )
-        self.instructions = self._instructions()
+        self._loaded_instructions: str | None = None
+        self._variables: list[dict] = []
+
+    @property
+    def instructions(self) -> str:
+        """
+        Instructions for the role, loaded on their first use, so the prompts of
+        an organization can be fetched together before its agents use them.
+        """
+        if self._loaded_instructions is None:
+            instructions = self._instructions()
+            for data in self._variables:
+                instructions = self._compile(instructions, data)
+            self._loaded_instructions = instructions
+            self._variables = []
+
+        return self._loaded_instructions
 
     def configure(self, data: dict) -> str:
         """
@@ -86,10 +97,27 @@ class Role(ABC):
         Returns:
             str: The compiled instructions.
         """
-        instruction = self.instructions.replace("{{", "{").replace("}}", "}")
-        self.instructions = instruction.format_map(SafeDict(data))
+        self.set_variables(data)
         return self.instructions
 
+    def set_variables(self, data: dict):
+        """
+        Sets the data to compile the instructions for, applied when they are
+        loaded if they have not been yet.
+
+        Args:
+            data (dict): The data to compile instructions for.
+        """
+        if self._loaded_instructions is None:
+            self._variables.append(data)
+        else:
+            self._loaded_instructions = self._compile(self._loaded_instructions, data)
+
+    @staticmethod
+    def _compile(instructions: str, data: dict) -> str:
+        instructions = instructions.replace("{{", "{").replace("}}", "}")
+        return instructions.format_map(SafeDict(data))
+
     @abstractmethod
     def _instructions(self) -> str:
         """
@@ -101,11 +129,6 @@ class Role(ABC):
         ...
 
 class RoleCollection(MutableSet):
-    instructions: str
-    """
-    Combined instructions from active roles.
-    """
-
     activities: ActivityCollection
     """
     Combined activities from active roles.
@@ -127,7 +150,6 @@ class RoleCollection(MutableSet):
             # Deterministically select one role
             self._active_role = next(iter(self._data))
 
-        self.instructions = self._instructions()
         self.activities = self._activities()
         self.protocols = self._protocols()
 
@@ -209,10 +231,16 @@ class RoleCollection(MutableSet):
         """
         Recomputes all aggregated artifacts.
         """
-        self.instructions = self._instructions()
         self.activities = self._activities()
         self.protocols = self._protocols()
 
+    @property
+    def instructions(self) -> str:
+        """
+        Combined instructions from active roles.
+        """
+        return self._instructions()
+
     def _instructions(self) -> str:
         """
         Gets the combined instructions from active roles.
@@ -228,24 +256,18 @@ class RoleCollection(MutableSet):
 
         return "\n".join(instructions)
 
-    def set_variables(self, data: dict) -> str:
+    def set_variables(self, data: dict):
         """
-        Compiles the instructions for the given data.
+        Sets the data to compile the instructions of the roles for, applied
+        when they are loaded.
 
         Args:
             data (dict): The data to compile instructions for.
-
-        Returns:
-            str: The compiled instructions.
         """
-        instructions = set()
         for role in self._data:
-            instruction = role.configure(data)
-            if instruction:
-                instructions.add(instruction)
+            role.set_variables(data)
 
         self._rebuild()
-        return self.instructions
 
     def _activities(self) -> set[any]:
         """
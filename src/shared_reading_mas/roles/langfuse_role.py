@@ -1,8 +1,7 @@
-from langfuse import get_client
-
 from shared_reading_mas.exceptions import RoleException
 from shared_reading_mas.roles.core.base_permission import Permission
 from shared_reading_mas.roles.core.base_role import Role
+from shared_reading_mas.roles.prompt_cache import get_prompt_cache
 
 
 class LangFuseRole(Role):
@@ -17,11 +16,8 @@ class LangFuseRole(Role):
 
     def _instructions(self) -> str:
         try:
-            # Transform to instruction
-            prompt = get_client().get_prompt(self.name, type="chat")
-            system_prompt = prompt.compile()[0]
-
-            return system_prompt["content"]
+            # Served from the process-wide cache, fetched once per prompt
+            return get_prompt_cache().get(self.name)
 
         except Exception as e:
             raise RoleException(
@@ -44,7 +44,7 @@ class EditionCriticRole(LangFuseRole):
                 criteria, indicators=False
             )
 
-        self.configure(
+        self.set_variables(
             {
                 "criteria": criteria_str,
             }
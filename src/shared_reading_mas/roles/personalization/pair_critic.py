@@ -44,7 +44,7 @@ class PairCriticRole(LangFuseRole):
                 criteria, indicators=False
             )
 
-        self.configure(
+        self.set_variables(
             {
                 "criteria": criteria_str,
             }
@@ -0,0 +1,17 @@
+from shared_reading_mas.roles.langfuse_role import LangFuseRole
+from shared_reading_mas.roles.permissions.last_message_permission import (
+    LastMessagePermission,
+)
+
+
+class TriageCriticRole(LangFuseRole):
+    """
+    Role that discards personalization responses unfit to be compared.
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="personalization_triage_critic",
+            permissions=[LastMessagePermission()],
+            activities=[],
+        )
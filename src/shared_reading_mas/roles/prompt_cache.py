@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from langfuse import get_client
+
+DEFAULT_LABEL = "production"
+"""
+LangFuse label fetched when no version is pinned.
+"""
+
+
+class PromptCache:
+    """
+    Process-level cache of the LangFuse prompts used as role instructions.
+
+    Entries are keyed by the prompt name and either a pinned version or the
+    label, and record the LangFuse version they were fetched at. The cache can be
+    filled in bulk, saved to and loaded from a local snapshot file (which lets
+    organizations be built offline), and refreshed in the background.
+    """
+
+    def __init__(self, label: str = DEFAULT_LABEL, ttl: float = 300):
+        """
+        Initializes an empty cache.
+
+        Args:
+            label (str): LangFuse label fetched when no version is pinned.
+            ttl (float): Seconds after which an entry is refreshed by `refresh`.
+        """
+        self.label = label
+        self.ttl = ttl
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+        self._refresh_stop: threading.Event | None = None
+
+    def _key(self, name: str, version: int | None) -> tuple[str, str]:
+        return (name, f"v{version}" if version is not None else self.label)
+
+    def get(self, name: str, version: int | None = None) -> str:
+        """
+        Gets the system prompt of a role, fetching it from LangFuse on a miss.
+
+        Args:
+            name (str): The name of the prompt in LangFuse.
+            version (int | None): A pinned prompt version. Uses the label if None.
+
+        Returns:
+            str: The content of the system prompt.
+        """
+        return self.get_entry(name, version)["content"]
+
+    def get_entry(self, name: str, version: int | None = None) -> dict:
+        """
+        Gets the cached entry of a prompt, with its content and LangFuse version.
+
+        Args:
+            name (str): The name of the prompt in LangFuse.
+            version (int | None): A pinned prompt version. Uses the label if None.
+
+        Returns:
+            dict: The entry, with the "content", "version" and "fetched_at" keys.
+        """
+        entry = self._entries.get(self._key(name, version))
+        if entry is None:
+            entry = self._fetch(name, version)
+
+        return entry
+
+    def _fetch(self, name: str, version: int | None) -> dict:
+        if version is not None:
+            prompt = get_client().get_prompt(name, version=version, type="chat")
+        else:
+            prompt = get_client().get_prompt(name, label=self.label, type="chat")
+
+        entry = {
+            "content": prompt.compile()[0]["content"],
+            "version": prompt.version,
+            "fetched_at": time.time(),
+        }
+
+        with self._lock:
+            self._entries[self._key(name, version)] = entry
+
+        return entry
+
+    def prefetch(self, names: list[str], max_workers: int = 8):
+        """
+        Fetches every missing prompt concurrently.
+
+        Args:
+            names (list[str]): The names of the prompts to fetch.
+            max_workers (int): Maximum number of concurrent requests.
+        """
+        missing = [name for name in set(names) if self._key(name, None) not in self._entries]
+        if not missing:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            # Errors are raised again when the role asks for the prompt
+            list(executor.map(self._try_fetch, missing))
+
+    def _try_fetch(self, name: str, version: int | None = None) -> dict | None:
+        try:
+            return self._fetch(name, version)
+        except Exception as e:
+            print(f"Couldn't fetch the prompt {name} from LangFuse: {e}")
+            return None
+
+    def refresh(self):
+        """
+        Fetches again every entry older than the TTL. Entries that cannot be
+        fetched keep their current content.
+        """
+        now = time.time()
+        stale = [
+            key for key, entry in list(self._entries.items())
+            if now - entry["fetched_at"] > self.ttl
+        ]
+
+        for name, version in stale:
+            self._try_fetch(name, None if version == self.label else int(version[1:]))
+
+    def start_background_refresh(self, interval: float | None = None):
+        """
+        Starts a daemon thread that periodically calls `refresh`.
+
+        Args:
+            interval (float | None): Seconds between refreshes. Defaults to the TTL.
+        """
+        if self._refresh_stop is not None:
+            return
+
+        stop = threading.Event()
+        self._refresh_stop = stop
+
+        def loop():
+            while not stop.wait(interval or self.ttl):
+                self.refresh()
+
+        threading.Thread(target=loop, name="prompt-cache-refresh", daemon=True).start()
+
+    def stop_background_refresh(self):
+        """
+        Stops the background refresh thread, if running.
+        """
+        if self._refresh_stop is not None:
+            self._refresh_stop.set()
+            self._refresh_stop = None
+
+    def save_snapshot(self, path: str | Path):
+        """
+        Writes every cached prompt to a local snapshot file.
+
+        Args:
+            path (str | Path): The JSON file to write.
+        """
+        with self._lock:
+            entries = [
+                {"name": name, "key": key, **entry}
+                for (name, key), entry in self._entries.items()
+            ]
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def load_snapshot(self, path: str | Path):
+        """
+        Loads the prompts of a snapshot file, so they are not fetched again.
+
+        Args:
+            path (str | Path): The JSON file written by `save_snapshot`.
+        """
+        entries = json.loads(Path(path).read_text(encoding="utf-8"))
+
+        with self._lock:
+            for entry in entries:
+                name, key = entry.pop("name"), entry.pop("key")
+                self._entries[(name, key)] = entry
+
+
+_cache = PromptCache()
+
+
+def get_prompt_cache() -> PromptCache:
+    """
+    Returns the prompt cache shared by the whole process.
+    """
+    return _cache
@@ -36,6 +36,6 @@ class AggregatorRole(LangFuseRole):
                 criteria, indicators=False
             )
 
-        self.configure({
+        self.set_variables({
             "description": criteria_str,
         })
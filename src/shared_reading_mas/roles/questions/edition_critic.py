@@ -50,7 +50,7 @@ class EditionCriticRole(LangFuseRole):
                 type, indicators=False
             )
 
-        self.configure(
+        self.set_variables(
             {
                 "criteria": criteria_str,
                 "types": types_str
@@ -26,7 +26,7 @@ class QuestionerRole(LangFuseRole):
         )
         self.prompt: Category = prompt
 
-        self.configure({
+        self.set_variables({
             "type": self.prompt.type,
             "description": self.prompt.description,
             "tips": "".join(f"- {indicator}\n" for indicator in self.prompt.indicators)
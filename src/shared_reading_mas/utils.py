@@ -21,6 +21,17 @@ def add_to_set(old: set, new: set) -> set:
     """
     return old.union(new)
 
+def add_unique(old: list, new: list) -> list:
+    """
+    Merges two lists by appending the new items not already in the old one,
+    preserving their order.
+
+    Args:
+        old (list): The original list.
+        new (list): The new list to merge.
+    """
+    return old + [item for item in new if item not in old]
+
 def remove_thinking(text: str) -> str:
     """
     Removes the thinking part from the text.